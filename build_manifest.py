@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manifiesto de compilación incremental para el Traductor de Endless Sky
+Guarda en la carpeta del plugin, para cada archivo de data/ traducido, el hash de
+su contenido, la huella de las reglas y del motor (versión, backend, idioma
+destino) y el archivo de salida. En la siguiente ejecución los archivos cuyas
+entradas no cambiaron se omiten y se conserva su salida; las salidas de archivos
+de origen eliminados se borran.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Nombre del manifiesto dentro de la carpeta del plugin
+BUILD_MANIFEST_FILENAME = "build_manifest.json"
+
+# Incrementar al cambiar la extracción o la escritura: invalida todas las salidas anteriores
+BUILD_ENGINE_VERSION = 1
+
+MANIFEST_FORMAT = 1
+
+
+def file_hash(file_path):
+    """SHA-256 del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_fingerprint(*settings):
+    """Huella de la configuración que determina la salida (reglas, backend, idioma...)"""
+    payload = json.dumps([BUILD_ENGINE_VERSION, *settings], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """Entradas por archivo de origen: hash, huella, salida y líneas traducidas
+
+    Las rutas se guardan relativas a la carpeta del juego (origen) y a la del plugin
+    (salida), de modo que el plugin puede moverse sin invalidar el manifiesto.
+    """
+
+    def __init__(self, manifest_path, source_root, output_root, fingerprint):
+        self.manifest_path = Path(manifest_path)
+        self.source_root = Path(source_root)
+        self.output_root = Path(output_root)
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.reused = 0      # Archivos omitidos en esta ejecución (los cuenta quien los omite)
+        self.rebuilt = 0
+        self.removed = []
+        self._hashes = {}    # Hashes ya calculados en esta ejecución
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('format') == MANIFEST_FORMAT:
+            self.entries = data.get('files', {})
+
+    def _key(self, source_file):
+        return Path(source_file).relative_to(self.source_root).as_posix()
+
+    def _output_key(self, output_file):
+        return Path(output_file).relative_to(self.output_root).as_posix()
+
+    def source_hash(self, source_file):
+        key = self._key(source_file)
+        digest = self._hashes.get(key)
+        if digest is None:
+            digest = self._hashes[key] = file_hash(source_file)
+        return digest
+
+    def lookup(self, source_file, output_file):
+        """Entrada del archivo si su salida sigue siendo válida (mismas entradas), o None
+
+        output_file=None acepta la salida anotada, sea cual sea (pasada de recogida).
+        """
+        entry = self.entries.get(self._key(source_file))
+        if entry is None or entry.get('fingerprint') != self.fingerprint:
+            return None
+        if output_file is not None and entry.get('output') not in (None, self._output_key(output_file)):
+            return None
+        if entry.get('output') is not None and not (self.output_root / entry['output']).exists():
+            return None
+        if entry.get('hash') != self.source_hash(source_file):
+            return None
+        return entry
+
+    def previous(self, source_file):
+        """Entrada anterior del archivo generada con la misma configuración, aunque el archivo
+        haya cambiado (para alinear sus segmentos con segment_diff), o None"""
+        entry = self.entries.get(self._key(source_file))
+        if entry is None or entry.get('fingerprint') != self.fingerprint:
+            return None
+        return entry
+
+    def record(self, source_file, output_file, lines_translated, segments=None):
+        """Anota la salida recién generada (lines_translated = 0: no se escribió archivo)
+
+        segments es la instantánea de segmentos de segment_diff (None si no se calculó).
+        Si el archivo ya no produce traducciones se borra la salida de la compilación anterior.
+        """
+        key = self._key(source_file)
+        previous = self.entries.get(key)
+        output = self._output_key(output_file) if lines_translated > 0 else None
+        if previous is not None and previous.get('output') and previous['output'] != output:
+            self._remove_output(previous['output'])
+        self.entries[key] = {
+            'hash': self.source_hash(source_file),
+            'fingerprint': self.fingerprint,
+            'output': output,
+            'lines': lines_translated,
+        }
+        if segments is not None:
+            self.entries[key]['segments'] = segments
+        self.rebuilt += 1
+
+    def entry(self, source_file):
+        """Entrada actual del archivo, o None"""
+        return self.entries.get(self._key(source_file))
+
+    def merge(self, source_file, entry, removed=()):
+        """Incorpora la entrada y las salidas eliminadas de un proceso de trabajo"""
+        if entry is None:
+            self.forget(source_file)
+        else:
+            self.entries[self._key(source_file)] = entry
+            self.rebuilt += 1
+        self.removed.extend(removed)
+
+    def forget(self, source_file):
+        """Descarta la entrada de un archivo (su salida quedó incompleta y debe regenerarse)"""
+        self.entries.pop(self._key(source_file), None)
+
+    def _remove_output(self, output):
+        path = self.output_root / output
+        if path.exists():
+            path.unlink()
+            self.removed.append(output)
+
+    def prune(self):
+        """Elimina las entradas y salidas de archivos de origen que ya no existen"""
+        for key in [key for key in self.entries if not (self.source_root / key).exists()]:
+            output = self.entries.pop(key).get('output')
+            if output:
+                self._remove_output(output)
+        return self.removed
+
+    def save(self):
+        """Escribe el manifiesto de forma atómica (archivo temporal + reemplazo)"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        # Copia previa: en los puntos de control otros hilos pueden seguir anotando archivos
+        entries = dict(self.entries)
+        data = {'format': MANIFEST_FORMAT, 'engine_version': BUILD_ENGINE_VERSION,
+                'files': dict(sorted(entries.items()))}
+        fd, temp_path = tempfile.mkstemp(prefix=f".{self.manifest_path.name}.", suffix='.tmp',
+                                         dir=self.manifest_path.parent)
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.manifest_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def stats(self):
+        """Estadísticas de esta ejecución"""
+        return {'reused': self.reused, 'rebuilt': self.rebuilt, 'removed': len(self.removed)}
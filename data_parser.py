@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analizador del formato de datos de Endless Sky para el Traductor
+Convierte un archivo de data/ en un árbol de nodos por indentación en una sola
+pasada, como hace DataFile.cpp en el juego: cada línea es una lista de tokens
+(palabras, "texto entre comillas" o `texto entre backticks`), '#' inicia un
+comentario y los hijos de un nodo son las líneas siguientes más indentadas.
+Cada token conserva su posición exacta en el texto original, de modo que una
+traducción se inserta sin volver a analizar la línea.
+"""
+
+from pathlib import Path
+from text_encoding import read_data_text
+
+QUOTES = ('"', '`')
+
+
+class Token:
+    """Un token de una línea: texto sin comillas y su posición [start, end) en el documento"""
+
+    __slots__ = ('text', 'start', 'end', 'quote')
+
+    def __init__(self, text, start, end, quote=''):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.quote = quote    # '"', '`' o '' (palabra sin comillas)
+
+    @property
+    def quoted(self):
+        return bool(self.quote)
+
+    def __repr__(self):
+        return f"Token({self.quote}{self.text}{self.quote}@{self.start})"
+
+
+class DataNode:
+    """Una línea con tokens y sus hijos (las líneas siguientes con más indentación)"""
+
+    __slots__ = ('tokens', 'indent', 'line_number', 'start', 'end', 'parent', 'children')
+
+    def __init__(self, tokens, indent, line_number, start, end, parent=None):
+        self.tokens = tokens
+        self.indent = indent              # Caracteres de espacio en blanco iniciales
+        self.line_number = line_number    # Índice de la línea (0 = primera)
+        self.start = start                # Posición del inicio de la línea en el documento
+        self.end = end                    # Posición tras el salto de línea
+        self.parent = parent
+        self.children = []
+
+    @property
+    def keyword(self):
+        """Primer token de la línea (la palabra clave del nodo)"""
+        return self.tokens[0].text
+
+    @property
+    def name(self):
+        """Segundo token (el nombre en 'ship "Nombre"'), o '' si no hay"""
+        return self.tokens[1].text if len(self.tokens) > 1 else ''
+
+    @property
+    def depth(self):
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    @property
+    def root(self):
+        """Nodo raíz (sin indentación) que contiene a este nodo"""
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def ancestors(self):
+        """Padres del nodo, del más cercano a la raíz"""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def find_ancestor(self, keywords, include_self=True):
+        """Primer nodo (el propio o un antecesor) cuya palabra clave está en keywords"""
+        node = self if include_self else self.parent
+        while node is not None:
+            if node.tokens[0].text in keywords:
+                return node
+            node = node.parent
+        return None
+
+    def value_after(self, key):
+        """Token que sigue a la clave 'key' al inicio de la línea, o None
+
+        Una clave de varias palabras ('friendly hail') debe aparecer como palabras sueltas
+        sin comillas: "friendly hail" "..." entre comillas es otra construcción (el nombre
+        de una frase del juego) y no coincide.
+        """
+        tokens = self.tokens
+        words = key.split()
+        count = len(words)
+        if count == 1:
+            return tokens[1] if tokens[0].text == key and len(tokens) > 1 else None
+        if len(tokens) > count and all(
+                not token.quote and token.text == word for token, word in zip(tokens, words)):
+            return tokens[count]
+        return None
+
+    def text_after(self, *keys, quotes=QUOTES):
+        """Token entre comillas que sigue a la primera clave presente, o None
+
+        quotes limita el tipo de comillas aceptado ('"', '`' o ambos).
+        """
+        for key in keys:
+            token = self.value_after(key)
+            if token is not None:
+                return token if token.quote and token.quote in quotes else None
+        return None
+
+    @property
+    def last_line(self):
+        """Índice de la última línea del bloque (la del último descendiente)"""
+        node = self
+        while node.children:
+            node = node.children[-1]
+        return node.line_number
+
+    @property
+    def block_end(self):
+        """Posición tras el salto de línea de la última línea del bloque"""
+        node = self
+        while node.children:
+            node = node.children[-1]
+        return node.end
+
+    def walk(self):
+        """Este nodo y todos sus descendientes en orden del archivo"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def __repr__(self):
+        return f"DataNode({' '.join(token.text for token in self.tokens)!r}, línea {self.line_number + 1})"
+
+
+class DataDocument:
+    """Archivo de datos analizado: texto original y árbol de nodos
+
+    El texto se guarda una sola vez; las líneas no se copian a una lista aparte (cada nodo
+    conoce su posición [start, end) en el texto).
+    """
+
+    def __init__(self, text, first_line=0):
+        self.text = text
+        self.first_line = first_line   # Número de la primera línea (documentos parciales al transmitir)
+        self.line_count = 0
+        self.line_nodes = []   # Nodo de cada línea (None = vacía o comentario)
+        self.roots = []
+        self._parse()
+
+    def _parse(self):
+        stack = []    # Nodos abiertos, de menor a mayor indentación
+        text = self.text
+        for line_number, (start, end) in enumerate(iter_line_spans(text), self.first_line):
+            tokens, indent = tokenize_line(text[start:end], start)
+            node = None
+            if tokens:
+                while stack and stack[-1].indent >= indent:
+                    stack.pop()
+                parent = stack[-1] if stack else None
+                node = DataNode(tokens, indent, line_number, start, end, parent)
+                if parent is None:
+                    self.roots.append(node)
+                else:
+                    parent.children.append(node)
+                stack.append(node)
+            self.line_nodes.append(node)
+        self.line_count = len(self.line_nodes)
+
+    def line_text(self, node):
+        """Texto de la línea de un nodo (con su salto de línea)"""
+        return self.text[node.start:node.end]
+
+    def nodes(self):
+        """Todos los nodos en orden del archivo"""
+        return (node for node in self.line_nodes if node is not None)
+
+
+class Segment:
+    """Texto traducible extraído de un documento: posición [start, end), nodo, bloque y regla"""
+
+    __slots__ = ('text', 'start', 'end', 'node', 'block', 'rule')
+
+    def __init__(self, text, start, end, node, block=None, rule=None):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.node = node      # Nodo de la línea que contiene el texto
+        self.block = block    # Bloque con reglas propias (None = línea general)
+        self.rule = rule      # Regla de translation_rules que lo seleccionó
+
+    def __repr__(self):
+        return f"Segment({self.text[:30]!r}@{self.start})"
+
+
+def iter_line_spans(text):
+    """Posiciones [start, end) de cada línea con su salto, como readlines() (solo en '\\n')"""
+    length = len(text)
+    start = 0
+    while start < length:
+        end = text.find('\n', start)
+        end = length if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def tokenize_line(line, offset=0):
+    """Divide una línea en tokens; devuelve (tokens, indentación)
+
+    Las posiciones de los tokens son relativas al documento (offset = inicio de la línea).
+    Igual que el juego: una comilla o un backtick al inicio de un token lo abre hasta el
+    mismo carácter de cierre (o el fin de línea) y '#' al inicio de un token es un comentario.
+    """
+    length = len(line)
+    while length and line[length - 1] in '\r\n':
+        length -= 1
+    position = 0
+    while position < length and line[position].isspace():
+        position += 1
+    indent = position
+
+    tokens = []
+    while position < length:
+        char = line[position]
+        if char == '#':
+            break
+        if char in QUOTES:
+            close = line.find(char, position + 1, length)
+            end = close if close != -1 else length
+            tokens.append(Token(line[position + 1:end], offset + position + 1, offset + end, char))
+            position = end + 1
+        else:
+            end = position
+            while end < length and not line[end].isspace():
+                end += 1
+            tokens.append(Token(line[position:end], offset + position, offset + end))
+            position = end
+        while position < length and line[position].isspace():
+            position += 1
+    return tokens, indent
+
+
+def parse_data_text(text):
+    """Analiza el texto de un archivo de datos y devuelve su DataDocument"""
+    return DataDocument(text)
+
+
+def iter_root_blocks(lines):
+    """Agrupa un flujo de líneas en bloques raíz: genera (número de la primera línea, texto)
+
+    Un bloque empieza en cada línea con texto sin indentar (que no sea un comentario) e
+    incluye sus hijos y las líneas vacías o de comentario que lo siguen. Ningún nodo
+    tiene padre fuera de su bloque, así que cada bloque se analiza por separado.
+    """
+    block = []
+    first_line = 0
+    for line_number, line in enumerate(lines):
+        if block and line[:1] and not line[0].isspace() and line[0] != '#':
+            yield first_line, ''.join(block)
+            block = []
+            first_line = line_number
+        block.append(line)
+    if block:
+        yield first_line, ''.join(block)
+
+
+def parse_data_file(file_path, encoding=None):
+    """Lee y analiza un archivo de datos (encoding=None: detección rápida, ver text_encoding)"""
+    if encoding is None:
+        text, _ = read_data_text(Path(file_path))
+        return DataDocument(text)
+    with open(Path(file_path), 'r', encoding=encoding, errors='ignore') as f:
+        return DataDocument(f.read())
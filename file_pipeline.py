@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline por etapas para el Traductor de Endless Sky
+Los archivos atraviesan cuatro etapas con hilos propios unidas por colas acotadas:
+    exploración (carpetas -> archivos) -> análisis y extracción -> traducción -> escritura
+De este modo la lectura de disco, el análisis (CPU) y las esperas de red se solapan.
+Cuando la traducción es la etapa lenta las colas se llenan y las etapas anteriores
+se detienen (contrapresión): como mucho hay queue_size archivos analizados esperando
+en cada cola, de modo que la memoria no crece con el número de archivos.
+"""
+
+import queue
+import threading
+
+# Etapas del pipeline, en orden
+PIPELINE_STAGES = ('scan', 'parse', 'translate', 'write')
+
+# Marca de fin de una cola
+_DONE = object()
+
+
+class DataFileJob:
+    """Estado de un archivo de datos entre las fases de análisis, traducción y escritura"""
+
+    def __init__(self, source_file, dest_file, label, only_translated_blocks, document, segments,
+                 translations, snapshot):
+        self.source_file = source_file
+        self.dest_file = dest_file
+        self.label = label
+        self.only_translated_blocks = only_translated_blocks
+        self.document = document
+        self.segments = segments
+        self.translations = translations   # Texto reutilizado o traducido, None = pendiente
+        self.snapshot = snapshot           # Instantánea de segment_diff (None si no se calculó)
+        self.missing = 0                   # Segmentos fallidos u omitidos en la traducción
+        self.file_job = None               # (manejador, origen, destino) cuando viene del pipeline
+
+
+class StagedPipeline:
+    """Etapas con sus propios hilos unidas por colas de tamaño máximo queue_size
+
+    stages es una lista de (nombre, función, hilos). La primera etapa expande cada
+    elemento de entrada en una lista de trabajos; las siguientes transforman el
+    trabajo que reciben. Un error en una etapa termina el trabajo con la excepción
+    como resultado, sin pasar por las etapas restantes.
+    """
+
+    def __init__(self, stages, queue_size=4):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self._stop = threading.Event()
+
+    def _put(self, target, item):
+        """Encola esperando mientras la cola esté llena (contrapresión); False si se detuvo"""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source):
+        """Siguiente elemento de la cola, o _DONE si el pipeline se detuvo"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _run_stage(self, index, function, source, target, results, remaining, lock):
+        expand = index == 0
+        while True:
+            item = self._get(source)
+            if item is _DONE:
+                break
+            key, job, payload = item
+            try:
+                if expand:
+                    outputs = [((key, number), found, found) for number, found in enumerate(function(payload))]
+                else:
+                    outputs = [(key, job, function(payload))]
+            except Exception as e:
+                results.put(((key, -1) if expand else key, job, e))
+                continue
+            for output in outputs:
+                if not self._put(target, output):
+                    return
+        # El último hilo de la etapa avisa a la siguiente de que no llegarán más trabajos
+        with lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last:
+            self._put(target, _DONE)
+        else:
+            self._put(source, _DONE)
+
+    def run(self, items):
+        """Procesa los elementos y genera (clave, trabajo, resultado) según terminan
+
+        La clave es (índice del elemento de entrada, índice del trabajo dentro de él):
+        ordenar por ella devuelve el orden de exploración.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = queue.Queue()
+        remaining = [max(1, workers) for _, _, workers in self.stages]
+        lock = threading.Lock()
+        threads = []
+        for index, (name, function, _) in enumerate(self.stages):
+            target = queues[index + 1] if index + 1 < len(queues) else results
+            for number in range(remaining[index]):
+                thread = threading.Thread(target=self._run_stage, name=f'{name}-{number + 1}', daemon=True,
+                                          args=(index, function, queues[index], target, results, remaining, lock))
+                thread.start()
+                threads.append(thread)
+
+        def feed():
+            for key, item in enumerate(items):
+                if not self._put(queues[0], (key, None, item)):
+                    return
+            self._put(queues[0], _DONE)
+
+        threading.Thread(target=feed, name='pipeline-entrada', daemon=True).start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificación previa de una ejecución para el Traductor de Endless Sky
+Antes de traducir se resuelven las carpetas y archivos seleccionados en una lista
+sin duplicados de archivos concretos con su manejador, y una pasada de recogida
+(sin red) cuenta los segmentos y caracteres de cada uno. A los segmentos únicos
+se les resta lo que ya cubren la memoria de traducción y la tabla de la ejecución,
+y con el resto se estiman las peticiones (lotes) y el tiempo de la ejecución. El
+total de segmentos es la referencia del progreso durante la traducción, y el
+tamaño de cada archivo permite ordenar los trabajos (order_jobs).
+"""
+
+from translation_engine import pack_batches
+
+# Latencia supuesta de una petición cuando aún no hay medidas del planificador (segundos)
+ESTIMATED_REQUEST_LATENCY = 1.0
+
+# Políticas de orden de los trabajos (scheduling_policy del traductor)
+SCHEDULING_POLICIES = ('discovery', 'largest-first', 'visibility')
+
+
+def dedupe_jobs(jobs):
+    """Trabajos (manejador, origen, destino) sin archivos de origen repetidos (gana el primero)"""
+    unique = {}
+    for job in jobs:
+        unique.setdefault(job[1].resolve(), job)
+    return list(unique.values())
+
+
+class FilePlan:
+    """Trabajo de un archivo con los segmentos enmascarados que traduciría"""
+
+    def __init__(self, job, segments, reused=False):
+        self.job = job
+        self.segments = segments
+        self.chars = sum(len(segment) for segment in segments)
+        self.reused = reused     # Sin cambios desde la última ejecución (se conserva su salida)
+
+
+class RunPlan:
+    """Totales de la ejecución planificada y estimación de peticiones y tiempo"""
+
+    def __init__(self, files, cached, requests, seconds):
+        self.files = files
+        self.segments = sum(len(plan.segments) for plan in files)
+        self.chars = sum(plan.chars for plan in files)
+        unique = dict.fromkeys(segment for plan in files for segment in plan.segments)
+        self.unique = len(unique)
+        self.cached = len(cached)
+        pending = [segment for segment in unique if segment not in cached]
+        self.pending = len(pending)
+        self.pending_chars = sum(len(segment) for segment in pending)
+        self.requests = requests
+        self.seconds = seconds
+
+    @property
+    def jobs(self):
+        return [plan.job for plan in self.files]
+
+    def report_lines(self):
+        """Líneas del resumen del plan"""
+        reused = sum(plan.reused for plan in self.files)
+        minutes, seconds = divmod(round(self.seconds), 60)
+        return [
+            f"📋 Plan: {len(self.files)} archivos ({reused} sin cambios), {self.segments} segmentos, "
+            f"{self.chars} caracteres",
+            f"   🔁 {self.unique} segmentos únicos, {self.cached} ya en caché; "
+            f"quedan {self.pending} ({self.pending_chars} caracteres)",
+            f"   ⏱️ Estimación: {self.requests} peticiones, ~{minutes}m {seconds:02d}s",
+        ]
+
+
+def estimate_requests(pending, batch_translation, max_batch_chars):
+    """Peticiones necesarias para los segmentos pendientes (lotes si batch_translation)"""
+    if not batch_translation:
+        return len(pending)
+    return len(pack_batches(pending, max_batch_chars))
+
+
+def estimate_seconds(requests, chars, max_concurrency, requests_per_second=None, chars_per_second=None,
+                     latency=ESTIMATED_REQUEST_LATENCY):
+    """Tiempo estimado: el mayor de los límites de concurrencia, peticiones/s y caracteres/s"""
+    limits = [requests * latency / max(1, max_concurrency)]
+    if requests_per_second:
+        limits.append(requests / requests_per_second)
+    if chars_per_second:
+        limits.append(chars / chars_per_second)
+    return max(limits)
+
+
+def build_plan(files, is_cached, batch_translation, max_batch_chars, max_concurrency,
+               requests_per_second=None, chars_per_second=None, latency=ESTIMATED_REQUEST_LATENCY):
+    """RunPlan de los FilePlan; is_cached(segmentos únicos) devuelve el conjunto ya traducido"""
+    unique = list(dict.fromkeys(segment for plan in files for segment in plan.segments))
+    cached = is_cached(unique)
+    pending = [segment for segment in unique if segment not in cached]
+    requests = estimate_requests(pending, batch_translation, max_batch_chars)
+    seconds = estimate_seconds(requests, sum(len(segment) for segment in pending), max_concurrency,
+                               requests_per_second, chars_per_second, latency)
+    return RunPlan(files, cached, requests, seconds)
+
+
+def order_jobs(jobs, policy, size, rank):
+    """Ordena los trabajos (manejador, origen, destino) según la política
+
+    - 'discovery': el orden de exploración, sin cambios.
+    - 'largest-first': primero los archivos con más trabajo (size), lo que acorta el
+      tiempo total cuando varios archivos se procesan en paralelo.
+    - 'visibility': primero los archivos más visibles en el juego (rank menor); con un
+      plazo global lo que se alcanza a traducir es lo más valioso.
+    Los empates conservan el orden de exploración.
+    """
+    if policy == 'discovery':
+        return list(jobs)
+    if policy == 'largest-first':
+        return sorted(jobs, key=lambda job: -size(job))
+    if policy == 'visibility':
+        return sorted(jobs, key=rank)
+    raise ValueError(f"Política de planificación desconocida: {policy} (válidas: {', '.join(SCHEDULING_POLICIES)})")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Clasificador de líneas compilado para el Traductor de Endless Sky
+Decide si una línea NUNCA debe traducirse con las mismas reglas que
+should_never_translate_line, pero indexando las reglas por la primera palabra
+de la línea en lugar de probar ~120 expresiones regulares una a una, y extrae
+el texto traducible de una línea con una sola expresión regular
+(tests/test_line_classifier.py compara sus decisiones con la implementación original)
+"""
+
+import re
+
+# Líneas formadas solo por números y símbolos
+NUMERIC_LINE_PATTERN = re.compile(r'^[\d\s\.\-\+\*\/\(\)\[\]<>=]+$')
+
+# Definiciones de tip y string: identificadores que se bloquean siempre (distingue mayúsculas)
+INTERFACE_BLOCK_RULES = {
+    'tip': re.compile(r'^tip\s+"[^"]*"'),
+    'string': re.compile(r'^string\s+"[^"]*"'),
+}
+
+# Prefijo de regla "palabra clave": ^, espacios opcionales, una palabra o (alternativa|de|palabras)
+# y después espacio obligatorio o fin de línea
+_KEYWORD_RULE = re.compile(
+    r'^\^(?:\\s\*)?(?:\\t\*)?'
+    r'(?:(?P<word>[a-z]+)|\((?:\?:)?(?P<words>[a-z]+(?:\|[a-z]+)*)\))'
+    r'(?:\\s\+|\\s\*\$|\$)'
+)
+
+
+def _keywords_of(pattern):
+    """Primeras palabras posibles de una regla, o None si no empieza por una palabra fija"""
+    match = _KEYWORD_RULE.match(pattern)
+    if match is None:
+        return None
+    if match.group('word'):
+        return [match.group('word')]
+    return match.group('words').split('|')
+
+
+class LineClassifier:
+    """Reglas de "nunca traducir" compiladas una sola vez
+
+    - Las reglas que empiezan por una palabra fija se indexan por esa palabra: para cada
+      línea solo se prueban las reglas de su primera palabra.
+    - Las demás se combinan en una única alternativa compilada.
+    - technical_words es un frozenset.
+    """
+
+    def __init__(self, never_translate_patterns, technical_words):
+        self.keyword_rules = {}
+        fallback = []
+        for pattern in never_translate_patterns:
+            keywords = _keywords_of(pattern)
+            if keywords is None:
+                fallback.append(pattern)
+                continue
+            compiled = re.compile(pattern, re.IGNORECASE)
+            for keyword in keywords:
+                self.keyword_rules.setdefault(keyword, []).append(compiled)
+        for keyword, compiled in INTERFACE_BLOCK_RULES.items():
+            self.keyword_rules.setdefault(keyword, []).append(compiled)
+        self.fallback_patterns = fallback
+        self._fallback = (re.compile('|'.join(f'(?:{pattern})' for pattern in fallback), re.IGNORECASE)
+                          if fallback else None)
+        self.technical_words = frozenset(technical_words)
+
+    def should_never_translate(self, line):
+        """Misma decisión que EndlessSkyTranslatorFixed.should_never_translate_line"""
+        line_stripped = line.strip()
+        if len(line_stripped) < 3:
+            return True
+
+        first_word = line_stripped.split(None, 1)[0]
+        if first_word.lower() in self.technical_words:
+            return True
+
+        # casefold reproduce las equivalencias de re.IGNORECASE (ſ -> s, K -> k...)
+        rules = self.keyword_rules.get(first_word.casefold())
+        if rules:
+            for rule in rules:
+                if rule.match(line_stripped):
+                    return True
+
+        if self._fallback is not None and self._fallback.match(line_stripped):
+            return True
+
+        return NUMERIC_LINE_PATTERN.match(line_stripped) is not None
+
+
+# Clasificadores ya compilados en este proceso: (patrones, palabras) -> LineClassifier
+_classifiers = {}
+
+
+def get_line_classifier(never_translate_patterns, technical_words):
+    """Devuelve el clasificador para estas reglas, compilándolo solo la primera vez"""
+    key = (tuple(never_translate_patterns), tuple(technical_words))
+    classifier = _classifiers.get(key)
+    if classifier is None:
+        classifier = _classifiers[key] = LineClassifier(never_translate_patterns, technical_words)
+    return classifier
+
+
+# Reglas de extracción fijas: diálogos entre backticks (máxima prioridad) y, tras los
+# indicadores configurables, definiciones de tip (no se traducen), botones y etiquetas
+BACKTICK_RULE = r'^\s*`(?P<{group}>[^`]+)`\s*$'
+TRAILING_RULES = [
+    ('tip_definition', r'^\s*tip\s+"(?P<{group}>[^"]+)"'),
+    ('button', r'^\s*button\s+\w+\s+"(?P<{group}>[^"]+)"'),
+    ('label', r'^\s*label\s+"(?P<{group}>[^"]+)"'),
+]
+
+# Primer paréntesis de captura de un patrón (no escapado y no (?...))
+_FIRST_CAPTURE = re.compile(r'(?<!\\)\((?!\?)')
+
+
+class TextExtractor:
+    """Extrae el texto traducible de una línea y su posición exacta en un solo escaneo
+
+    Todas las reglas (backticks, translatable_text_indicators, tip, button, label) se
+    combinan en una única expresión con anticipación (?=...), de modo que un finditer
+    encuentra todas las coincidencias de la línea, también las solapadas, y se elige la
+    de mayor prioridad: el mismo resultado que probar las reglas en orden con re.search.
+    """
+
+    def __init__(self, translatable_text_indicators):
+        self.kinds = ['backtick']
+        alternatives = [BACKTICK_RULE.format(group='t0')]
+        for pattern in translatable_text_indicators:
+            # Los indicadores sin grupo de captura nunca producían texto
+            groups = re.compile(pattern).groups
+            if groups == 0:
+                continue
+            if groups > 1:
+                raise ValueError(f"Indicador con más de un grupo de captura: {pattern}")
+            group = f't{len(self.kinds)}'
+            alternatives.append(_FIRST_CAPTURE.sub(f'(?P<{group}>', pattern, count=1))
+            self.kinds.append('description')
+        for kind, pattern in TRAILING_RULES:
+            alternatives.append(pattern.format(group=f't{len(self.kinds)}'))
+            self.kinds.append(kind)
+        self._scanner = re.compile('(?=(?:' + '|'.join(f'(?:{alternative})' for alternative in alternatives) + '))')
+
+    def extract(self, line):
+        """Devuelve (inicio, fin, tipo) del texto traducible, o None si no hay
+
+        line[inicio:fin] es el texto; la línea traducida es line[:inicio] + traducción + line[fin:].
+        """
+        best = None
+        for match in self._scanner.finditer(line):
+            priority = int(match.lastgroup[1:])
+            if best is None or priority < best[0]:
+                best = (priority, match.start(match.lastgroup), match.end(match.lastgroup))
+                if priority == 0:
+                    break
+        if best is None:
+            return None
+        priority, start, end = best
+        return start, end, self.kinds[priority]
+
+
+# Extractores ya compilados en este proceso: indicadores -> TextExtractor
+_extractors = {}
+
+
+def get_text_extractor(translatable_text_indicators):
+    """Devuelve el extractor para estos indicadores, compilándolo solo la primera vez"""
+    key = tuple(translatable_text_indicators)
+    extractor = _extractors.get(key)
+    if extractor is None:
+        extractor = _extractors[key] = TextExtractor(translatable_text_indicators)
+    return extractor
+
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor de traducción simulado para el Traductor de Endless Sky
+Habla el protocolo translate_a/single (cliente 'gtx') en local e inyecta fallos
+configurables: latencia, limitaciones (429 + Retry-After), peticiones colgadas y
+marcadores __TIPO_n__ deformados. Permite medir translate_text y el planificador
+sin red y en condiciones hostiles.
+
+Uso:
+    python mock_translation_server.py --port 8765 --latency lognormal:0.2,0.5 --throttle-rate 0.05
+    python mock_translation_server.py --run-translator "/ruta/a/Endless Sky" --mangle-rate 0.1
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from translation_backends import PseudoLocalizationBackend
+
+# Marcadores de translate_text: __GAMEVAR_0__, __QUOTEDNAME_3__...
+PLACEHOLDER_PATTERN = re.compile(r'__([A-Za-z]+)_(\d+)__')
+
+
+def parse_latency(spec):
+    """Convierte una especificación de latencia en una función que devuelve segundos
+
+    Formatos: 'fixed:0.1', 'uniform:0.05,0.3', 'exp:0.2' (media), 'lognormal:0.2,0.5'
+    (mediana y sigma). None o '' = sin latencia.
+    """
+    if not spec:
+        return lambda rng: 0.0
+    kind, _, args = spec.partition(':')
+    values = [float(value) for value in args.split(',') if value]
+    if kind == 'fixed':
+        return lambda rng: values[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'exp':
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    if kind == 'lognormal':
+        import math
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Distribución de latencia desconocida: '{spec}'")
+
+
+def mangle_placeholders(text, mode, rng):
+    """Deforma los marcadores como hacen a veces los traductores reales"""
+    def replace(match):
+        kind, number = match.group(1), match.group(2)
+        chosen = mode if mode != 'random' else rng.choice(['lower', 'spaces', 'drop', 'translate'])
+        if chosen == 'lower':
+            return match.group(0).lower()
+        if chosen == 'spaces':
+            return f"__ {kind}_{number} __"
+        if chosen == 'drop':
+            return ''
+        if chosen == 'translate':
+            return f"__{kind.capitalize()}_{number}__"
+        return match.group(0)
+    return PLACEHOLDER_PATTERN.sub(replace, text)
+
+
+class MockTranslationServer:
+    """Servidor HTTP local con inyección de fallos (se puede usar como gestor de contexto)"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None, throttle_rate=0.0, retry_after=1,
+                 timeout_rate=0.0, hang_seconds=60.0, error_rate=0.0, mangle_rate=0.0,
+                 mangle_mode='random', seed=None):
+        self.host = host
+        self.port = port
+        self.latency = parse_latency(latency) if isinstance(latency, (str, type(None))) else latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.error_rate = error_rate
+        self.mangle_rate = mangle_rate
+        self.mangle_mode = mangle_mode
+        self.stats = {'requests': 0, 'throttled': 0, 'hung': 0, 'errors': 0, 'mangled': 0, 'chars': 0}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pseudo = PseudoLocalizationBackend()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _roll(self, rate):
+        with self._rng_lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _handle(self, handler):
+        """Atiende una petición GET /translate_a/single del protocolo gtx"""
+        parsed = urlparse(handler.path)
+        if parsed.path != '/translate_a/single':
+            handler.send_error(404)
+            return
+        params = parse_qs(parsed.query)
+        text = params.get('q', [''])[0]
+        self._count('requests')
+        self._count('chars', len(text))
+
+        with self._rng_lock:
+            delay = self.latency(self._rng)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self._roll(self.timeout_rate):
+            self._count('hung')
+            time.sleep(self.hang_seconds)
+        if self._roll(self.throttle_rate):
+            self._count('throttled')
+            handler.send_response(429)
+            handler.send_header('Retry-After', str(self.retry_after))
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+        if self._roll(self.error_rate):
+            self._count('errors')
+            handler.send_error(500)
+            return
+
+        translated = self._pseudo.translate(text, params.get('tl', ['es'])[0])
+        if self._roll(self.mangle_rate):
+            self._count('mangled')
+            with self._rng_lock:
+                translated = mangle_placeholders(translated, self.mangle_mode, self._rng)
+
+        body = json.dumps([[[translated, text, None, None, 1]], None, params.get('sl', ['en'])[0]],
+                          ensure_ascii=False).encode('utf-8')
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self):
+        """Arranca el servidor en un hilo en segundo plano y devuelve su URL base"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive, como el servicio real
+
+            def do_GET(self):
+                try:
+                    server._handle(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass   # El cliente abandonó la petición (timeout o petición duplicada)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-translation-server',
+                                        daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Detiene el servidor"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de traducción simulado con inyección de fallos")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default=None, help="fixed:S | uniform:A,B | exp:MEDIA | lognormal:MEDIANA,SIGMA")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fracción de respuestas 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Segundos de la cabecera Retry-After")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="Fracción de peticiones que se cuelgan")
+    parser.add_argument('--hang-seconds', type=float, default=60.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fracción de respuestas 500")
+    parser.add_argument('--mangle-rate', type=float, default=0.0, help="Fracción de respuestas con marcadores deformados")
+    parser.add_argument('--mangle-mode', default='random', choices=['random', 'lower', 'spaces', 'drop', 'translate'])
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--run-translator', metavar='RUTA_ENDLESS_SKY', default=None,
+                        help="Ejecuta el traductor completo contra el servidor (backend 'gtx') y termina")
+    args = parser.parse_args()
+
+    server = MockTranslationServer(args.host, args.port, args.latency, args.throttle_rate, args.retry_after,
+                                   args.timeout_rate, args.hang_seconds, args.error_rate, args.mangle_rate,
+                                   args.mangle_mode, args.seed)
+    url = server.start()
+    print(f"🧪 Servidor de traducción simulado en {url}")
+
+    try:
+        if args.run_translator:
+            from translator import EndlessSkyTranslatorFixed
+            from translation_backends import create_backend
+
+            translator = EndlessSkyTranslatorFixed(args.run_translator, 'es', create_backend('gtx', base_url=url))
+            started = time.monotonic()
+            translator.run_translation()
+            print(f"\n🧪 Servidor simulado: {server.stats} en {time.monotonic() - started:.1f}s")
+        else:
+            print("   Ctrl+C para detenerlo")
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
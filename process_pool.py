@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Procesamiento de archivos en varios procesos para el Traductor de Endless Sky
+El análisis, la clasificación de líneas y el enmascarado son trabajo de CPU que el
+GIL serializa. Con un FilePool cada archivo se procesa en un proceso de trabajo
+(un traductor propio con la misma configuración), pero ningún proceso de trabajo
+habla con el backend: envía los segmentos enmascarados de cada archivo al
+TranslationService del proceso principal por una conexión local, y es ese
+servicio el que aplica la memoria de traducción, la deduplicación, los lotes y
+el límite de peticiones del planificador, compartidos por todos los procesos.
+El proceso principal recoge los resultados en el orden de los trabajos.
+"""
+
+import contextlib
+import io
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+# Atributos del traductor que se copian a los procesos de trabajo (todo lo que decide la salida)
+WORKER_SETTINGS = [
+    'target_lang', 'backend_name', 'never_translate_patterns', 'technical_words',
+    'translatable_text_indicators', 'translation_rules', 'ships_only_translated_blocks',
+    'streaming_mode', 'streaming_window_segments', 'streaming_progress_step',
+    'incremental_build', 'segment_diff',
+]
+
+
+class TranslationService:
+    """Servicio de traducción central: atiende a los procesos de trabajo en hilos propios
+
+    Cada petición es la lista de segmentos enmascarados de un archivo; la respuesta es
+    una lista paralela de ('ok', traducción), ('failed', error) o ('skipped', error).
+    """
+
+    def __init__(self, translator):
+        self.translator = translator
+        self.authkey = secrets.token_bytes(16)
+        self._listener = Listener(('127.0.0.1', 0), authkey=self.authkey)
+        self.address = self._listener.address
+        self._closed = False
+        self._thread = threading.Thread(target=self._accept, name='servicio-traduccion', daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return    # Servicio cerrado
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    masked_texts = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(self.translator.translate_masked_segments(masked_texts))
+
+    def close(self):
+        self._closed = True
+        self._listener.close()
+
+
+class ServiceClient:
+    """Extremo del servicio en un proceso de trabajo (una conexión por proceso)"""
+
+    def __init__(self, address, authkey):
+        self._conn = Client(address, authkey=authkey)
+
+    def translate(self, masked_texts):
+        self._conn.send(masked_texts)
+        return self._conn.recv()
+
+
+# Traductor de este proceso de trabajo (lo crea _init_worker)
+_worker = None
+
+
+def _init_worker(translator_class, base_path, settings, address, authkey):
+    """Crea el traductor del proceso de trabajo con la configuración del principal"""
+    global _worker
+    # El backend nunca se usa aquí: las peticiones pasan por el servicio central
+    translator = translator_class(base_path, settings['target_lang'], backend='pseudo')
+    for name, value in settings.items():
+        setattr(translator, name, value)
+    translator.batch_translation = False       # Los lotes los forma el servicio central
+    translator.intra_file_concurrency = False  # Una petición al servicio por archivo
+    translator.translation_service = ServiceClient(address, authkey)
+    translator.checkpoint_interval = None      # El manifiesto lo guarda el proceso principal
+    translator.open_build_manifest()
+    _worker = translator
+
+
+def _run_job(handler_name, source_file, dest_file):
+    """Procesa un archivo en el proceso de trabajo; devuelve su resultado y su registro"""
+    translator = _worker
+    translator.failed_segments.clear()
+    manifest = translator.build_manifest
+    reused_before = manifest.reused if manifest is not None else 0
+    removed_before = len(manifest.removed) if manifest is not None else 0
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lines_translated = getattr(translator, handler_name)(source_file, dest_file)
+
+    result = {
+        'lines': lines_translated,
+        'output': output.getvalue(),
+        'incomplete': bool(translator.failed_segments),
+        'reused': False,
+        'entry': None,
+        'removed': [],
+    }
+    if manifest is not None:
+        result['reused'] = manifest.reused > reused_before
+        result['entry'] = manifest.entry(source_file)
+        result['removed'] = manifest.removed[removed_before:]
+    return result
+
+
+class FilePool:
+    """Procesos de trabajo para archivos más el servicio de traducción del proceso principal
+
+    worker_class es la clase de traductor que se instancia en cada proceso de trabajo.
+    """
+
+    def __init__(self, translator, workers, worker_class):
+        self.translator = translator
+        self.service = TranslationService(translator)
+        settings = {name: getattr(translator, name) for name in WORKER_SETTINGS}
+        # 'spawn' también en Linux: no se heredan hilos, conexiones ni la GUI del proceso principal
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context('spawn'), initializer=_init_worker,
+            initargs=(worker_class, translator.base_path, settings,
+                      self.service.address, self.service.authkey))
+
+    def run(self, jobs, announce=None):
+        """Reparte los trabajos (manejador, origen, destino) y genera sus resultados en orden
+
+        announce(trabajo) se llama antes de volcar en el registro la salida de cada trabajo.
+        """
+        futures = [self.executor.submit(_run_job, handler.__name__, source_file, dest_file)
+                   for handler, source_file, dest_file in jobs]
+        for job, future in zip(jobs, futures):
+            result = future.result()
+            if announce is not None:
+                announce(job)
+            yield self.translator.merge_file_job(job, result)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.service.close()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diferencias por segmento entre versiones del juego para el Traductor de Endless Sky
+Cada segmento traducible se identifica por la ruta de su nodo en el árbol de
+data_parser, por ejemplo 'mission "X"/conversation/`#12' (el duodécimo hijo
+entre backticks tras el primero). Al cambiar un archivo de origen se alinean la
+versión anterior (instantánea guardada en el manifiesto de compilación) y la
+nueva por esas rutas: los segmentos sin cambios conservan el texto traducido
+de la salida existente del plugin y solo los nuevos o modificados se traducen.
+"""
+
+import hashlib
+
+# Segmentos de cada tipo que se listan en el informe de un archivo
+REPORT_LIMIT = 10
+
+
+def node_label(node):
+    """Etiqueta de un nodo dentro de su padre
+
+    Palabra clave (más el nombre en los bloques raíz: 'mission "X"') o, si la línea
+    empieza por texto entre comillas, el tipo de comilla: el texto traducible no
+    forma parte de la ruta.
+    """
+    first = node.tokens[0]
+    if first.quote:
+        return first.quote
+    if node.parent is None and len(node.tokens) > 1:
+        return f'{first.text} "{node.tokens[1].text}"'
+    return first.text
+
+
+def node_paths(document):
+    """Ruta de cada nodo del documento: {número de línea: 'raíz/hijo#n/...'}
+
+    Los hermanos con la misma etiqueta se distinguen por su ordinal (#1, #2...).
+    """
+    paths = {}
+    counters = {}
+    for node in document.nodes():
+        label = node_label(node)
+        parent_line = node.parent.line_number if node.parent is not None else None
+        ordinal = counters.get((parent_line, label), 0)
+        counters[(parent_line, label)] = ordinal + 1
+        own = label if ordinal == 0 else f'{label}#{ordinal}'
+        paths[node.line_number] = own if parent_line is None else f'{paths[parent_line]}/{own}'
+    return paths
+
+
+def text_signature(text):
+    """Huella corta del texto de un segmento (la instantánea no guarda el texto)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def token_index(node, start):
+    """Índice del token del nodo que empieza en start, o -1 si el segmento no es un token"""
+    for index, token in enumerate(node.tokens):
+        if token.start == start:
+            return index
+    return -1
+
+
+def segment_snapshot(document, segments):
+    """Instantánea de los segmentos de un archivo: {ruta: [índice de token, huella del texto]}"""
+    paths = node_paths(document)
+    return {paths[segment.node.line_number]: [token_index(segment.node, segment.start), text_signature(segment.text)]
+            for segment in segments}
+
+
+class SegmentDiff:
+    """Resultado de alinear dos versiones de un archivo por rutas de nodo"""
+
+    def __init__(self, added, changed, removed, unchanged):
+        self.added = added          # Rutas nuevas
+        self.changed = changed      # Rutas con texto distinto
+        self.removed = removed      # Rutas que ya no existen
+        self.unchanged = unchanged  # Rutas con el mismo texto
+
+    def report_lines(self, limit=REPORT_LIMIT):
+        """Líneas del informe: los primeros segmentos añadidos, cambiados y eliminados"""
+        lines = []
+        for symbol, paths in (('+', self.added), ('~', self.changed), ('-', self.removed)):
+            lines.extend(f"{symbol} {path}" for path in paths[:limit])
+            if len(paths) > limit:
+                lines.append(f"{symbol} ... y {len(paths) - limit} más")
+        return lines
+
+
+def diff_snapshots(old_snapshot, new_snapshot):
+    """Compara dos instantáneas y devuelve un SegmentDiff (rutas en orden del archivo)"""
+    added, changed, unchanged = [], [], []
+    for path, (_, signature) in new_snapshot.items():
+        previous = old_snapshot.get(path)
+        if previous is None:
+            added.append(path)
+        elif previous[1] != signature:
+            changed.append(path)
+        else:
+            unchanged.append(path)
+    removed = [path for path in old_snapshot if path not in new_snapshot]
+    return SegmentDiff(added, changed, removed, unchanged)
+
+
+def previous_translations(output_document, old_snapshot, unchanged):
+    """Texto traducido de los segmentos sin cambios en la salida existente: {ruta: texto}
+
+    Solo se reutilizan los segmentos que son un token completo y cuyo nodo sigue en la
+    salida (en los archivos con solo los bloques traducidos faltan los demás).
+    """
+    output_nodes = {path: output_document.line_nodes[line_number - output_document.first_line]
+                    for line_number, path in node_paths(output_document).items()}
+    translations = {}
+    for path in unchanged:
+        index = old_snapshot[path][0]
+        node = output_nodes.get(path)
+        if index < 0 or node is None or index >= len(node.tokens) or not node.tokens[index].quote:
+            continue
+        translations[path] = node.tokens[index].text
+    return translations
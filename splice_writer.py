@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Escritor por inserciones para el Traductor de Endless Sky
+El archivo traducido no se construye en memoria: se conserva el texto original
+como un único búfer y una lista ordenada de ediciones (posición, longitud,
+reemplazo), y la salida se escribe copiando directamente los tramos sin
+cambios del búfer entre una edición y la siguiente. El pico de memoria es el
+del archivo original más la lista de ediciones.
+Los archivos de salida se escriben de forma atómica (atomic_output): primero en un
+temporal junto al destino, que lo sustituye al terminar, de modo que el plugin
+nunca contiene un archivo a medio escribir aunque la ejecución se interrumpa.
+"""
+
+import contextlib
+import os
+import tempfile
+from bisect import bisect_left
+
+# Tamaño máximo de cada escritura de un tramo sin cambios (caracteres)
+WRITE_CHUNK_SIZE = 1 << 20
+
+
+class SpliceWriter:
+    """Texto original + ediciones (offset, longitud, reemplazo) que se aplican al escribir"""
+
+    def __init__(self, source, chunk_size=WRITE_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.edits = []     # (offset, longitud, reemplazo)
+        self._sorted = True
+
+    def __len__(self):
+        return len(self.edits)
+
+    def replace(self, start, end, replacement):
+        """Registra que source[start:end] se sustituye por replacement"""
+        if not 0 <= start <= end <= len(self.source):
+            raise ValueError(f"Edición fuera del texto: [{start}, {end})")
+        if self.edits and start < self.edits[-1][0]:
+            self._sorted = False
+        self.edits.append((start, end - start, replacement))
+
+    def _sorted_edits(self):
+        if not self._sorted:
+            self.edits.sort(key=lambda edit: edit[0])
+            self._sorted = True
+        previous_end = 0
+        for offset, length, _ in self.edits:
+            if offset < previous_end:
+                raise ValueError(f"Ediciones solapadas en la posición {offset}")
+            previous_end = offset + length
+        return self.edits
+
+    def _write_slice(self, f, start, end):
+        """Copia source[start:end] en trozos acotados"""
+        for chunk_start in range(start, end, self.chunk_size):
+            f.write(self.source[chunk_start:min(chunk_start + self.chunk_size, end)])
+
+    def write_range(self, f, start=0, end=None):
+        """Escribe source[start:end] con las ediciones que caen dentro del tramo
+
+        Las ediciones deben quedar enteras dentro o fuera de [start, end).
+        """
+        end = len(self.source) if end is None else end
+        edits = self._sorted_edits()
+        position = start
+        index = bisect_left(edits, (start,))
+        while index < len(edits) and edits[index][0] < end:
+            offset, length, replacement = edits[index]
+            if offset + length > end:
+                raise ValueError(f"La edición en {offset} cruza el final del tramo ({end})")
+            self._write_slice(f, position, offset)
+            f.write(replacement)
+            position = offset + length
+            index += 1
+        self._write_slice(f, position, end)
+
+    def write_to(self, f):
+        """Escribe el texto completo con todas las ediciones aplicadas"""
+        self.write_range(f)
+
+
+@contextlib.contextmanager
+def atomic_output(dest_file, encoding='utf-8-sig'):
+    """Abre un temporal junto a dest_file que lo sustituye solo si el bloque termina sin error"""
+    fd, temp_path = tempfile.mkstemp(prefix=f".{dest_file.name}.", suffix='.tmp', dir=dest_file.parent)
+    try:
+        with open(fd, 'w', encoding=encoding) as f:
+            yield f
+        os.chmod(temp_path, 0o644)   # mkstemp crea el archivo con permisos 0600
+        os.replace(temp_path, dest_file)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Configuración común de las pruebas: módulos del repositorio y carpeta de juego de ejemplo"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mock_translation_server import MockTranslationServer  # noqa: E402
+
+# Archivos de data/ de ejemplo (ruta relativa -> contenido), con el formato del juego
+SAMPLE_DATA = {
+    'human/missions.txt': (
+        'mission "Test"\n'
+        '\tdescription "A test mission for you."\n'
+        '\tname "Test"\n'
+        '\ton offer\n'
+        '\t\tconversation\n'
+        '\t\t\t`Hello there, captain.`\n'
+        '\t\t\tchoice\n'
+        '\t\t\t\t`\t"Okay."`\n'
+        '\t\t\t\t`\t"No thanks."`\n'
+        '\t\t\t\t\tdecline\n'
+    ),
+    'human/news.txt': (
+        'news "spaceport"\n'
+        '\tlocation\n'
+        '\t\tgovernment "Republic"\n'
+        '\tname\n'
+        '\t\tword\n'
+        '\t\t\t"Trader"\n'
+        '\tmessage\n'
+        '\t\tword\n'
+        '\t\t\t"The market is busy today."\n'
+    ),
+    '_ui/interfaces.txt': (
+        'interface "main"\n'
+        '\tlabel "Hello world"\n'
+        '\tbutton a "Accept offer"\n'
+    ),
+}
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    """Carpeta de juego con SAMPLE_DATA más varios archivos de misiones generados"""
+    data = tmp_path / 'data'
+    for relative, text in SAMPLE_DATA.items():
+        path = data / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    for number in range(6):
+        missions = ''.join(
+            f'mission "Cargo {number}-{index}"\n'
+            f'\tdescription "Deliver cargo {number}-{index} to the station before the deadline."\n'
+            '\ton offer\n'
+            '\t\tconversation\n'
+            f'\t\t\t`Captain {number}-{index}, the client is waiting for you.`\n\n'
+            for index in range(20))
+        (data / 'human' / f'campaign missions {number}.txt').write_text(missions, encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def mock_server():
+    """Arranca servidores de traducción simulados en puertos libres y los detiene al terminar
+
+    Se llama con las opciones de MockTranslationServer y devuelve el servidor ya en marcha.
+    """
+    servers = []
+
+    def start(**options):
+        options.setdefault('seed', 0)
+        server = MockTranslationServer(port=0, **options)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
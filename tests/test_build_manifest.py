@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del manifiesto de compilación incremental"""
+
+import pytest
+
+from build_manifest import BuildManifest, settings_fingerprint
+from translator import EndlessSkyTranslatorFixed
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Carpeta de juego con un archivo de origen y carpeta del plugin con su salida"""
+    source = tmp_path / 'game' / 'data' / 'ships.txt'
+    source.parent.mkdir(parents=True)
+    source.write_text('ship "A"\n', encoding='utf-8')
+    output = tmp_path / 'plugin' / 'data' / 'ships.txt'
+    output.parent.mkdir(parents=True)
+    output.write_text('ship "A"\n', encoding='utf-8')
+    return tmp_path, source, output
+
+
+def open_manifest(root, fingerprint='huella'):
+    return BuildManifest(root / 'plugin' / 'manifest.json', root / 'game', root / 'plugin', fingerprint)
+
+
+def test_unchanged_file_is_reused_after_reload(tree):
+    root, source, output = tree
+    manifest = open_manifest(root)
+    assert manifest.lookup(source, output) is None
+    manifest.record(source, output, 3)
+    manifest.save()
+
+    entry = open_manifest(root).lookup(source, output)
+
+    assert entry['lines'] == 3 and entry['output'] == 'data/ships.txt'
+
+
+def test_edited_source_is_rebuilt(tree):
+    root, source, output = tree
+    manifest = open_manifest(root)
+    manifest.record(source, output, 3)
+    manifest.save()
+
+    source.write_text('ship "B"\n', encoding='utf-8')
+
+    assert open_manifest(root).lookup(source, output) is None
+
+
+def test_changed_settings_rebuild_everything(tree):
+    root, source, output = tree
+    manifest = open_manifest(root, settings_fingerprint('es', 'pseudo'))
+    manifest.record(source, output, 3, segments={'ship "A"': [1, 'x']})
+    manifest.save()
+
+    other = open_manifest(root, settings_fingerprint('fr', 'pseudo'))
+
+    assert other.lookup(source, output) is None
+    assert other.previous(source) is None     # Tampoco se alinean segmentos de otra configuración
+    assert open_manifest(root, settings_fingerprint('es', 'pseudo')).previous(source)['segments']
+
+
+def test_missing_output_is_rebuilt(tree):
+    root, source, output = tree
+    manifest = open_manifest(root)
+    manifest.record(source, output, 3)
+
+    output.unlink()
+
+    assert manifest.lookup(source, output) is None
+
+
+def test_deleted_source_is_pruned(tree):
+    root, source, output = tree
+    manifest = open_manifest(root)
+    manifest.record(source, output, 3)
+    manifest.save()
+
+    source.unlink()
+    manifest = open_manifest(root)
+    removed = manifest.prune()
+    manifest.save()
+
+    assert removed == ['data/ships.txt']
+    assert not output.exists()
+    assert open_manifest(root).entries == {}
+
+
+def test_file_without_translations_drops_previous_output(tree):
+    root, source, output = tree
+    manifest = open_manifest(root)
+    manifest.record(source, output, 3)
+
+    manifest.record(source, output, 0)
+
+    assert not output.exists()
+    assert manifest.entry(source)['output'] is None
+    assert manifest.lookup(source, output) is not None
+
+
+def test_corrupt_manifest_starts_empty(tree):
+    root, source, output = tree
+    (root / 'plugin' / 'manifest.json').write_text('{no es json', encoding='utf-8')
+
+    assert open_manifest(root).entries == {}
+
+
+def run(game_dir, **settings):
+    """Ejecución completa; devuelve el traductor y los segmentos enviados al backend"""
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    translator.batch_translation = False
+    for name, value in settings.items():
+        setattr(translator, name, value)
+    sent = []
+    translate = translator.backend.translate
+
+    def counting_translate(text, *args, **kwargs):
+        sent.append(text)
+        return translate(text, *args, **kwargs)
+
+    translator.backend.translate = counting_translate
+    translator.run_translation()
+    return translator, sent
+
+
+def test_rerun_skips_unchanged_files(game_dir):
+    _, first = run(game_dir)
+    translator, second = run(game_dir)
+
+    assert first and second == []
+    assert (translator.plugin_data_path / 'human' / 'missions.txt').exists()
+
+
+def test_rerun_rebuilds_edited_file_only(game_dir):
+    run(game_dir)
+    source = game_dir / 'data' / 'human' / 'news.txt'
+    source.write_text(source.read_text(encoding='utf-8').replace('busy today', 'quiet today'),
+                      encoding='utf-8')
+
+    _, second = run(game_dir)
+
+    assert second == ['The market is quiet today.']
+
+
+def test_rerun_with_other_settings_rebuilds_everything(game_dir):
+    _, first = run(game_dir)
+
+    _, second = run(game_dir, target_lang='fr')
+
+    assert len(second) == len(first)
+
+
+def test_rerun_prunes_deleted_source(game_dir):
+    translator, _ = run(game_dir)
+    output = translator.plugin_data_path / 'human' / 'news.txt'
+    assert output.exists()
+
+    (game_dir / 'data' / 'human' / 'news.txt').unlink()
+    run(game_dir)
+
+    assert not output.exists()
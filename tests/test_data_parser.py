@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del analizador del formato de datos del juego"""
+
+import pytest
+
+from data_parser import DataDocument, iter_root_blocks, tokenize_line
+
+
+def token_table(line, offset=0):
+    tokens, indent = tokenize_line(line, offset)
+    return indent, [(token.text, token.start, token.end, token.quote) for token in tokens]
+
+
+@pytest.mark.parametrize('line, indent, tokens', [
+    ('ship "Star Barge"\n', 0, [('ship', 0, 4, ''), ('Star Barge', 6, 16, '"')]),
+    ('\tword `Hello there.`\n', 1, [('word', 1, 5, ''), ('Hello there.', 7, 19, '`')]),
+    # Las comillas de un tipo pueden contener las del otro
+    ('`"Okay," she said.`', 0, [('"Okay," she said.', 1, 18, '`')]),
+    ('"It`s fine"', 0, [('It`s fine', 1, 10, '"')]),
+    ('""', 0, [('', 1, 1, '"')]),
+    ('a  b\t\tc\r\n', 0, [('a', 0, 1, ''), ('b', 3, 4, ''), ('c', 6, 7, '')]),
+    # Una comilla en mitad de una palabra no abre un texto
+    ('don"t stop', 0, [('don"t', 0, 5, ''), ('stop', 6, 10, '')]),
+])
+def test_token_offsets(line, indent, tokens):
+    assert token_table(line) == (indent, tokens)
+
+
+def test_token_offsets_are_document_positions():
+    line = '\t\tdescription "Go."\n'
+    indent, tokens = token_table(line, offset=100)
+
+    assert indent == 2
+    assert tokens == [('description', 102, 113, ''), ('Go.', 115, 118, '"')]
+
+
+@pytest.mark.parametrize('line, texts', [
+    ('# Un comentario', []),
+    ('\t# Comentario indentado', []),
+    ('ship "A" # comentario', ['ship', 'A']),
+    ('ship "A"# pegado', ['ship', 'A']),
+    # '#' dentro de comillas o en mitad de una palabra no es un comentario
+    ('label "Tier #1"', ['label', 'Tier #1']),
+    ('`Press # to dock.`', ['Press # to dock.']),
+    ('color#red "x"', ['color#red', 'x']),
+])
+def test_comments(line, texts):
+    tokens, _ = tokenize_line(line)
+
+    assert [token.text for token in tokens] == texts
+
+
+@pytest.mark.parametrize('line, text, end', [
+    ('description "Never closed\n', 'Never closed', 25),
+    ('`Also open', 'Also open', 10),
+    ('word "\r\n', '', 6),
+])
+def test_unterminated_quote_runs_to_end_of_line(line, text, end):
+    tokens, _ = tokenize_line(line)
+
+    assert tokens[-1].text == text
+    assert tokens[-1].end == end
+    assert tokens[-1].quote in '"`'
+
+
+@pytest.mark.parametrize('line, indent', [
+    ('\tname "x"', 1),
+    ('    name "x"', 4),
+    ('\t  name "x"', 3),
+    ('name "x"', 0),
+    ('   \n', 3),
+])
+def test_indentation_counts_whitespace_characters(line, indent):
+    assert tokenize_line(line)[1] == indent
+
+
+DOCUMENT = (
+    'mission "A"\n'
+    '\tname "Alpha"\n'
+    '\n'
+    '\ton offer\n'
+    '\t\tconversation\n'
+    '# comentario entre líneas\n'
+    '\t\t\t`Hello.`\n'
+    '\tdescription "Desc."\n'
+    'ship "B"\n'
+    '    attributes\n'
+    '        "mass" 10\n'
+)
+
+
+def test_document_parent_linkage():
+    document = DataDocument(DOCUMENT)
+    mission, ship = document.roots
+
+    assert [node.keyword for node in mission.children] == ['name', 'on', 'description']
+    hello = document.line_nodes[6]
+    assert hello.tokens[0].text == 'Hello.'
+    assert [node.keyword for node in hello.ancestors()] == ['conversation', 'on', 'mission']
+    assert hello.root is mission and hello.depth == 3
+    assert document.line_nodes[2] is None and document.line_nodes[5] is None
+    # Indentación con espacios: los hijos se reconocen igual que con tabuladores
+    assert ship.children[0].keyword == 'attributes'
+    assert ship.children[0].children[0].name == '10'
+
+
+def test_document_block_end_and_lines():
+    document = DataDocument(DOCUMENT)
+    mission, ship = document.roots
+
+    assert DOCUMENT[mission.start:mission.block_end] == DOCUMENT[:DOCUMENT.index('ship')]
+    assert mission.last_line == 7
+    assert ship.block_end == len(DOCUMENT)
+    offer = mission.children[1]
+    assert DOCUMENT[offer.start:offer.block_end].endswith('`Hello.`\n')
+    assert document.line_text(offer) == '\ton offer\n'
+    assert document.line_count == 11
+    assert [node.line_number for node in document.nodes()] == [0, 1, 3, 4, 6, 7, 8, 9, 10]
+
+
+def test_token_positions_slice_the_document():
+    document = DataDocument(DOCUMENT)
+
+    for node in document.nodes():
+        for token in node.tokens:
+            assert DOCUMENT[token.start:token.end] == token.text
+
+
+def test_partial_document_keeps_line_numbers():
+    document = DataDocument('ship "B"\n\tname "x"\n', first_line=40)
+
+    assert [node.line_number for node in document.nodes()] == [40, 41]
+
+
+def test_dedent_to_lower_sibling_level():
+    document = DataDocument('a\n\t\tb\n\tc\n\t\td\n')
+    a, = document.roots
+
+    assert [node.keyword for node in a.children] == ['b', 'c']
+    assert [node.keyword for node in a.children[1].children] == ['d']
+
+
+def test_root_blocks_split_at_unindented_lines():
+    lines = DOCUMENT.splitlines(keepends=True)
+
+    blocks = list(iter_root_blocks(lines))
+
+    assert [first for first, _ in blocks] == [0, 8]
+    assert ''.join(text for _, text in blocks) == DOCUMENT
+    # El comentario sin indentar no abre un bloque nuevo
+    assert '# comentario' in blocks[0][1]
+
+
+def test_root_blocks_keep_leading_comments_and_blank_lines():
+    lines = ['# cabecera\n', '\n', 'ship "A"\n', '\tname "A"\n', '\n', 'ship "B"\n']
+
+    blocks = list(iter_root_blocks(lines))
+
+    assert blocks == [(0, '# cabecera\n\n'), (2, 'ship "A"\n\tname "A"\n\n'), (5, 'ship "B"\n')]
+    for first, text in blocks:
+        document = DataDocument(text, first_line=first)
+        assert all(node.parent is None or node.root in document.roots for node in document.nodes())
+
+
+def test_root_blocks_of_nothing():
+    assert list(iter_root_blocks([])) == []
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del pipeline por etapas y del planificador compartido de la ejecución"""
+
+import time
+
+import pytest
+
+import translator as translator_module
+from translator import EndlessSkyTranslatorFixed
+
+
+@pytest.fixture
+def schedulers(monkeypatch):
+    """Lista de los planificadores creados durante la prueba
+
+    La creación se alarga para que los hilos que pidan el planificador a la vez coincidan.
+    """
+    created = []
+
+    class CountingScheduler(translator_module.AsyncTranslationScheduler):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(translator_module, 'AsyncTranslationScheduler', CountingScheduler)
+    return created
+
+
+@pytest.mark.parametrize('settings', [
+    {'pipeline_mode': True},
+    {'pipeline_mode': True, 'batch_translation': False},
+    {'batch_translation': False},
+])
+def test_one_scheduler_per_run(game_dir, schedulers, settings):
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    for name, value in settings.items():
+        setattr(translator, name, value)
+
+    translator.run_translation()
+
+    assert len(schedulers) == 1
+    assert translator.scheduler is None    # Cerrado al terminar
+
+
+def test_request_budget_is_global(game_dir, schedulers):
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    translator.pipeline_mode = True
+    translator.batch_translation = False
+    translator.run_request_budget = 2
+    calls = []
+    translate = translator.backend.translate
+
+    def counting_translate(*args, **kwargs):
+        calls.append(args[0])
+        return translate(*args, **kwargs)
+
+    translator.backend.translate = counting_translate
+
+    translator.run_translation()
+
+    assert len(schedulers) == 1
+    assert len(calls) == 2
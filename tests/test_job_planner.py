@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la planificación previa de la ejecución"""
+
+import collections
+
+import pytest
+
+import translator as translator_module
+from translator import EndlessSkyTranslatorFixed
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Lecturas de cada archivo de datos durante la prueba"""
+    counter = collections.Counter()
+    read_data_text = translator_module.read_data_text
+
+    def counting_read(path, *args, **kwargs):
+        counter[path.name] += 1
+        return read_data_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(translator_module, 'read_data_text', counting_read)
+    return counter
+
+
+@pytest.mark.parametrize('settings', [{}, {'pipeline_mode': True}, {'batch_translation': False}])
+def test_planned_files_are_parsed_once(game_dir, reads, settings):
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    for name, value in settings.items():
+        setattr(translator, name, value)
+
+    translator.run_translation()
+
+    assert reads and set(reads.values()) == {1}
+
+
+def test_files_over_cache_size_are_parsed_again(game_dir, reads):
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    translator.parsed_cache_size = 0
+
+    translator.run_translation()
+
+    assert reads and set(reads.values()) == {2}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Prueba diferencial del clasificador compilado contra la implementación original
+
+Con la variable de entorno ENDLESS_SKY_DATA apuntando a una carpeta data/ del juego
+se comparan además todas sus líneas.
+"""
+
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from conftest import SAMPLE_DATA
+from line_classifier import get_line_classifier
+from translator import EndlessSkyTranslatorFixed
+
+# Líneas de data/ representativas: bloques técnicos, textos traducibles e interfaz
+SAMPLE_LINES = [
+    'ship "Shuttle"',
+    '\tattributes',
+    '\t\t"cost" 180000',
+    '\t\t"shields" 500',
+    '\tengine -6 42',
+    '\tgun 0 -30 "Energy Blaster"',
+    '\tdescription "The Shuttle is a small ship for carrying passengers."',
+    'outfit "Energy Blaster"',
+    '\tcategory "Guns"',
+    '\tsprite "projectile/blaster"',
+    '\tthumbnail "outfit/energy blaster"',
+    'system "Sol"',
+    '\tpos -100 50.5',
+    '\tgovernment "Republic"',
+    '\tlink "Alpha Centauri"',
+    '\tobject "Earth"',
+    '\t\tdistance 1000',
+    'planet "Earth"',
+    '\tlandscape land/sky1',
+    '\tdescription `Earth is the ancestral home of humanity.`',
+    '\tspaceport `The spaceport is crowded with travelers.`',
+    'mission "Test"',
+    '\tname "Deliver food"',
+    '\tsource "Earth"',
+    '\tdestination "Mars"',
+    '\tcargo "food" 10',
+    '\tpassengers 2',
+    '\tpayment 5000',
+    '\ton offer',
+    '\t\tconversation',
+    '\t\t\t`Hello there, captain.`',
+    '\t\t\tchoice',
+    '\t\t\t\t`\t"Okay."`',
+    '\t\t\t\t\tdecline',
+    '\ton complete',
+    '\t\tlog "Delivered food to Mars."',
+    '\t\tset "food delivered"',
+    'interface "main"',
+    '\tlabel "Hello world"',
+    '\tbutton a "Accept offer"',
+    '\ttip "foo" "bar"',
+    'tip "cargo space:"',
+    'string "Accept offer"',
+    '\ttext "Some interface text"',
+    '\tcolor "medium" .5 .5 .5 0',
+    'phrase "friendly hail"',
+    '\tword',
+    '\t\t"Greetings, traveler."',
+    'news "spaceport"',
+    '\tmessage',
+    'fleet "Small Republic"',
+    '\tvariant 3',
+    'effect "explosion"',
+    'government "Pirate"',
+    '\tswizzle 6',
+    'hazard "Ion Storm"',
+    '123 456',
+    '-5.5 + 2',
+    'ok',
+    '',
+    '\t',
+    '# Comentario',
+    'Outfit "Mixed Case"',
+    'SHIP "Shouting"',
+    'ſhip "Long s"',
+]
+
+
+@pytest.fixture(scope='module')
+def rules():
+    return EndlessSkyTranslatorFixed('.', backend='pseudo')
+
+
+def legacy_should_never_translate_line(line, never_translate_patterns, technical_words):
+    """Implementación original (prueba regla a regla)"""
+    line_stripped = line.strip()
+
+    for pattern in never_translate_patterns:
+        if re.match(pattern, line_stripped, re.IGNORECASE):
+            return True
+
+    if re.match(r'^[\d\s\.\-\+\*\/\(\)\[\]<>=]+$', line_stripped):
+        return True
+
+    if len(line_stripped) < 3:
+        return True
+
+    first_word = line_stripped.split()[0] if line_stripped.split() else ""
+    if first_word.lower() in technical_words:
+        return True
+
+    interface_elements = [
+        r'^tip\s+"[^"]*"',
+        r'^label\s+"[^"]*"',
+        r'^button\s+\w+\s+"[^"]*"',
+        r'^string\s+"[^"]*"',
+    ]
+    for pattern in interface_elements:
+        if re.match(pattern, line_stripped):
+            if pattern.startswith('^tip') or pattern.startswith('^string'):
+                return True
+            else:
+                return False
+
+    return False
+
+
+def keyword_lines(classifier):
+    """Variantes de línea para cada palabra clave indexada: con nombre, número, sola y en mayúsculas"""
+    for keyword in sorted(classifier.keyword_rules):
+        for variant in (keyword, keyword.upper(), keyword.capitalize()):
+            yield variant
+            yield f'\t{variant} "Name"'
+            yield f'{variant} 12 34'
+            yield f'{variant}extra "Name"'
+
+
+def assert_same_decisions(lines, rules):
+    classifier = get_line_classifier(rules.never_translate_patterns, rules.technical_words)
+    mismatches = [
+        (line, expected, actual) for line in lines
+        for expected, actual in [(
+            legacy_should_never_translate_line(line, rules.never_translate_patterns, rules.technical_words),
+            classifier.should_never_translate(line),
+        )]
+        if expected != actual
+    ]
+    assert mismatches == []
+
+
+def test_sample_lines(rules):
+    sample_lines = [line for text in SAMPLE_DATA.values() for line in text.splitlines()]
+    assert_same_decisions(SAMPLE_LINES + sample_lines, rules)
+
+
+def test_keyword_variants(rules):
+    classifier = get_line_classifier(rules.never_translate_patterns, rules.technical_words)
+    assert_same_decisions(list(keyword_lines(classifier)), rules)
+
+
+@pytest.mark.skipif(not os.environ.get('ENDLESS_SKY_DATA'), reason='ENDLESS_SKY_DATA no definida')
+def test_game_data_tree(rules):
+    lines = []
+    for file_path in sorted(Path(os.environ['ENDLESS_SKY_DATA']).rglob('*.txt')):
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            lines.extend(f.readlines())
+    assert_same_decisions(lines, rules)
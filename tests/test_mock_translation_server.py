@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de integración contra el servidor de traducción simulado (backend 'gtx')"""
+
+import itertools
+import time
+
+import pytest
+
+from text_masking import mask_text
+from translation_backends import GtxBackend
+from translation_engine import RequestTimeoutError
+from translator import EndlessSkyTranslatorFixed
+
+httpx = pytest.importorskip('httpx')
+
+MISSION = 'mission "Food"\n\tdescription "Carry food to <destination> by <date>."\n'
+
+
+@pytest.fixture
+def make_translator(tmp_path):
+    """Traductor con el backend 'gtx' apuntando al servidor simulado"""
+    created = []
+
+    def make(server, **settings):
+        translator = EndlessSkyTranslatorFixed(tmp_path, 'es', GtxBackend(base_url=server.url))
+        translator.use_translation_memory = False
+        translator.batch_translation = False
+        translator.http2 = False
+        for name, value in settings.items():
+            setattr(translator, name, value)
+        created.append(translator)
+        return translator
+
+    yield make
+    for translator in created:
+        translator.close_scheduler()
+
+
+def test_throttle_backs_off_and_lowers_rate(mock_server, make_translator):
+    server = mock_server(throttle_rate=1.0, retry_after=1)
+    translator = make_translator(server, requests_per_second=20.0)
+    scheduler = translator.get_scheduler()
+
+    def throttled_once(text):
+        try:
+            return translator._call_backend(text)
+        finally:
+            server.throttle_rate = 0.0
+
+    started = time.monotonic()
+    result = scheduler.call(throttled_once, 'Hello there', 11)
+    elapsed = time.monotonic() - started
+
+    assert result
+    assert server.stats['throttled'] == 1
+    assert server.stats['requests'] == 2
+    assert scheduler.stats['retries'] == 1
+    # Retry-After: 1 -> el reintento no sale antes de un segundo
+    assert elapsed >= 1.0
+    assert scheduler.stats['backoff_wait'] >= 1.0
+    # AIMD: el ritmo se reduce a la mitad y solo se recupera poco a poco
+    assert scheduler.controller.decreases == 1
+    assert scheduler.controller.rate < translator.requests_per_second / 2 + 1
+
+
+def test_hung_request_times_out(mock_server, make_translator):
+    server = mock_server(timeout_rate=1.0, hang_seconds=3.0)
+    translator = make_translator(server, request_timeout=0.5, max_retries=0, hedge_requests=False)
+
+    started = time.monotonic()
+    with pytest.raises((RequestTimeoutError, httpx.TimeoutException)):
+        translator.get_scheduler().call(translator._call_backend, 'Hello there', 11)
+
+    assert time.monotonic() - started < 1.5
+    assert server.stats['hung'] == 1
+
+
+def test_hung_request_is_hedged(mock_server, make_translator):
+    delays = itertools.chain([3.0], itertools.repeat(0.0))
+    server = mock_server(latency=lambda rng: next(delays))
+    translator = make_translator(server, request_timeout=2.0, max_retries=0)
+    scheduler = translator.get_scheduler()
+    for _ in range(scheduler.hedge_min_samples):
+        scheduler.latency.add(0.05)
+
+    started = time.monotonic()
+    result = scheduler.call(translator._call_backend, 'Hello there', 11)
+
+    assert result
+    assert time.monotonic() - started < translator.request_timeout
+    assert scheduler.stats['hedges'] == 1
+    assert scheduler.stats['hedge_wins'] == 1
+
+
+def translate_mission(translator, tmp_path):
+    source = tmp_path / 'data' / 'human' / 'missions.txt'
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_text(MISSION, encoding='utf-8')
+    dest = tmp_path / 'out.txt'
+    translator.translate_file(source, dest)
+    return dest
+
+
+def test_mangled_placeholder_is_requeued_and_reported(mock_server, make_translator, tmp_path):
+    server = mock_server(mangle_rate=1.0, mangle_mode='drop')
+    translator = make_translator(server, max_requeue_rounds=1, use_translation_memory=True)
+    translator.open_translation_memory()
+    masked = mask_text("Carry food to <destination> by <date>.").text
+
+    dest = translate_mission(translator, tmp_path)
+    assert masked in translator.failed_segments
+    assert not dest.exists()
+
+    logs = []
+    assert translator.requeue_failed_segments(log=logs.append) == 1
+    translator.report_failed_segments(log=logs.append)
+
+    assert server.stats['mangled'] == 2       # Pasada normal + una ronda de reencolado
+    assert translator.translation_memory.get(masked) is None
+    assert any('Reencolando' in line for line in logs)
+    assert any('quedaron sin traducir' in line for line in logs)
+    assert any(masked[:50] in line for line in logs)
+
+
+def test_requeue_recovers_mangled_segment(mock_server, make_translator, tmp_path):
+    server = mock_server(mangle_rate=1.0, mangle_mode='drop')
+    translator = make_translator(server)
+
+    dest = translate_mission(translator, tmp_path)
+    assert translator.failed_segments
+
+    server.mangle_rate = 0.0
+    assert translator.requeue_failed_segments(log=lambda message: None) == 0
+    assert '<destination>' in dest.read_text(encoding='utf-8-sig')
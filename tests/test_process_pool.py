@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del procesamiento de archivos en varios procesos (contexto 'spawn')"""
+
+import shutil
+
+import pytest
+
+import process_pool
+from translator import EndlessSkyTranslatorFixed
+
+
+def read_outputs(translator):
+    """Archivos del plugin traducido: {ruta relativa: texto}"""
+    return {path.relative_to(translator.plugin_data_path).as_posix(): path.read_text(encoding='utf-8-sig')
+            for path in sorted(translator.plugin_data_path.rglob('*.txt'))}
+
+
+def run(base_path, **settings):
+    translator = EndlessSkyTranslatorFixed(base_path, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    for name, value in settings.items():
+        setattr(translator, name, value)
+    translator.run_translation()
+    return translator
+
+
+@pytest.fixture
+def services(monkeypatch):
+    """Servicios de traducción creados y conexiones de procesos de trabajo que atendió cada uno"""
+    created = []
+
+    class CountingService(process_pool.TranslationService):
+        def __init__(self, translator):
+            self.connections = 0
+            self.requests = 0
+            super().__init__(translator)
+            created.append(self)
+
+        def _serve(self, conn):
+            self.connections += 1
+            super()._serve(conn)
+
+    def translate_masked_segments(self, masked_texts):
+        created[-1].requests += 1
+        return original(self, masked_texts)
+
+    original = EndlessSkyTranslatorFixed.translate_masked_segments
+    monkeypatch.setattr(process_pool, 'TranslationService', CountingService)
+    monkeypatch.setattr(EndlessSkyTranslatorFixed, 'translate_masked_segments', translate_masked_segments)
+    return created
+
+
+def test_spawned_pool_matches_serial_run(game_dir, tmp_path_factory, services):
+    pool_dir = tmp_path_factory.mktemp('pool')
+    shutil.copytree(game_dir / 'data', pool_dir / 'data')
+
+    serial = run(game_dir)
+    pooled = run(pool_dir, process_pool_workers=2)
+
+    assert read_outputs(pooled) == read_outputs(serial)
+    assert read_outputs(pooled)
+    # Un único servicio en el proceso principal para todos los procesos de trabajo
+    assert len(services) == 1
+    service, = services
+    assert 1 <= service.connections <= 2
+    assert service.requests > 0
+    assert pooled._file_pool is None     # Cerrado al terminar
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de las diferencias por segmento entre versiones de un archivo"""
+
+import pytest
+
+from data_parser import DataDocument, Segment
+from segment_diff import diff_snapshots, node_paths, previous_translations, segment_snapshot
+from translator import EndlessSkyTranslatorFixed
+
+OLD = (
+    'mission "Cargo"\n'
+    '\tdescription "Deliver the cargo."\n'
+    '\ton offer\n'
+    '\t\tconversation\n'
+    '\t\t\t`The client waves at you.`\n'
+    '\t\t\t`"Be quick," she says.`\n'
+    'mission "Escort"\n'
+    '\tdescription "Escort the convoy."\n'
+)
+
+# Descripción de "Cargo" editada y una línea de diálogo nueva al final de la conversación
+NEW = OLD.replace('Deliver the cargo.', 'Deliver the cargo today.').replace(
+    'she says.`\n', 'she says.`\n\t\t\t`Her ship is waiting.`\n')
+
+
+def quoted_segments(document):
+    """Un segmento por cada último token entre comillas de una línea"""
+    segments = []
+    for node in document.nodes():
+        token = node.tokens[-1]
+        if token.quote and node.parent is not None:
+            segments.append(Segment(token.text, token.start, token.end, node))
+    return segments
+
+
+def snapshot(text):
+    document = DataDocument(text)
+    return segment_snapshot(document, quoted_segments(document))
+
+
+def test_paths_use_sibling_ordinals():
+    paths = set(node_paths(DataDocument(OLD)).values())
+
+    assert {
+        'mission "Cargo"/description',
+        'mission "Cargo"/on/conversation/`',
+        'mission "Cargo"/on/conversation/`#1',
+        'mission "Escort"/description',
+    } <= paths
+
+
+def test_ordinals_count_only_siblings_with_the_same_label():
+    document = DataDocument(
+        'mission "A"\n'
+        '\tconversation\n'
+        '\t\t`One.`\n'
+        '\t\tchoice\n'
+        '\t\t\t`\t"Yes."`\n'
+        '\t\t\t`\t"No."`\n'
+        '\t\t`Two.`\n'
+        '\t\tchoice\n'
+        '\t\t\t`\t"Maybe."`\n'
+    )
+
+    assert list(node_paths(document).values()) == [
+        'mission "A"',
+        'mission "A"/conversation',
+        'mission "A"/conversation/`',
+        'mission "A"/conversation/choice',
+        'mission "A"/conversation/choice/`',
+        'mission "A"/conversation/choice/`#1',
+        'mission "A"/conversation/`#1',
+        'mission "A"/conversation/choice#1',
+        'mission "A"/conversation/choice#1/`',
+    ]
+
+
+def test_repeated_root_names_get_ordinals():
+    paths = node_paths(DataDocument('ship "A"\nship "A"\n\tname "x"\n'))
+
+    assert paths == {0: 'ship "A"', 1: 'ship "A"#1', 2: 'ship "A"#1/name'}
+
+
+def test_edit_and_added_line():
+    diff = diff_snapshots(snapshot(OLD), snapshot(NEW))
+
+    assert diff.changed == ['mission "Cargo"/description']
+    assert diff.added == ['mission "Cargo"/on/conversation/`#2']
+    assert diff.removed == []
+    assert len(diff.unchanged) == 3
+
+
+def test_inserted_line_shifts_later_ordinals():
+    # Una línea nueva delante de las demás cambia el ordinal de las siguientes
+    new = OLD.replace('\t\t\t`The client', '\t\t\t`A new first line.`\n\t\t\t`The client')
+    diff = diff_snapshots(snapshot(OLD), snapshot(new))
+
+    assert diff.changed == ['mission "Cargo"/on/conversation/`', 'mission "Cargo"/on/conversation/`#1']
+    assert diff.added == ['mission "Cargo"/on/conversation/`#2']
+
+
+def test_removed_paths():
+    new = OLD.replace('\t\t\t`"Be quick," she says.`\n', '').replace(
+        'mission "Escort"\n\tdescription "Escort the convoy."\n', '')
+    diff = diff_snapshots(snapshot(OLD), snapshot(new))
+
+    assert diff.removed == ['mission "Cargo"/on/conversation/`#1', 'mission "Escort"/description']
+    assert diff.added == [] and diff.changed == []
+    assert diff.report_lines() == ['- mission "Cargo"/on/conversation/`#1', '- mission "Escort"/description']
+
+
+def test_report_lines_are_limited():
+    old = {f'a/`#{index}': [0, 'x'] for index in range(5)}
+    diff = diff_snapshots(old, {})
+
+    assert diff.report_lines(limit=2) == ['- a/`#0', '- a/`#1', '- ... y 3 más']
+
+
+def test_previous_translations_read_unchanged_tokens():
+    old_snapshot = snapshot(OLD)
+    output = OLD.replace('Escort the convoy.', 'Escolta el convoy.').replace(
+        'The client waves at you.', 'El cliente te saluda.')
+    diff = diff_snapshots(old_snapshot, snapshot(NEW))
+
+    translations = previous_translations(DataDocument(output), old_snapshot, diff.unchanged)
+
+    assert translations['mission "Escort"/description'] == 'Escolta el convoy.'
+    assert translations['mission "Cargo"/on/conversation/`'] == 'El cliente te saluda.'
+    assert 'mission "Cargo"/description' not in translations     # Cambiado: hay que traducirlo
+
+
+def test_previous_translations_skip_missing_nodes_and_partial_segments():
+    old_snapshot = snapshot(OLD)
+    old_snapshot['mission "Cargo"/on/conversation/`#1'][0] = -1    # Segmento dentro de un token
+    # Salida con solo el bloque traducido de "Escort"
+    output = 'mission "Escort"\n\tdescription "Escolta el convoy."\n'
+
+    translations = previous_translations(DataDocument(output), old_snapshot, list(old_snapshot))
+
+    assert translations == {'mission "Escort"/description': 'Escolta el convoy.'}
+
+
+@pytest.fixture
+def mission_dir(tmp_path):
+    source = tmp_path / 'data' / 'human' / 'missions.txt'
+    source.parent.mkdir(parents=True)
+    source.write_text(OLD, encoding='utf-8')
+    return tmp_path
+
+
+def run_counting_requests(base_path):
+    translator = EndlessSkyTranslatorFixed(base_path, 'es', 'pseudo')
+    translator.use_translation_memory = False
+    translator.batch_translation = False
+    sent = []
+    translate = translator.backend.translate
+
+    def counting_translate(text, *args, **kwargs):
+        sent.append(text)
+        return translate(text, *args, **kwargs)
+
+    translator.backend.translate = counting_translate
+    translator.run_translation()
+    return translator, sent
+
+
+def test_rerun_translates_only_edited_and_added_segments(mission_dir, tmp_path_factory, capsys):
+    _, first_run = run_counting_requests(mission_dir)
+    assert len(first_run) == 4
+    (mission_dir / 'data' / 'human' / 'missions.txt').write_text(NEW, encoding='utf-8')
+    capsys.readouterr()
+
+    translator, second_run = run_counting_requests(mission_dir)
+
+    # 2 segmentos enviados (editado + añadido) y 3 reutilizados de la salida anterior
+    assert sorted(second_run) == ['Deliver the cargo today.', 'Her ship is waiting.']
+    assert '1 añadidos, 1 cambiados, 0 eliminados; 3 traducciones reutilizadas' in capsys.readouterr().out
+    # La salida es la misma que la de una traducción desde cero de la versión nueva
+    output = translator.plugin_data_path / 'human' / 'missions.txt'
+    fresh_dir = tmp_path_factory.mktemp('fresh')
+    (fresh_dir / 'data' / 'human').mkdir(parents=True)
+    (fresh_dir / 'data' / 'human' / 'missions.txt').write_text(NEW, encoding='utf-8')
+    fresh, _ = run_counting_requests(fresh_dir)
+    fresh_output = fresh.plugin_data_path / 'human' / 'missions.txt'
+    assert output.read_text(encoding='utf-8-sig') == fresh_output.read_text(encoding='utf-8-sig')
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del escritor por inserciones y de la escritura atómica"""
+
+import io
+import os
+import stat
+
+import pytest
+
+from splice_writer import SpliceWriter, atomic_output
+
+SOURCE = 'ship "Star Barge"\n\tdescription "A slow ship."\n'
+
+
+class RecordingFile(io.StringIO):
+    """Archivo en memoria que anota cada escritura"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+
+def render(writer, start=0, end=None):
+    f = io.StringIO()
+    writer.write_range(f, start, end)
+    return f.getvalue()
+
+
+def span(text):
+    start = SOURCE.index(text)
+    return start, start + len(text)
+
+
+def test_no_edits_copies_source():
+    assert render(SpliceWriter(SOURCE)) == SOURCE
+
+
+def test_edits_are_applied():
+    writer = SpliceWriter(SOURCE)
+    writer.replace(*span('Star Barge'), 'Barcaza Estelar')
+    writer.replace(*span('A slow ship.'), 'Una nave lenta.')
+
+    assert render(writer) == 'ship "Barcaza Estelar"\n\tdescription "Una nave lenta."\n'
+    assert len(writer) == 2
+
+
+def test_out_of_order_replace_calls():
+    writer = SpliceWriter(SOURCE)
+    writer.replace(*span('A slow ship.'), 'Una nave lenta.')
+    writer.replace(*span('ship "'), 'nave "')
+    writer.replace(*span('Star Barge'), 'Barcaza Estelar')
+
+    assert render(writer) == 'nave "Barcaza Estelar"\n\tdescription "Una nave lenta."\n'
+
+
+def test_insertion_and_deletion():
+    writer = SpliceWriter('abcdef')
+    writer.replace(3, 3, 'XYZ')
+    writer.replace(0, 1, '')
+
+    assert render(writer) == 'bcXYZdef'
+
+
+@pytest.mark.parametrize('start, end', [
+    (-1, 2),
+    (3, 2),
+    (0, len(SOURCE) + 1),
+    (len(SOURCE) + 1, len(SOURCE) + 1),
+])
+def test_out_of_range_edit_is_rejected(start, end):
+    writer = SpliceWriter(SOURCE)
+
+    with pytest.raises(ValueError):
+        writer.replace(start, end, 'x')
+    assert len(writer) == 0
+
+
+@pytest.mark.parametrize('first, second', [
+    ((0, 5), (3, 8)),
+    ((3, 8), (0, 5)),      # Solapadas y registradas fuera de orden
+    ((2, 6), (3, 4)),      # Una dentro de otra
+    ((2, 6), (2, 6)),
+])
+def test_overlapping_edits_are_rejected(first, second):
+    writer = SpliceWriter(SOURCE)
+    writer.replace(*first, 'a')
+    writer.replace(*second, 'b')
+
+    with pytest.raises(ValueError, match='solapadas'):
+        render(writer)
+
+
+def test_adjacent_edits_are_not_overlapping():
+    writer = SpliceWriter('abcdef')
+    writer.replace(0, 3, '1')
+    writer.replace(3, 6, '2')
+
+    assert render(writer) == '12'
+
+
+def test_write_range_writes_only_its_edits():
+    writer = SpliceWriter(SOURCE)
+    writer.replace(*span('Star Barge'), 'Barcaza Estelar')
+    writer.replace(*span('A slow ship.'), 'Una nave lenta.')
+    second_line = SOURCE.index('\t')
+
+    assert render(writer, 0, second_line) == 'ship "Barcaza Estelar"\n'
+    assert render(writer, second_line) == '\tdescription "Una nave lenta."\n'
+
+
+def test_edit_crossing_range_end_is_rejected():
+    writer = SpliceWriter(SOURCE)
+    start, end = span('Star Barge')
+    writer.replace(start, end, 'Barcaza Estelar')
+
+    with pytest.raises(ValueError, match='cruza'):
+        render(writer, 0, start + 3)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1000])
+def test_unchanged_spans_are_copied_in_chunks(chunk_size):
+    writer = SpliceWriter(SOURCE, chunk_size=chunk_size)
+    writer.replace(*span('Star Barge'), 'Barcaza Estelar')
+    f = RecordingFile()
+
+    writer.write_to(f)
+
+    assert f.getvalue() == SOURCE.replace('Star Barge', 'Barcaza Estelar')
+    copied = [text for text in f.writes if text != 'Barcaza Estelar']
+    assert all(len(text) <= chunk_size for text in copied)
+    assert sum(map(len, copied)) == len(SOURCE) - len('Star Barge')
+
+
+def test_atomic_output_replaces_destination(tmp_path):
+    dest = tmp_path / 'ships.txt'
+    dest.write_text('old', encoding='utf-8')
+
+    with atomic_output(dest) as f:
+        f.write('nuevo')
+
+    assert dest.read_text(encoding='utf-8-sig') == 'nuevo'
+    assert dest.read_bytes().startswith(b'\xef\xbb\xbf')
+    assert stat.S_IMODE(os.stat(dest).st_mode) == 0o644
+    assert os.listdir(tmp_path) == ['ships.txt']
+
+
+def test_atomic_output_keeps_destination_on_error(tmp_path):
+    dest = tmp_path / 'ships.txt'
+    dest.write_text('old', encoding='utf-8')
+
+    with pytest.raises(RuntimeError):
+        with atomic_output(dest, encoding='utf-8') as f:
+            f.write('a medio escribir')
+            raise RuntimeError("interrumpido")
+
+    assert dest.read_text(encoding='utf-8') == 'old'
+    assert os.listdir(tmp_path) == ['ships.txt']     # Sin temporales abandonados
+
+
+def test_atomic_output_does_not_create_destination_on_error(tmp_path):
+    dest = tmp_path / 'ships.txt'
+
+    with pytest.raises(KeyboardInterrupt):
+        with atomic_output(dest) as f:
+            f.write('x')
+            raise KeyboardInterrupt
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la detección de codificación a nivel de bytes"""
+
+import codecs
+
+import pytest
+
+import text_encoding
+from text_encoding import (BOM_ENCODINGS, ENCODING_SAMPLE_BYTES, decode_data, detect_encoding,
+                           detect_file_encoding)
+
+TEXT = 'ship "Año"\n\tdescription "Señal débil."\n'
+
+
+class ChardetCalls(list):
+    """Tamaño de cada muestra que recibe chardet; responde siempre con answer"""
+
+    answer = 'ISO-8859-1'
+
+    def detect(self, sample):
+        self.append(len(sample))
+        return {'encoding': self.answer, 'confidence': 0.9}
+
+
+@pytest.fixture
+def chardet_calls(monkeypatch):
+    calls = ChardetCalls()
+    monkeypatch.setattr(text_encoding.chardet, 'detect', calls.detect)
+    return calls
+
+
+@pytest.fixture
+def no_chardet(monkeypatch):
+    def detect(sample):
+        raise AssertionError("chardet no debería usarse")
+
+    monkeypatch.setattr(text_encoding.chardet, 'detect', detect)
+
+
+@pytest.mark.parametrize('codec, encoding', [
+    ('utf-8-sig', 'utf-8-sig'),
+    ('utf-32', 'utf-32'),        # BOM del sistema (LE o BE)
+    ('utf-32-le', 'utf-32'),
+    ('utf-32-be', 'utf-32'),
+    ('utf-16', 'utf-16'),
+    ('utf-16-le', 'utf-16'),
+    ('utf-16-be', 'utf-16'),
+])
+def test_bom_table(no_chardet, codec, encoding):
+    raw = TEXT.encode(codec)
+    if codec.endswith(('-le', '-be')):
+        bom = {'utf-32-le': codecs.BOM_UTF32_LE, 'utf-32-be': codecs.BOM_UTF32_BE,
+               'utf-16-le': codecs.BOM_UTF16_LE, 'utf-16-be': codecs.BOM_UTF16_BE}[codec]
+        raw = bom + raw
+
+    assert detect_encoding(raw) == encoding
+    assert decode_data(raw) == (TEXT, encoding)
+
+
+def test_utf32_le_bom_is_checked_before_utf16_le():
+    # FF FE 00 00 también empieza por la BOM de UTF-16 LE (FF FE)
+    assert codecs.BOM_UTF32_LE.startswith(codecs.BOM_UTF16_LE)
+    boms = [bom for bom, _ in BOM_ENCODINGS]
+    for index, bom in enumerate(boms):
+        for later in boms[index + 1:]:
+            assert not later.startswith(bom) or later == bom
+
+
+def test_strict_utf8_fast_path_skips_chardet(no_chardet):
+    raw = TEXT.encode('utf-8')
+
+    assert detect_encoding(raw) == 'utf-8'
+    assert decode_data(raw) == (TEXT, 'utf-8')
+
+
+def test_ascii_is_utf8(no_chardet):
+    assert decode_data(b'ship "A"\n') == ('ship "A"\n', 'utf-8')
+
+
+def test_invalid_utf8_falls_back_to_chardet_sample(chardet_calls):
+    raw = TEXT.encode('latin-1')
+
+    assert decode_data(raw) == (TEXT, 'iso8859-1')
+    assert detect_encoding(raw) == 'iso8859-1'
+    assert chardet_calls == [len(raw), len(raw)]
+
+
+def test_chardet_sees_only_a_bounded_sample(chardet_calls):
+    raw = b'a' * (ENCODING_SAMPLE_BYTES * 3) + 'ñ'.encode('latin-1')
+
+    text, encoding = decode_data(raw)
+
+    assert chardet_calls == [ENCODING_SAMPLE_BYTES]
+    assert encoding == 'iso8859-1' and text.endswith('ñ')
+
+
+@pytest.mark.parametrize('answer', [None, 'no-such-codec'])
+def test_unusable_chardet_answer_means_utf8(chardet_calls, answer):
+    chardet_calls.answer = answer
+    raw = b'caf\xe9 \xc3\xa9'
+
+    text, encoding = decode_data(raw)
+
+    assert encoding == 'utf-8'
+    assert text == 'caf é'    # Los bytes inválidos se descartan
+
+
+def test_cut_utf8_character_in_partial_sample(chardet_calls):
+    raw = 'Señal'.encode('utf-8')
+    cut = raw[:raw.index(b'\xc3') + 1]     # Primer byte de 'ñ' al final de la muestra
+
+    assert detect_encoding(cut, complete=False) == 'utf-8'
+    assert chardet_calls == []
+    # Si la muestra es el archivo entero, el carácter cortado sí es un error
+    assert detect_encoding(cut, complete=True) == 'iso8859-1'
+    assert chardet_calls == [len(cut)]
+
+
+def test_file_sample_ending_mid_character(tmp_path, chardet_calls):
+    path = tmp_path / 'big.txt'
+    prefix = b'a' * (ENCODING_SAMPLE_BYTES - 1)
+    path.write_bytes(prefix + 'ñ'.encode('utf-8') + b'\n')
+
+    assert detect_file_encoding(path) == 'utf-8'
+    assert chardet_calls == []
+
+
+@pytest.mark.parametrize('raw, text', [
+    (b'a\r\nb\r\n', 'a\nb\n'),
+    (b'a\rb', 'a\nb'),
+    (b'a\nb', 'a\nb'),
+])
+def test_newlines_are_normalized(no_chardet, raw, text):
+    assert decode_data(raw)[0] == text
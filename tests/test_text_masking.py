@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del enmascarado y de la validación de marcadores"""
+
+import re
+
+import pytest
+
+from text_masking import mask_text, placeholder_mismatch, PlaceholderMismatch
+from translation_backends import PseudoLocalizationBackend
+from translator import EndlessSkyTranslatorFixed
+
+
+def test_restore_accepts_lowercased_and_spaced_placeholders():
+    masked = mask_text("Carry 10 tons of food to <destination> by <date>.")
+
+    translated = masked.text.replace('__GAMEVAR_0__', '__ gamevar_0 __').replace('__GAMEVAR_1__', '__gamevar_1__')
+
+    assert masked.restore(translated) == "Carry 10 tons of food to <destination> by <date>."
+
+
+def test_restore_rejects_dropped_placeholder():
+    masked = mask_text("Carry 10 tons of food to <destination> by <date>.")
+    translated = masked.text.replace('__GAMEVAR_0__', '')
+
+    with pytest.raises(PlaceholderMismatch) as error:
+        masked.restore(translated)
+
+    assert error.value.missing == [0]
+
+
+def test_mismatch_reports_unknown_placeholder():
+    mismatch = placeholder_mismatch("Go to __GAMEVAR_0__.", "Ve a __GAMEVAR_0__ y __GAMEVAR_7__.")
+
+    assert mismatch.missing == []
+    assert mismatch.unmatched == [7]
+
+
+class DroppingBackend(PseudoLocalizationBackend):
+    """Pseudo-localización que pierde los marcadores, como un traductor que los altera"""
+
+    def translate(self, text, target_lang, source_lang='en'):
+        return re.sub(r'__[A-Z]+_\d+__', '', super().translate(text, target_lang, source_lang))
+
+
+@pytest.mark.parametrize('batch_translation', [True, False])
+def test_mangled_translation_is_not_cached(game_dir, batch_translation):
+    translator = EndlessSkyTranslatorFixed(game_dir, 'es', DroppingBackend())
+    translator.batch_translation = batch_translation
+    translator.open_translation_memory()
+    source = game_dir / 'data' / 'human' / 'missions.txt'
+    source.write_text('mission "Food"\n\tdescription "Carry food to <destination> by <date>."\n',
+                      encoding='utf-8')
+    dest = game_dir / 'out.txt'
+
+    translator.translate_file(source, dest)
+
+    masked = mask_text("Carry food to <destination> by <date>.").text
+    assert translator.translation_memory.get(masked) is None
+    assert masked in translator.failed_segments
+    assert not dest.exists()    # Sin traducciones válidas el juego conserva el original
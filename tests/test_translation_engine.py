@@ -0,0 +1,694 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del planificador asíncrono de peticiones y de sus piezas"""
+
+import random
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+import translation_engine
+from translation_backends import PseudoLocalizationBackend
+from translation_engine import (AsyncTranslationScheduler, TokenBucket, AdaptiveRateController,
+                                CircuitBreaker, SegmentDeduplicator, backoff_delay, pack_batches,
+                                parse_retry_after, translate_batch)
+from translator import EndlessSkyTranslatorFixed
+
+
+@pytest.mark.parametrize('max_chars', [10, 50, 200, 4500])
+def test_batches_respect_max_chars(max_chars):
+    rng = random.Random(max_chars)
+    segments = [''.join(rng.choice('abc ') for _ in range(rng.randint(1, 60))) for _ in range(300)]
+
+    batches = pack_batches(segments, max_chars=max_chars)
+
+    assert [segment for batch in batches for segment in batch] == segments
+    for batch in batches:
+        assert len(batch) == 1 or len('\n'.join(batch)) <= max_chars
+
+
+@pytest.mark.parametrize('segments, batches', [
+    ([], []),
+    (['aaaa', 'bbbb'], [['aaaa', 'bbbb']]),              # 9 caracteres con el separador
+    (['aaaa', 'bbbbb'], [['aaaa'], ['bbbbb']]),          # 10: no caben juntos
+    (['a' * 10, 'b'], [['a' * 10], ['b']]),              # Igual al límite: va solo
+    (['a', 'b' * 25, 'c'], [['a'], ['b' * 25], ['c']]),  # Demasiado largo: va solo
+    (['a', 'b\nc', 'd'], [['a'], ['b\nc'], ['d']]),      # Contiene el separador: va solo
+])
+def test_pack_batches_table(segments, batches):
+    assert pack_batches(segments, max_chars=9) == batches
+
+
+class RecordingTranslate:
+    """Función de traducción que anota cada petición y devuelve lo que diga answer"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.requests = []
+
+    def __call__(self, text):
+        self.requests.append(text)
+        return self.answer(text)
+
+
+def test_translate_batch_sends_one_request():
+    translate = RecordingTranslate(lambda text: text.upper().replace('\n', ' \n '))
+
+    assert translate_batch(translate, ['one', 'two', 'three']) == ['ONE', 'TWO', 'THREE']
+    assert translate.requests == ['one\ntwo\nthree']
+
+
+def test_translate_batch_single_segment_is_not_joined():
+    translate = RecordingTranslate(lambda text: text + '\nextra')
+
+    assert translate_batch(translate, ['one']) == ['one\nextra']
+
+
+@pytest.mark.parametrize('answer', [
+    lambda text: text.replace('\n', ' '),              # Une dos segmentos
+    lambda text: text.replace('two', 'tw\no'),         # Parte un segmento
+    lambda text: text.split('\n')[0],                  # Pierde segmentos
+    lambda text: text + '\n',                          # Añade una línea vacía
+])
+def test_translate_batch_rejects_changed_separators(answer):
+    translate = RecordingTranslate(answer)
+
+    assert translate_batch(translate, ['one', 'two', 'three']) is None
+    assert len(translate.requests) == 1
+
+
+class FakeClock:
+    """Sustituto del módulo time: sleep() avanza el reloj en lugar de dormir"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(translation_engine, 'time', fake)
+    return fake
+
+
+def test_bucket_burst_then_configured_rate(clock):
+    bucket = TokenBucket(10, capacity=5)
+
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.slept == 0.0
+
+    for _ in range(10):
+        bucket.acquire()
+    # 10 peticiones más a 10 por segundo: un segundo de espera en total
+    assert clock.slept == pytest.approx(1.0)
+    assert bucket.total_wait == pytest.approx(1.0)
+
+
+def test_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(4, capacity=4)
+    for _ in range(4):
+        bucket.acquire()
+
+    clock.now += 0.5
+    bucket.acquire(2)
+    assert clock.slept == 0.0
+    bucket.acquire(1)
+    assert clock.slept == pytest.approx(0.25)
+
+
+def test_oversized_request_leaves_debt(clock):
+    bucket = TokenBucket(10, capacity=10)
+
+    bucket.acquire(30)
+    assert clock.slept == pytest.approx(2.0)
+    bucket.acquire(1)
+    assert clock.slept == pytest.approx(2.1)
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket(None)
+
+    for _ in range(100):
+        bucket.acquire(50)
+    assert clock.slept == 0.0
+    assert bucket.try_acquire(10 ** 6)
+
+
+def test_try_acquire_does_not_wait_or_borrow(clock):
+    bucket = TokenBucket(2, capacity=2)
+
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire(1)
+    bucket.refund(1)
+    assert bucket.try_acquire(1)
+    clock.now += 0.5
+    assert bucket.try_acquire(1)
+    assert clock.slept == 0.0
+
+
+def test_set_rate_keeps_accumulated_tokens(clock):
+    bucket = TokenBucket(10, capacity=10)
+    for _ in range(10):
+        bucket.acquire()
+
+    bucket.set_rate(2)
+    bucket.acquire()
+    assert clock.slept == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('0', 0.0),
+    ('5', 5.0),
+    (' 12 ', 12.0),
+    ('1.5', 1.5),
+    (7, 7.0),
+    ('-3', 0.0),
+    ('soon', None),
+    ('', None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+@pytest.mark.parametrize('offset, expected', [
+    (30, 30.0),
+    (0, 0.0),
+    (-60, 0.0),     # Una fecha pasada no obliga a esperar
+])
+def test_parse_retry_after_http_date(clock, offset, expected):
+    value = formatdate(clock.now + offset, usegmt=True)
+
+    assert parse_retry_after(value) == pytest.approx(expected, abs=1.0)
+
+
+@pytest.mark.parametrize('attempt, base, cap, ceiling', [
+    (0, 1.0, 60.0, 1.0),
+    (1, 1.0, 60.0, 2.0),
+    (3, 1.0, 60.0, 8.0),
+    (5, 1.0, 60.0, 32.0),
+    (6, 1.0, 60.0, 60.0),      # El tope corta el crecimiento exponencial
+    (20, 1.0, 60.0, 60.0),
+    (4, 0.5, 5.0, 5.0),
+])
+def test_backoff_delay_jitter_bounds(monkeypatch, attempt, base, cap, ceiling):
+    monkeypatch.setattr(translation_engine.random, 'uniform', lambda low, high: high)
+    assert backoff_delay(attempt, base, cap) == ceiling
+    monkeypatch.setattr(translation_engine.random, 'uniform', lambda low, high: low)
+    assert backoff_delay(attempt, base, cap) == 0.0
+    monkeypatch.undo()
+
+    delays = [backoff_delay(attempt, base, cap) for _ in range(200)]
+    assert all(0.0 <= delay <= ceiling for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize('attempt, retry_after, minimum', [
+    (0, 10.0, 10.0),           # Retry-After manda aunque supere el tope
+    (2, 100.0, 100.0),
+    (0, 0.0, 0.0),
+])
+def test_backoff_delay_honours_retry_after(attempt, retry_after, minimum):
+    delay = backoff_delay(attempt, base_delay=1.0, max_delay=60.0, retry_after=retry_after)
+
+    assert minimum <= delay <= max(minimum, 60.0)
+
+
+def test_controller_halves_once_per_cooldown(clock):
+    controller = AdaptiveRateController(8, max_rate=10.0, min_rate=1.0, cooldown=1.0)
+
+    assert controller.on_throttle()
+    assert (controller.concurrency_limit, controller.rate) == (4, 5.0)
+    # Limitaciones de peticiones que ya estaban en vuelo: no vuelven a reducir
+    assert not controller.on_throttle()
+    assert (controller.concurrency_limit, controller.rate) == (4, 5.0)
+
+    clock.now += 1.0
+    assert controller.on_throttle()
+    assert (controller.concurrency_limit, controller.rate) == (2, 2.5)
+    assert controller.decreases == 2
+
+
+@pytest.mark.parametrize('throttles, concurrency, rate', [
+    (1, 4, 5.0),
+    (2, 2, 2.5),
+    (3, 1, 1.25),
+    (4, 1, 1.0),       # Nunca por debajo de un hueco ni del ritmo mínimo
+    (10, 1, 1.0),
+])
+def test_controller_multiplicative_decrease(clock, throttles, concurrency, rate):
+    controller = AdaptiveRateController(8, max_rate=10.0, min_rate=1.0, cooldown=1.0)
+    for _ in range(throttles):
+        clock.now += 1.0
+        controller.on_throttle()
+
+    assert controller.concurrency_limit == concurrency
+    assert controller.rate == pytest.approx(rate)
+    assert controller.backed_off
+
+
+def test_controller_additive_increase(clock):
+    controller = AdaptiveRateController(8, max_rate=10.0, min_rate=1.0, rate_increase=0.5)
+    controller.on_throttle()
+    controller.on_throttle()
+    clock.now += 1.0
+    controller.on_throttle()
+    assert (controller.concurrency_limit, controller.rate) == (2, 2.5)
+
+    # Un hueco más por cada ventana completa de éxitos (2 -> 2.5 -> 2.9 -> 3.24)
+    controller.on_success()
+    controller.on_success()
+    assert controller.concurrency_limit == 2
+    controller.on_success()
+    assert controller.concurrency_limit == 3
+    assert controller.rate == pytest.approx(4.0)
+
+    for _ in range(100):
+        controller.on_success()
+    assert (controller.concurrency_limit, controller.rate) == (8, 10.0)
+    assert not controller.backed_off
+
+
+def test_controller_without_rate_limit():
+    controller = AdaptiveRateController(4)
+
+    controller.on_throttle()
+    controller.on_success()
+    assert controller.rate is None
+    assert controller.concurrency_limit == 2
+
+
+@pytest.mark.parametrize('failures, state', [
+    (1, CircuitBreaker.CLOSED),
+    (2, CircuitBreaker.CLOSED),
+    (3, CircuitBreaker.OPEN),
+])
+def test_breaker_trips_after_threshold(clock, failures, state):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0)
+    opened = [breaker.record_failure() for _ in range(failures)]
+
+    assert breaker.state == state
+    assert opened[-1] == (state == CircuitBreaker.OPEN)
+    assert breaker.before_request() == (10.0 if state == CircuitBreaker.OPEN else 0.0)
+
+
+def test_breaker_half_open_probe_then_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 4.0
+    assert breaker.before_request() == pytest.approx(6.0)
+    clock.now += 6.0
+    # Semiabierto: solo sale una petición de prueba
+    assert breaker.before_request() == 0.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_request() == 1.0
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.before_request() == 0.0
+    assert (breaker.failures, breaker.trips) == (0, 0)
+
+
+def test_breaker_failed_probe_doubles_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, max_reset_timeout=25.0, max_trips=3)
+    waits = []
+    for _ in range(2):
+        assert breaker.record_failure()
+        waits.append(breaker.before_request())
+        clock.now += waits[-1]
+        assert breaker.before_request() == 0.0    # Petición de prueba
+
+    assert waits == [10.0, 20.0]
+    assert not breaker.exhausted
+    assert breaker.record_failure()
+    assert breaker.exhausted
+    assert breaker.trips == breaker.total_trips == 3
+
+    breaker.reset()
+    assert not breaker.exhausted
+    assert breaker.before_request() == pytest.approx(25.0)   # La espera en curso se respeta
+
+
+class ConcurrencyProbe:
+    """Backend que anota cuántas llamadas coinciden a la vez"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, item):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return item
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 3, 8])
+def test_peak_in_flight_never_exceeds_max_concurrency(max_concurrency):
+    scheduler = AsyncTranslationScheduler(max_concurrency=max_concurrency, requests_per_second=None)
+    probe = ConcurrencyProbe()
+    try:
+        assert scheduler.map(probe, range(30), chars_fn=lambda item: 0) == list(range(30))
+    finally:
+        scheduler.close()
+
+    assert scheduler.stats['peak_in_flight'] == max_concurrency
+    assert probe.peak <= max_concurrency
+
+
+def test_scheduler_respects_request_rate():
+    # Ráfaga de 10 fichas y después 20 por segundo: 10 peticiones más tardan 0.5s
+    scheduler = AsyncTranslationScheduler(max_concurrency=8, requests_per_second=20.0, hedge=False)
+    scheduler.request_bucket = TokenBucket(20.0, capacity=10)
+    try:
+        started = time.monotonic()
+        scheduler.map(lambda item: item, range(20), chars_fn=lambda item: 0)
+        elapsed = time.monotonic() - started
+    finally:
+        scheduler.close()
+
+    assert 0.45 <= elapsed < 1.5
+    assert scheduler.stats['requests'] == 20
+
+
+def test_scheduler_respects_char_rate():
+    scheduler = AsyncTranslationScheduler(max_concurrency=4, requests_per_second=None,
+                                          chars_per_second=100.0)
+    try:
+        started = time.monotonic()
+        scheduler.map(lambda item: item, ['x' * 50] * 4)
+        elapsed = time.monotonic() - started
+    finally:
+        scheduler.close()
+
+    # 200 caracteres con una ráfaga de 100 y 100 por segundo: un segundo de espera
+    assert 0.95 <= elapsed < 2.0
+    assert scheduler.stats['chars'] == 200
+
+
+def test_map_keeps_order_and_returns_exceptions():
+    scheduler = AsyncTranslationScheduler(max_concurrency=4, requests_per_second=None, max_retries=0,
+                                          failure_threshold=100)
+
+    def translate(item):
+        # Los primeros elementos terminan los últimos
+        time.sleep(0.01 * (10 - item))
+        if item % 3 == 0:
+            raise ValueError(f"fallo {item}")
+        return item * 2
+
+    try:
+        results = scheduler.map(translate, range(10), chars_fn=lambda item: 0)
+    finally:
+        scheduler.close()
+
+    for item, result in enumerate(results):
+        if item % 3 == 0:
+            assert isinstance(result, ValueError)
+            assert str(result) == f"fallo {item}"
+        else:
+            assert result == item * 2
+
+
+def test_map_of_nothing_does_not_start_loop():
+    scheduler = AsyncTranslationScheduler()
+
+    assert scheduler.map(len, []) == []
+    assert scheduler._loop is None
+
+
+class SlowFirstCall:
+    """Backend cuya primera llamada se retrasa y las siguientes responden al momento"""
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(self.delay)
+        return text.upper()
+
+
+def hedging_scheduler(**kwargs):
+    """Planificador con historial de latencias suficiente para lanzar duplicados enseguida"""
+    options = dict(max_concurrency=2, requests_per_second=None, hedge_min_samples=1,
+                   request_timeout=5.0)
+    options.update(kwargs)
+    scheduler = AsyncTranslationScheduler(**options)
+    scheduler.latency.add(0.01)
+    return scheduler
+
+
+@pytest.fixture
+def make_scheduler():
+    created = []
+
+    def make(**kwargs):
+        scheduler = hedging_scheduler(**kwargs)
+        created.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in created:
+        scheduler.close()
+
+
+def test_hedge_wins_when_slot_and_tokens_are_free(make_scheduler):
+    scheduler = make_scheduler()
+    backend = SlowFirstCall()
+
+    assert scheduler.call(backend, 'hola') == 'HOLA'
+    assert scheduler.stats['hedges'] == 1
+    assert scheduler.stats['hedge_wins'] == 1
+    assert scheduler.stats['requests'] == 2
+    assert scheduler.stats['peak_in_flight'] == 2
+
+
+def test_hedge_counts_against_concurrency(make_scheduler):
+    scheduler = make_scheduler(max_concurrency=1)
+    backend = SlowFirstCall(delay=0.1)
+
+    assert scheduler.call(backend, 'hola') == 'HOLA'
+    assert scheduler.stats['hedges'] == 0
+    assert scheduler.stats['peak_in_flight'] == 1
+    assert backend.calls == 1
+
+
+def test_hedge_skipped_without_request_tokens(make_scheduler):
+    scheduler = make_scheduler(requests_per_second=1.0)
+    backend = SlowFirstCall(delay=0.1)
+
+    # El cubo arranca con una sola ficha, que se lleva la petición original
+    assert scheduler.call(backend, 'hola') == 'HOLA'
+    assert scheduler.stats['hedges'] == 0
+    assert backend.calls == 1
+
+
+def test_hedge_skipped_without_char_tokens(make_scheduler):
+    scheduler = make_scheduler(chars_per_second=10)
+    backend = SlowFirstCall(delay=0.1)
+
+    assert scheduler.call(backend, 'hola', chars=8) == 'HOLA'
+    assert scheduler.stats['hedges'] == 0
+    assert scheduler.stats['chars'] == 8
+    # Las fichas de petición no se pierden cuando el duplicado no sale
+    assert scheduler.request_bucket.try_acquire(1)
+
+
+def test_hedge_skipped_while_backed_off(make_scheduler):
+    scheduler = make_scheduler()
+    scheduler.controller.on_throttle()
+    backend = SlowFirstCall(delay=0.1)
+
+    assert scheduler.call(backend, 'hola') == 'HOLA'
+    assert scheduler.stats['hedges'] == 0
+
+
+def test_hedge_skipped_during_retry_after_pause(make_scheduler):
+    scheduler = make_scheduler()
+    backend = SlowFirstCall(delay=0.1)
+    calls = []
+
+    def pause_then_translate(text):
+        if not calls:
+            # El servidor pide una pausa mientras la petición original sigue en vuelo
+            scheduler._resume_at = time.monotonic() + 60
+        calls.append(text)
+        return backend(text)
+
+    assert scheduler.call(pause_then_translate, 'hola') == 'HOLA'
+    assert scheduler.stats['hedges'] == 0
+
+
+def claim_concurrently(table, key, count):
+    """Reclama key desde count hilos a la vez; devuelve [(future, es_propietario)]"""
+    barrier = threading.Barrier(count)
+    claims = [None] * count
+
+    def claim(index):
+        barrier.wait()
+        claims[index] = table.claim(key)
+
+    threads = [threading.Thread(target=claim, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return claims
+
+
+def test_concurrent_claims_have_a_single_owner():
+    table = SegmentDeduplicator()
+
+    claims = claim_concurrently(table, 'Hello __GAMEVAR_0__', 16)
+
+    assert sum(is_owner for _, is_owner in claims) == 1
+    assert len({id(future) for future, _ in claims}) == 1
+    table.resolve('Hello __GAMEVAR_0__', 'Hola __GAMEVAR_0__')
+    assert all(future.result(timeout=1) == 'Hola __GAMEVAR_0__' for future, _ in claims)
+    assert table.stats() == {'occurrences': 16, 'unique': 1, 'saved': 15, 'coalesced': 15}
+
+
+def test_failure_reaches_waiters_and_releases_segment():
+    table = SegmentDeduplicator()
+    future, is_owner = table.claim('x')
+    waiter, waiter_is_owner = table.claim('x')
+    assert is_owner and not waiter_is_owner
+
+    table.fail('x', RuntimeError("sin red"))
+
+    for claimed in (future, waiter):
+        with pytest.raises(RuntimeError, match='sin red'):
+            claimed.result(timeout=1)
+    # El segmento queda libre: el siguiente en pedirlo es el nuevo propietario
+    retry, is_owner = table.claim('x')
+    assert is_owner and retry is not future
+    assert not table.resolved('x')
+    table.resolve('x', 'y')
+    assert table.resolved('x')
+
+
+def test_resolved_segment_is_not_coalesced():
+    table = SegmentDeduplicator()
+    table.claim('x')
+    table.resolve('x', 'y')
+
+    future, is_owner = table.claim('x')
+
+    assert not is_owner and future.result() == 'y'
+    assert table.stats()['coalesced'] == 0
+
+
+def test_prefetch_claims_are_not_occurrences():
+    table = SegmentDeduplicator()
+    table.claim('x', occurrence=False)
+    table.claim('x')
+
+    assert table.stats()['occurrences'] == 1
+
+
+class GatedBackend(PseudoLocalizationBackend):
+    """Pseudo-localización que espera a que se abra la puerta y puede fallar las primeras veces"""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.gate = threading.Event()
+        self.calls = 0
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def translate(self, text, target_lang, source_lang='en'):
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self.failures
+        self.gate.wait(5)
+        if fail:
+            raise RuntimeError("backend caído")
+        return super().translate(text, target_lang, source_lang)
+
+
+def translate_concurrently(translator, text, count):
+    results = [None] * count
+
+    def translate(index):
+        results[index] = translator.translate_text(text)
+
+    threads = [threading.Thread(target=translate, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    # Todos los hilos han reclamado el segmento antes de que responda el backend
+    deadline = time.monotonic() + 5
+    while translator.segment_table.stats()['occurrences'] < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    translator.backend.gate.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture
+def make_translator(tmp_path):
+    created = []
+
+    def make(backend):
+        translator = EndlessSkyTranslatorFixed(tmp_path, 'es', backend)
+        translator.use_translation_memory = False
+        translator.max_retries = 0
+        created.append(translator)
+        return translator
+
+    yield make
+    for translator in created:
+        translator.close_scheduler()
+
+
+def test_concurrent_translations_share_one_backend_call(make_translator):
+    translator = make_translator(GatedBackend())
+    text = "Deliver the cargo to <destination>."
+
+    results = translate_concurrently(translator, text, 8)
+
+    assert translator.backend.calls == 1
+    assert len(set(results)) == 1 and results[0] != text
+    assert translator.segment_table.stats()['coalesced'] == 7
+
+
+def test_failed_translation_reaches_waiters_then_retries(make_translator):
+    translator = make_translator(GatedBackend(failures=1))
+    text = "Deliver the cargo to <destination>."
+
+    results = translate_concurrently(translator, text, 8)
+
+    # Todos reciben el error (y conservan el texto original) con una sola petición
+    assert translator.backend.calls == 1
+    assert results == [text] * 8
+    assert len(translator.failed_segments) == 1
+
+    retried = translator.translate_text(text)
+    assert translator.backend.calls == 2
+    assert retried != text
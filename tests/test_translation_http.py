@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del cliente HTTP compartido"""
+
+import pytest
+
+from translation_http import SharedClientView
+
+httpx = pytest.importorskip('httpx')
+
+
+def test_view_headers_do_not_leak_into_shared_client():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get('Referer'))
+        return httpx.Response(200, text='ok')
+
+    shared = httpx.Client(transport=httpx.MockTransport(handler))
+    view = SharedClientView(shared, {'Referer': 'https://translate.google.com'})
+
+    view.get('https://example.test/a')
+    shared.get('https://example.test/b')
+    view.close()
+
+    assert seen == ['https://translate.google.com', None]
+    assert 'Referer' not in shared.headers
+    assert not shared.is_closed
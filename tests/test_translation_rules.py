@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del alcance de las reglas declarativas de traducción"""
+
+from translator import EndlessSkyTranslatorFixed
+
+PERSONS = (
+    'phrase "bloodsea hail"\n'
+    '\tword\n'
+    '\t\t"Welcome to the Bloodsea."\n'
+    '\n'
+    'person "Bloodsea"\n'
+    '\tgovernment "Bloodsea"\n'
+    '\tphrase\n'
+    '\t\tword\n'
+    '\t\t\t"You should not have come here."\n'
+)
+
+
+def test_persons_rule_only_translates_root_phrases(tmp_path):
+    source = tmp_path / 'persons.txt'
+    source.write_text(PERSONS, encoding='utf-8')
+    dest = tmp_path / 'out.txt'
+    translator = EndlessSkyTranslatorFixed(tmp_path, 'es', 'pseudo')
+    translator.use_translation_memory = False
+
+    translator.translate_persons_file(source, dest)
+
+    output = dest.read_text(encoding='utf-8-sig')
+    assert '"Welcome to the Bloodsea."' not in output
+    assert '\t\t\t"You should not have come here."\n' in output
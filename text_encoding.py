@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detección rápida de codificación para el Traductor de Endless Sky
+Casi todos los archivos de data/ son UTF-8: en lugar de pasar el archivo entero
+por chardet (lento en archivos de varios megabytes) y volver a leerlo, se leen
+los bytes una sola vez y se prueba en este orden:
+    1. Marca de orden de bytes (BOM): UTF-8, UTF-32 o UTF-16.
+    2. Decodificación UTF-8 estricta de los bytes; si funciona, el texto ya está listo.
+    3. chardet sobre una muestra acotada (ENCODING_SAMPLE_BYTES) solo si falla lo anterior.
+"""
+
+import codecs
+import chardet
+
+# Bytes que chardet analiza como máximo cuando el archivo no es UTF-8
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# UTF-32 antes que UTF-16: la BOM de UTF-32 LE empieza por la de UTF-16 LE
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def bom_encoding(raw):
+    """Codificación indicada por la BOM inicial de raw, o None"""
+    for bom, encoding in BOM_ENCODINGS:
+        if raw.startswith(bom):
+            return encoding
+    return None
+
+
+def sample_encoding(raw):
+    """Codificación que chardet propone para los primeros ENCODING_SAMPLE_BYTES bytes"""
+    encoding = chardet.detect(raw[:ENCODING_SAMPLE_BYTES])['encoding'] or 'utf-8'
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return 'utf-8'
+
+
+def detect_encoding(raw, complete=True):
+    """Codificación de unos bytes por la vía rápida (BOM, UTF-8 estricto, muestra para chardet)
+
+    complete=False indica que raw es solo el principio del archivo: un carácter UTF-8
+    cortado al final de la muestra no descarta UTF-8.
+    """
+    encoding = bom_encoding(raw)
+    if encoding is not None:
+        return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(raw, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return sample_encoding(raw)
+
+
+def normalize_newlines(text):
+    """Saltos de línea universales, como al abrir el archivo en modo texto"""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def decode_data(raw):
+    """Decodifica los bytes de un archivo de datos; devuelve (texto, codificación)
+
+    Cada vía decodifica los bytes una sola vez: si la decodificación UTF-8 estricta
+    funciona, su resultado es el texto. Los caracteres inválidos en la codificación
+    detectada se descartan (igual que errors='ignore').
+    """
+    encoding = bom_encoding(raw)
+    if encoding is None:
+        try:
+            return normalize_newlines(raw.decode('utf-8')), 'utf-8'
+        except UnicodeDecodeError:
+            encoding = sample_encoding(raw)
+    return normalize_newlines(raw.decode(encoding, errors='ignore')), encoding
+
+
+def read_data_text(file_path):
+    """Lee un archivo una sola vez y devuelve (texto, codificación)"""
+    with open(file_path, 'rb') as f:
+        return decode_data(f.read())
+
+
+def detect_file_encoding(file_path):
+    """Codificación de un archivo leyendo solo su principio"""
+    with open(file_path, 'rb') as f:
+        return detect_encoding(f.read(ENCODING_SAMPLE_BYTES), complete=False)
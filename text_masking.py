@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de enmascarado para el Traductor de Endless Sky
+Sustituye en una sola pasada los elementos del juego que no deben traducirse
+(<variables>, unidades, coordenadas, "Nombres", archivos) por marcadores __TIPO_n__
+y los restaura con una única sustitución insensible a mayúsculas. Una traducción
+que pierde o inventa marcadores se rechaza (PlaceholderMismatch) en lugar de
+escribirse sin el valor original
+"""
+
+import re
+
+# Reglas de preservación en orden de prioridad: (tipo, patrón)
+# Si dos reglas empiezan en la misma posición gana la primera
+PRESERVATION_RULES = [
+    ('GAMEVAR', r'<[^>]+>'),                                  # <planet>, <origin>, <tons>...
+    ('GAMEUNIT', r'\b\d+(?:[.,]\d+)?\s*(?i:credits?|tons?|jumps?|days?|units?|MW|GW|kW|km|m)\b'),
+    ('COORD', r'\b-?\d+(?:\.\d+)?\s+-?\d+(?:\.\d+)?\b'),     # 150.5 -200.3
+    ('QUOTEDNAME', r'"[A-Z][^"]*"'),                          # "Nombres" de naves, sistemas...
+    ('FILE', r'\b\w+\.\w+\b'),                                # archivo.txt
+]
+
+# Marcador tal y como puede volver del traductor: en minúsculas o con espacios alrededor
+RESTORE_PATTERN = re.compile(r'__\s*([A-Za-z]+)_(\d+)\s*__')
+
+
+class PlaceholderMismatch(ValueError):
+    """La traducción no conserva los marcadores del texto enmascarado"""
+
+    def __init__(self, missing, unmatched):
+        self.missing = missing        # Números de marcador que faltan en la traducción
+        self.unmatched = unmatched    # Números de marcador que no existen en el original
+        details = []
+        if missing:
+            details.append(f"faltan {', '.join(f'#{number}' for number in missing)}")
+        if unmatched:
+            details.append(f"sobran {', '.join(f'#{number}' for number in unmatched)}")
+        super().__init__(f"marcadores alterados por el traductor ({'; '.join(details)})")
+
+
+def placeholder_numbers(text):
+    """Números de los marcadores presentes en un texto (admite mayúsculas y espacios cambiados)"""
+    return {int(match.group(2)) for match in RESTORE_PATTERN.finditer(text)}
+
+
+def placeholder_mismatch(masked_text, translated):
+    """PlaceholderMismatch si la traducción perdió o añadió marcadores, o None si están todos"""
+    expected = placeholder_numbers(masked_text)
+    found = placeholder_numbers(translated)
+    if expected == found:
+        return None
+    return PlaceholderMismatch(sorted(expected - found), sorted(found - expected))
+
+
+class MaskedText:
+    """Resultado del enmascarado: texto con marcadores y tabla número -> valor original"""
+
+    __slots__ = ('text', 'values', 'kinds', 'prefix', 'suffix')
+
+    def __init__(self, text, values, kinds, prefix='', suffix=''):
+        self.text = text
+        self.values = values      # values[n] es el valor de __TIPO_n__
+        self.kinds = kinds        # kinds[n] es el TIPO de __TIPO_n__
+        self.prefix = prefix      # Guion bajo inicial (tecla de acceso rápido)
+        self.suffix = suffix      # Puntos suspensivos finales
+
+    def values_of(self, kind):
+        """Valores preservados de un tipo, sin repetir, en orden de aparición"""
+        return list(dict.fromkeys(value for value, value_kind in zip(self.values, self.kinds)
+                                  if value_kind == kind))
+
+    def restore(self, translated):
+        """Sustituye los marcadores de la traducción por sus valores originales
+
+        Lanza PlaceholderMismatch si falta algún marcador del texto enmascarado o queda
+        alguno sin valor: el resultado perdería texto del juego.
+        """
+        mismatch = placeholder_mismatch(self.text, translated)
+        if mismatch is not None:
+            raise mismatch
+        values = self.values
+
+        def replace(match):
+            return values[int(match.group(2))]
+
+        return RESTORE_PATTERN.sub(replace, translated)
+
+    def wrap(self, text):
+        """Vuelve a añadir el guion bajo inicial y los puntos suspensivos finales"""
+        return f"{self.prefix}{text}{self.suffix}"
+
+
+class TextMasker:
+    """Compila todas las reglas de preservación en un único escáner"""
+
+    def __init__(self, rules=PRESERVATION_RULES):
+        self.rules = list(rules)
+        self._rank = {kind: index for index, (kind, _) in enumerate(self.rules)}
+        self._scanner = re.compile('|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in self.rules))
+
+    def mask(self, text):
+        """Enmascara un texto ya recortado y devuelve un MaskedText"""
+        prefix = '_' if text.startswith('_') else ''
+        body = text[len(prefix):]
+        suffix = '...' if body.endswith('...') else ''
+        if suffix:
+            body = body[:-3]
+
+        matches = list(self._scanner.finditer(body))
+        if not matches:
+            return MaskedText(body, [], [], prefix, suffix)
+
+        # Numeración por tipo y luego por posición, como hacía el enmascarado por pasadas,
+        # para que las claves de la memoria de traducción sigan siendo las mismas
+        order = sorted(range(len(matches)), key=lambda index: (self._rank[matches[index].lastgroup], index))
+        values = [None] * len(matches)
+        kinds = [None] * len(matches)
+        placeholders = {}
+        for number, index in enumerate(order):
+            match = matches[index]
+            values[number] = match.group()
+            kinds[number] = match.lastgroup
+            placeholders.setdefault(match.group(), f"__{match.lastgroup}_{number}__")
+
+        parts = []
+        position = 0
+        for match in matches:
+            parts.append(body[position:match.start()])
+            parts.append(placeholders[match.group()])
+            position = match.end()
+        parts.append(body[position:])
+        return MaskedText(''.join(parts), values, kinds, prefix, suffix)
+
+
+_default_masker = TextMasker()
+
+
+def mask_text(text):
+    """Enmascara un texto con las reglas por defecto"""
+    return _default_masker.mask(text)
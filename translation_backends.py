@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de traducción para el Traductor de Endless Sky
+Interfaz común y registro de motores: googletrans, gtx, deep-translator y pseudo-localización offline
+"""
+
+import re
+import threading
+
+from translation_engine import (translate_batch, parse_retry_after, ThrottledError,
+                                THROTTLE_STATUS_CODES, DEFAULT_MAX_BATCH_CHARS)
+
+# Registro de backends disponibles: nombre -> clase
+BACKENDS = {}
+
+DEFAULT_BACKEND = 'googletrans'
+
+
+def register_backend(cls):
+    """Decorador que añade una clase de backend al registro"""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def available_backends():
+    """Devuelve los nombres de los backends registrados"""
+    return list(BACKENDS.keys())
+
+
+def create_backend(name=DEFAULT_BACKEND, **options):
+    """Crea una instancia del backend indicado"""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de traducción desconocido: '{name}'. Disponibles: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**options)
+
+
+class TranslationBackend:
+    """Interfaz común de los backends de traducción"""
+
+    name = 'base'
+    max_chars = DEFAULT_MAX_BATCH_CHARS   # Tamaño máximo de una petición
+    requires_network = True               # False = no necesita límite de velocidad
+    uses_http_client = False              # True = acepta el cliente httpx compartido
+
+    def use_http_client(self, client):
+        """Usa el cliente HTTP compartido (los backends que no usan httpx lo ignoran)"""
+
+    def translate(self, text, target_lang, source_lang='en'):
+        """Traduce un texto y devuelve la traducción"""
+        raise NotImplementedError
+
+    def translate_batch(self, batch, target_lang, source_lang='en'):
+        """Traduce varios segmentos en una sola petición (None si no se conservó el número de segmentos)"""
+        return translate_batch(lambda text: self.translate(text, target_lang, source_lang), batch)
+
+
+@register_backend
+class GoogletransBackend(TranslationBackend):
+    """Google Translate a través de la librería googletrans"""
+
+    name = 'googletrans'
+    uses_http_client = True
+
+    def __init__(self, **options):
+        from googletrans import Translator
+        # Sin raise_exception, googletrans devuelve el texto original ante un 429 y la
+        # limitación pasaría desapercibida (el plugin quedaría a medias en inglés)
+        options.setdefault('raise_exception', True)
+        self._translator = Translator(**options)
+
+    def use_http_client(self, client):
+        # googletrans crea su propio httpx.Client por instancia: se sustituye por una vista
+        # del compartido que envía en cada petición las cabeceras (User-Agent, Referer)
+        # que configuró, sin escribirlas en el cliente que usan los demás backends
+        from translation_http import SharedClientView
+
+        own_client = self._translator.client
+        if isinstance(own_client, SharedClientView) and own_client.client is client:
+            return
+        view = SharedClientView(client, own_client.headers)
+        self._translator.client = view
+        token_acquirer = getattr(self._translator, 'token_acquirer', None)
+        if token_acquirer is not None:
+            token_acquirer.client = view
+        own_client.close()
+
+    def translate(self, text, target_lang, source_lang='en'):
+        result = self._translator.translate(text, dest=target_lang, src=source_lang)
+        return result.text if hasattr(result, 'text') else str(result)
+
+
+@register_backend
+class GtxBackend(TranslationBackend):
+    """Endpoint público translate_a/single (cliente 'gtx') con el cliente HTTP compartido
+
+    base_url permite apuntar a otro servidor con el mismo protocolo, como el servidor
+    simulado de mock_translation_server para pruebas de carga sin red.
+    """
+
+    name = 'gtx'
+    uses_http_client = True
+
+    def __init__(self, base_url='https://translate.googleapis.com', **options):
+        self.base_url = base_url.rstrip('/')
+        self._client = None
+
+    def use_http_client(self, client):
+        self._client = client
+
+    def translate(self, text, target_lang, source_lang='en'):
+        if self._client is None:
+            from translation_http import get_shared_client
+            self._client = get_shared_client()
+        response = self._client.get(f"{self.base_url}/translate_a/single", params={
+            'client': 'gtx', 'sl': source_lang, 'tl': target_lang, 'dt': 't', 'q': text,
+        })
+        if response.status_code in THROTTLE_STATUS_CODES:
+            raise ThrottledError(f"HTTP {response.status_code} de {self.base_url}",
+                                 retry_after=parse_retry_after(response.headers.get('Retry-After')))
+        if response.status_code != 200:
+            raise RuntimeError(f"Código HTTP inesperado {response.status_code} de {self.base_url}")
+        # Respuesta: [[["traducción", "original", ...], ...], ...] con una entrada por frase
+        sentences = response.json()[0] or []
+        return ''.join(sentence[0] for sentence in sentences if sentence and sentence[0])
+
+
+@register_backend
+class DeepTranslatorBackend(TranslationBackend):
+    """Google Translate a través de la librería deep-translator"""
+
+    name = 'deep-translator'
+
+    def __init__(self, **options):
+        from deep_translator import GoogleTranslator
+        self._translator_class = GoogleTranslator
+        self._options = options
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def _get_translator(self, target_lang, source_lang):
+        # deep-translator fija el par de idiomas al crear el objeto: se reutiliza uno por par
+        key = (source_lang, target_lang)
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = self._translator_class(source=source_lang, target=target_lang,
+                                                              **self._options)
+            return self._instances[key]
+
+    def translate(self, text, target_lang, source_lang='en'):
+        result = self._get_translator(target_lang, source_lang).translate(text)
+        return result if result is not None else text
+
+
+@register_backend
+class PseudoLocalizationBackend(TranslationBackend):
+    """Pseudo-localización determinista y local, sin red
+
+    Envuelve cada segmento entre corchetes y lo alarga un 30% con virgulillas (~) de relleno,
+    dejando intactos los marcadores __TIPO_n__ y los saltos de línea. Sirve para perfilar
+    el análisis, el enmascarado y la escritura sin depender de la red, y para detectar en
+    el juego textos que se quedaron sin traducir.
+    """
+
+    name = 'pseudo'
+    max_chars = 100000
+    requires_network = False
+
+    PLACEHOLDER_PATTERN = re.compile(r'(__[A-Za-z]+_\d+__)')
+    EXPANSION = 0.3
+
+    def __init__(self, **options):
+        pass
+
+    def _pseudo_line(self, line):
+        if not line.strip():
+            return line
+        text_length = 0
+        parts = []
+        for part in self.PLACEHOLDER_PATTERN.split(line):
+            if self.PLACEHOLDER_PATTERN.fullmatch(part):
+                parts.append(part)
+            else:
+                parts.append(part.swapcase())
+                text_length += len(part)
+        padding = '~' * max(1, int(text_length * self.EXPANSION))
+        return f"[{''.join(parts)}{padding}]"
+
+    def translate(self, text, target_lang, source_lang='en'):
+        return '\n'.join(self._pseudo_line(line) for line in text.split('\n'))
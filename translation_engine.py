@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de traducción por lotes para el Traductor de Endless Sky
+Agrupa los segmentos enmascarados en peticiones multi-segmento y las ejecuta de forma
+concurrente con asyncio, respetando un presupuesto de peticiones y caracteres por segundo
+que se adapta (AIMD) cuando el backend empieza a limitar las peticiones
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+# Límite de caracteres por petición de Google Translate (con margen de seguridad)
+DEFAULT_MAX_BATCH_CHARS = 4500
+
+# Separador entre segmentos dentro de una misma petición (los traductores respetan los saltos de línea)
+BATCH_SEPARATOR = "\n"
+
+
+# Códigos HTTP con los que los servicios de traducción indican que hay que frenar
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class ThrottledError(Exception):
+    """El backend ha rechazado la petición por exceso de peticiones"""
+
+    def __init__(self, message="Demasiadas peticiones", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """El cortacircuitos sigue abierto tras varios intentos: no se envían más peticiones"""
+
+
+class RequestTimeoutError(Exception):
+    """El backend no respondió dentro del plazo de la petición"""
+
+
+class DeadlineExceeded(Exception):
+    """Se agotó el plazo global de la ejecución: no se envían más peticiones"""
+
+
+def parse_retry_after(value):
+    """Convierte una cabecera Retry-After (segundos o fecha HTTP) en segundos de espera"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def classify_error(error):
+    """Devuelve (es_limitación, retry_after) para una excepción de un backend
+
+    Reconoce ThrottledError, las excepciones con respuesta HTTP (httpx/requests) con
+    código 429/503 y las excepciones de limitación de las librerías de traducción.
+    """
+    if isinstance(error, ThrottledError):
+        return True, error.retry_after
+
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None)
+    retry_after = None
+    if headers is not None:
+        try:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+        except AttributeError:
+            retry_after = None
+
+    message = str(error).lower()
+    throttled = (
+        status in THROTTLE_STATUS_CODES
+        or type(error).__name__ == 'TooManyRequests'
+        or '429' in message
+        or 'too many requests' in message
+    )
+    return throttled, retry_after
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0, retry_after=None):
+    """Espera antes del reintento número attempt: exponencial con jitter completo
+
+    Si el servidor indicó Retry-After nunca se espera menos de lo que pidió.
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def pack_batches(segments, max_chars=DEFAULT_MAX_BATCH_CHARS, separator=BATCH_SEPARATOR):
+    """Agrupa segmentos en lotes cuyo texto unido no supere max_chars
+
+    Los segmentos que por sí solos superan el límite (o que contienen el separador)
+    forman un lote propio de un único elemento.
+    """
+    batches = []
+    current = []
+    current_chars = 0
+
+    for segment in segments:
+        if len(segment) >= max_chars or separator in segment:
+            if current:
+                batches.append(current)
+                current, current_chars = [], 0
+            batches.append([segment])
+            continue
+
+        extra = len(segment) + (len(separator) if current else 0)
+        if current and current_chars + extra > max_chars:
+            batches.append(current)
+            current, current_chars = [], 0
+            extra = len(segment)
+
+        current.append(segment)
+        current_chars += extra
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(translate_fn, batch, separator=BATCH_SEPARATOR):
+    """Traduce un lote con una sola llamada y devuelve las traducciones en el mismo orden
+
+    translate_fn recibe un texto y devuelve su traducción. Si el backend no conserva
+    el número de segmentos, se devuelve None para que el llamador traduzca uno a uno.
+    """
+    if len(batch) == 1:
+        return [translate_fn(batch[0])]
+
+    translated = translate_fn(separator.join(batch))
+    parts = translated.split(separator)
+    if len(parts) != len(batch):
+        return None
+    return [part.strip() for part in parts]
+
+
+class SegmentDeduplicator:
+    """Tabla de deduplicación de una ejecución: texto enmascarado -> Future con su traducción
+
+    El primer llamador que reclama un segmento es su propietario y es el único que debe
+    pedir la traducción; el resto recibe el mismo Future y espera su resultado, tanto si
+    ya está resuelto como si la petición sigue en vuelo.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.occurrences = 0
+        self.coalesced = 0
+
+    def claim(self, key, occurrence=True):
+        """Devuelve (future, es_propietario) para el segmento
+
+        occurrence=False se usa en la precarga por lotes, que reclama segmentos sin que
+        cuenten como apariciones reales en los archivos traducidos.
+        """
+        with self._lock:
+            if occurrence:
+                self.occurrences += 1
+                self._seen.add(key)
+            future = self._futures.get(key)
+            if future is not None:
+                if not future.done():
+                    self.coalesced += 1
+                return future, False
+            future = Future()
+            self._futures[key] = future
+            return future, True
+
+    def resolve(self, key, value):
+        """Publica la traducción de un segmento para todos los que la esperan"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = Future()
+        if not future.done():
+            future.set_result(value)
+
+    def resolved(self, key):
+        """True si el segmento ya tiene traducción en esta ejecución"""
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None and future.done() and future.exception() is None
+
+    def fail(self, key, error):
+        """Propaga un error a los que esperan y retira el segmento para poder reintentarlo"""
+        with self._lock:
+            future = self._futures.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    def release(self, key):
+        """Retira un segmento reclamado sin resolver (lo reclamará de nuevo quien lo necesite)"""
+        self.fail(key, RuntimeError("segmento liberado sin traducir"))
+
+    def stats(self):
+        """Apariciones, segmentos únicos y peticiones ahorradas por la deduplicación"""
+        with self._lock:
+            unique = len(self._seen)
+            return {
+                'occurrences': self.occurrences,
+                'unique': unique,
+                'saved': max(0, self.occurrences - unique),
+                'coalesced': self.coalesced,
+            }
+
+
+class TokenBucket:
+    """Cubo de fichas compartido entre hilos y corrutinas
+
+    rate es el número de fichas que se reponen por segundo (None o 0 = sin límite) y
+    capacity la ráfaga máxima. Una petición mayor que la capacidad se permite pero deja
+    el cubo en negativo, de modo que las siguientes esperan lo que corresponda.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate) if rate else 0.0
+        self.capacity = float(capacity) if capacity else max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def _reserve(self, tokens):
+        """Reserva fichas y devuelve cuántos segundos hay que esperar para usarlas"""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.total_wait += wait
+            return wait
+
+    def set_rate(self, rate):
+        """Cambia el ritmo de reposición conservando las fichas acumuladas"""
+        if not self.rate or not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self.rate = float(rate)
+
+    def try_acquire(self, tokens=1):
+        """Toma las fichas solo si ya están disponibles; devuelve False sin esperar si no"""
+        if not self.rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def refund(self, tokens=1):
+        """Devuelve fichas tomadas para una petición que finalmente no se envió"""
+        if not self.rate:
+            return
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def acquire(self, tokens=1):
+        """Espera (bloqueando el hilo) hasta disponer de las fichas"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """Espera (sin bloquear el bucle de eventos) hasta disponer de las fichas"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class LatencyTracker:
+    """Ventana deslizante con las últimas latencias de petición para calcular percentiles"""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            if len(self._samples) > self.window:
+                del self._samples[0]
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        """Percentil p (0-100) de las latencias recientes, o None si no hay muestras"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+def _consume_result(future):
+    """Recoge el resultado de una petición abandonada para que asyncio no avise de él"""
+    if not future.cancelled():
+        future.exception()
+
+
+class AdaptiveRateController:
+    """Control AIMD de la concurrencia y del ritmo de peticiones
+
+    Cada éxito suma poco a poco (incremento aditivo) hasta los máximos configurados y
+    cada limitación del servidor los reduce a la mitad (decremento multiplicativo). Las
+    limitaciones que llegan juntas, de peticiones que ya estaban en vuelo, solo cuentan
+    una vez por intervalo de enfriamiento.
+    """
+
+    def __init__(self, max_concurrency, max_rate=None, min_rate=0.5, decrease_factor=0.5,
+                 rate_increase=0.1, cooldown=1.0):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.concurrency = float(self.max_concurrency)
+        self.max_rate = float(max_rate) if max_rate else None
+        self.rate = self.max_rate
+        self.min_rate = min(min_rate, self.max_rate) if self.max_rate else min_rate
+        self.decrease_factor = decrease_factor
+        self.rate_increase = rate_increase
+        self.cooldown = cooldown
+        self.decreases = 0
+        self._last_decrease = 0.0
+
+    @property
+    def concurrency_limit(self):
+        """Número de peticiones que pueden estar en vuelo ahora mismo"""
+        return max(1, int(self.concurrency))
+
+    @property
+    def backed_off(self):
+        """True mientras la concurrencia o el ritmo sigan por debajo de sus máximos"""
+        return (self.concurrency < self.max_concurrency
+                or (self.rate is not None and self.rate < self.max_rate))
+
+    def on_success(self):
+        # +1 de concurrencia por cada "ventana" completa de éxitos
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / max(1.0, self.concurrency))
+        if self.rate is not None:
+            self.rate = min(self.max_rate, self.rate + self.rate_increase)
+
+    def on_throttle(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return False
+        self._last_decrease = now
+        self.decreases += 1
+        self.concurrency = max(1.0, self.concurrency * self.decrease_factor)
+        if self.rate is not None:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        return True
+
+
+class CircuitBreaker:
+    """Cortacircuitos que pausa la cola cuando el backend falla de forma continuada
+
+    Tras failure_threshold fallos seguidos se abre y durante reset_timeout segundos no
+    sale ninguna petición. Después deja pasar una sola petición de prueba (semiabierto):
+    si funciona se cierra, y si falla se vuelve a abrir con el doble de espera. Si se
+    abre max_trips veces seguidas sin ningún éxito se da por agotado y las peticiones
+    fallan al momento con CircuitOpenError hasta que se llame a reset().
+    """
+
+    CLOSED = 'cerrado'
+    OPEN = 'abierto'
+    HALF_OPEN = 'semiabierto'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=300.0, max_trips=5):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.max_trips = max_trips
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0           # Aperturas seguidas sin un éxito
+        self.total_trips = 0
+        self._timeout = reset_timeout
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def exhausted(self):
+        return bool(self.max_trips) and self.trips >= self.max_trips
+
+    def before_request(self):
+        """Segundos que hay que esperar antes de enviar una petición (0 = puede salir ya)"""
+        if self.state == self.CLOSED:
+            return 0.0
+        if self.state == self.OPEN:
+            remaining = self._open_until - time.monotonic()
+            if remaining > 0:
+                return remaining
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            return min(1.0, self.reset_timeout)
+        self._probe_in_flight = True
+        return 0.0
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._timeout = self.reset_timeout
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        """Anota un fallo y devuelve True si el cortacircuitos acaba de abrirse"""
+        self.failures += 1
+        was_probe = self._probe_in_flight
+        self._probe_in_flight = False
+        if self.state == self.OPEN:
+            return False
+        if was_probe or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._open_until = time.monotonic() + self._timeout
+            self._timeout = min(self.max_reset_timeout, self._timeout * 2)
+            self.trips += 1
+            self.total_trips += 1
+            return True
+        return False
+
+    def reset(self):
+        """Permite volver a intentarlo tras agotarse (respeta la espera en curso)"""
+        self.trips = 0
+        self.failures = 0
+        self._timeout = self.reset_timeout
+
+
+class AsyncTranslationScheduler:
+    """Planificador asyncio que mantiene N peticiones en vuelo con límite de velocidad
+
+    El bucle de eventos vive en un hilo propio, así que tanto el hilo principal del CLI
+    como el hilo de trabajo de la GUI pueden enviarle trabajo de forma síncrona. Las
+    llamadas al backend (bloqueantes) se ejecutan en un ThreadPoolExecutor.
+
+    Las peticiones fallidas se reintentan con espera exponencial (respetando Retry-After),
+    las limitaciones del servidor reducen la concurrencia y el ritmo (AIMD) y un
+    cortacircuitos pausa toda la cola cuando el backend deja de responder.
+
+    Cada petición tiene un plazo (request_timeout) y, si tarda más que el percentil
+    hedge_percentile de las latencias recientes, se lanza un duplicado y se usa la
+    primera respuesta. deadline (time.monotonic()) es el plazo global de la ejecución y
+    max_requests el presupuesto de peticiones: al agotarse cualquiera de los dos las
+    peticiones restantes fallan con DeadlineExceeded.
+    """
+
+    def __init__(self, max_concurrency=4, requests_per_second=5.0, chars_per_second=None,
+                 max_retries=4, backoff_base=1.0, backoff_max=60.0,
+                 failure_threshold=5, reset_timeout=30.0, max_trips=5,
+                 request_timeout=30.0, hedge=True, hedge_percentile=95, hedge_min_samples=20,
+                 deadline=None, max_requests=None):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.request_bucket = TokenBucket(requests_per_second)
+        self.char_bucket = TokenBucket(chars_per_second)
+        self.controller = AdaptiveRateController(self.max_concurrency, requests_per_second)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, max_trips=max_trips)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.stats = {'requests': 0, 'chars': 0, 'peak_in_flight': 0, 'retries': 0, 'throttled': 0,
+                      'failures': 0, 'backoff_wait': 0.0, 'timeouts': 0, 'hedges': 0, 'hedge_wins': 0}
+        self._in_flight = 0
+        self._resume_at = 0.0        # Pausa global pedida por el servidor (Retry-After)
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        """Arranca el bucle de eventos en segundo plano la primera vez que se necesita"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                # El doble de hilos que de peticiones en vuelo: deja sitio a los duplicados
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency * 2,
+                                                    thread_name_prefix='es-translate')
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='es-translate-loop', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro):
+        """Ejecuta una corrutina en el bucle del planificador y espera su resultado"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def time_left(self):
+        """Segundos hasta el plazo global de la ejecución (None si no hay plazo)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    async def _sleep_within_deadline(self, seconds):
+        """Duerme sin pasarse del plazo global; si se agota, lanza DeadlineExceeded"""
+        left = self.time_left()
+        if left is not None and seconds >= left:
+            await asyncio.sleep(max(0.0, left))
+            raise DeadlineExceeded("plazo global de la ejecución agotado")
+        await asyncio.sleep(seconds)
+
+    async def _wait_for_clearance(self):
+        """Espera mientras la cola esté pausada (Retry-After o cortacircuitos abierto)"""
+        while True:
+            left = self.time_left()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded("plazo global de la ejecución agotado")
+            if self.breaker.exhausted:
+                raise CircuitOpenError(
+                    f"el backend sigue fallando tras {self.breaker.trips} aperturas del cortacircuitos")
+            wait = max(self._resume_at - time.monotonic(), 0.0)
+            if not wait:
+                wait = self.breaker.before_request()
+            if wait <= 0:
+                return
+            await self._sleep_within_deadline(wait)
+
+    async def _acquire_slot(self):
+        """Ocupa un hueco de concurrencia según el límite actual del controlador AIMD"""
+        if self._slots is None:
+            # Se crea dentro del bucle para quedar ligado a él
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self.controller.concurrency_limit)
+            self._in_flight += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+
+    def _try_acquire_slot(self):
+        """Ocupa un hueco de concurrencia solo si hay uno libre ahora mismo"""
+        if self._in_flight >= self.controller.concurrency_limit:
+            return False
+        self._in_flight += 1
+        self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+        return True
+
+    async def _release_slot(self):
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _apply_rate(self):
+        if self.controller.rate is not None:
+            self.request_bucket.set_rate(self.controller.rate)
+
+    async def _attempt(self, fn, arg, chars):
+        """Un único intento de fn(arg) dentro de un hueco de concurrencia y de los cubos de fichas"""
+        await self._acquire_slot()
+        try:
+            await self.request_bucket.acquire_async(1)
+            if chars:
+                await self.char_bucket.acquire_async(chars)
+            # Sin await entre la comprobación y el incremento: el presupuesto nunca se supera
+            if not self.within_request_budget():
+                raise DeadlineExceeded("presupuesto de peticiones de la ejecución agotado")
+            self.stats['requests'] += 1
+            self.stats['chars'] += chars
+            return await self._hedged(fn, arg, chars)
+        finally:
+            await self._release_slot()
+
+    def within_request_budget(self):
+        """True mientras quede presupuesto de peticiones (o no haya presupuesto)"""
+        return self.max_requests is None or self.stats['requests'] < self.max_requests
+
+    def _hedge_delay(self):
+        """Espera antes de lanzar un duplicado: percentil de las latencias recientes"""
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return max(0.05, self.latency.percentile(self.hedge_percentile))
+
+    def _try_start_hedge(self, chars):
+        """Reserva hueco y fichas para un duplicado sin esperar; False si no debe lanzarse
+
+        El duplicado es una petición más para el servidor: cuenta contra los mismos
+        límites que la original y no se lanza mientras el servidor nos esté frenando.
+        """
+        if self.controller.backed_off or self._resume_at > time.monotonic():
+            return False
+        if not self.within_request_budget() or not self._try_acquire_slot():
+            return False
+        if not self.request_bucket.try_acquire(1):
+            self._in_flight -= 1
+            return False
+        if chars and not self.char_bucket.try_acquire(chars):
+            self.request_bucket.refund(1)
+            self._in_flight -= 1
+            return False
+        return True
+
+    async def _hedged(self, fn, arg, chars=0):
+        """Ejecuta fn(arg) con plazo por petición y un duplicado si la respuesta se retrasa"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        timeout = self.request_timeout
+        left = self.time_left()
+        if left is not None:
+            timeout = left if timeout is None else min(timeout, left)
+        expires = None if timeout is None else started + timeout
+
+        primary = loop.run_in_executor(self._executor, fn, arg)
+        attempts = [primary]
+        hedge_slot = False
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None and (timeout is None or hedge_delay < timeout):
+            await asyncio.wait(attempts, timeout=hedge_delay)
+            # Sin await entre la reserva y el lanzamiento: el hueco no puede perderse
+            if not primary.done() and self._try_start_hedge(chars):
+                # Las traducciones son idempotentes: duplicar la petición es seguro
+                hedge_slot = True
+                self.stats['hedges'] += 1
+                self.stats['requests'] += 1
+                self.stats['chars'] += chars
+                attempts.append(loop.run_in_executor(self._executor, fn, arg))
+
+        pending = set(attempts)
+        errors = []
+        try:
+            while pending:
+                wait = None if expires is None else max(0.0, expires - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.stats['timeouts'] += 1
+                    raise RequestTimeoutError(f"el backend no respondió en {timeout:.1f}s")
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not primary:
+                            self.stats['hedge_wins'] += 1
+                        self.latency.add(time.monotonic() - started)
+                        return attempt.result()
+                    errors.append(attempt.exception())
+            raise errors[0]
+        finally:
+            # Las peticiones perdedoras siguen en su hilo: su resultado se descarta
+            for attempt in pending:
+                attempt.add_done_callback(_consume_result)
+            if hedge_slot:
+                await self._release_slot()
+
+    async def _limited(self, fn, arg, chars):
+        """Ejecuta fn(arg) con reintentos, control adaptativo y cortacircuitos"""
+        attempt = 0
+        while True:
+            await self._wait_for_clearance()
+            try:
+                result = await self._attempt(fn, arg, chars)
+            except DeadlineExceeded:
+                raise
+            except Exception as error:
+                throttled, retry_after = classify_error(error)
+                self.stats['failures'] += 1
+                if throttled:
+                    self.stats['throttled'] += 1
+                    self.controller.on_throttle()
+                    self._apply_rate()
+                    if retry_after:
+                        # El servidor pide que frene todo el mundo, no solo esta petición
+                        self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                self.breaker.record_failure()
+                if attempt >= self.max_retries or self.breaker.exhausted:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+                attempt += 1
+                self.stats['retries'] += 1
+                self.stats['backoff_wait'] += delay
+                await self._sleep_within_deadline(delay)
+                continue
+            self.controller.on_success()
+            self.breaker.record_success()
+            self._apply_rate()
+            return result
+
+    async def _gather(self, fn, items, chars_fn):
+        return await asyncio.gather(*(self._limited(fn, item, chars_fn(item)) for item in items),
+                                    return_exceptions=True)
+
+    def call(self, fn, arg, chars=0):
+        """Ejecuta una única petición a través del limitador y devuelve su resultado"""
+        return self._run(self._limited(fn, arg, chars))
+
+    def map(self, fn, items, chars_fn=len):
+        """Ejecuta fn sobre todos los elementos de forma concurrente
+
+        Devuelve una lista en el mismo orden que items; los elementos que fallaron
+        contienen la excepción correspondiente en lugar del resultado.
+        """
+        items = list(items)
+        if not items:
+            return []
+        return self._run(self._gather(fn, items, chars_fn))
+
+    def reset_circuit(self):
+        """Vuelve a permitir peticiones tras agotarse el cortacircuitos (para reencolar fallos)"""
+        self.breaker.reset()
+
+    def summary(self):
+        """Estadísticas del planificador, incluido el estado final del control adaptativo"""
+        stats = dict(self.stats)
+        stats['throttle_wait'] = self.request_bucket.total_wait + self.char_bucket.total_wait
+        stats['circuit_trips'] = self.breaker.total_trips
+        stats['concurrency'] = self.controller.concurrency_limit
+        stats['rate'] = self.controller.rate
+        stats['p95_latency'] = self.latency.percentile(95)
+        return stats
+
+    def close(self):
+        """Detiene el bucle de eventos y el pool de hilos"""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._executor.shutdown(wait=False)
+            self._loop = self._thread = self._executor = self._slots = None
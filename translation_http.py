@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cliente HTTP compartido para el Traductor de Endless Sky
+Un único cliente httpx con pool de conexiones persistentes (keep-alive y HTTP/2)
+que comparten todas las instancias del traductor y que sobrevive entre ejecuciones
+de la GUI: las peticiones reutilizan conexiones ya abiertas en lugar de repetir el
+handshake TLS. Las cabeceras propias de un backend se añaden por petición
+(SharedClientView) sin modificar el cliente compartido
+"""
+
+import atexit
+import ssl
+import threading
+
+# Configuración por defecto del pool de conexiones
+DEFAULT_POOL_SIZE = 10            # Conexiones simultáneas máximas
+DEFAULT_KEEPALIVE_EXPIRY = 30.0   # Segundos que una conexión ociosa se mantiene abierta
+DEFAULT_HTTP_TIMEOUT = 15.0       # Segundos por petición
+
+# Clientes creados en este proceso: (pool, keep-alive, http2, timeout) -> httpx.Client
+_clients = {}
+_lock = threading.Lock()
+
+# Contexto TLS común a todos los clientes (cargar los certificados raíz solo una vez)
+_ssl_context = ssl.create_default_context()
+
+
+def _build_client(pool_size, keepalive_expiry, http2, timeout):
+    import httpx
+
+    if hasattr(httpx, 'Limits'):
+        limits = {'limits': httpx.Limits(max_connections=pool_size,
+                                         max_keepalive_connections=pool_size,
+                                         keepalive_expiry=keepalive_expiry)}
+    else:
+        # httpx 0.13 (la que instala googletrans 3.1.0a0) usa PoolLimits
+        limits = {'pool_limits': httpx.PoolLimits(soft_limit=pool_size, hard_limit=pool_size)}
+
+    try:
+        return httpx.Client(http2=http2, verify=_ssl_context, timeout=timeout, **limits)
+    except ImportError:
+        # HTTP/2 necesita el paquete h2: sin él se usa HTTP/1.1 con keep-alive
+        return httpx.Client(http2=False, verify=_ssl_context, timeout=timeout, **limits)
+
+
+def get_shared_client(pool_size=DEFAULT_POOL_SIZE, keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+                      http2=True, timeout=DEFAULT_HTTP_TIMEOUT):
+    """Devuelve el cliente httpx compartido para esta configuración, creándolo si hace falta"""
+    key = (int(pool_size), float(keepalive_expiry), bool(http2), timeout)
+    with _lock:
+        client = _clients.get(key)
+        if client is None or getattr(client, 'is_closed', False):
+            client = _clients[key] = _build_client(*key)
+        return client
+
+
+class SharedClientView:
+    """Cliente compartido con cabeceras propias que se envían en cada petición
+
+    Para librerías que esperan un cliente httpx propio (googletrans): sus cabeceras
+    (User-Agent, Referer) no se escriben en el cliente compartido, que usan también
+    los demás backends. close() no cierra el cliente compartido.
+    """
+
+    def __init__(self, client, headers):
+        self.client = client
+        self.headers = dict(headers)
+
+    def _with_headers(self, kwargs):
+        kwargs['headers'] = {**self.headers, **(kwargs.get('headers') or {})}
+        return kwargs
+
+    def get(self, url, **kwargs):
+        return self.client.get(url, **self._with_headers(kwargs))
+
+    def post(self, url, **kwargs):
+        return self.client.post(url, **self._with_headers(kwargs))
+
+    def request(self, method, url, **kwargs):
+        return self.client.request(method, url, **self._with_headers(kwargs))
+
+    def close(self):
+        pass    # El cliente compartido lo cierra close_shared_clients
+
+
+def close_shared_clients():
+    """Cierra todos los clientes compartidos (al salir del programa)"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_shared_clients)
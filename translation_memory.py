@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoria de traducción persistente para el Traductor de Endless Sky
+Guarda en SQLite las traducciones ya obtenidas para no volver a pedirlas a la red
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Nombre del archivo de memoria dentro de la carpeta del plugin
+TRANSLATION_MEMORY_FILENAME = "translation_memory.db"
+
+
+class TranslationMemory:
+    """Memoria de traducción en disco indexada por texto enmascarado, idioma destino y backend"""
+
+    # Número de escrituras pendientes antes de hacer commit en SQLite
+    COMMIT_EVERY = 200
+
+    def __init__(self, db_path, target_lang, backend='googletrans'):
+        self.db_path = Path(db_path)
+        self.target_lang = target_lang
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: la GUI traduce en un hilo distinto al que crea el objeto
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                   source TEXT NOT NULL,
+                   target_lang TEXT NOT NULL,
+                   backend TEXT NOT NULL,
+                   translated TEXT NOT NULL,
+                   updated REAL NOT NULL,
+                   PRIMARY KEY (source, target_lang, backend)
+               )"""
+        )
+        self._conn.commit()
+
+    def get(self, source_text):
+        """Devuelve la traducción guardada del texto enmascarado o None si no existe"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translated FROM translations WHERE source = ? AND target_lang = ? AND backend = ?",
+                (source_text, self.target_lang, self.backend),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def known(self, source_texts):
+        """Conjunto de los textos enmascarados que ya tienen traducción (sin contar aciertos)"""
+        source_texts = list(source_texts)
+        found = set()
+        with self._lock:
+            # Consultas por trozos: SQLite limita el número de parámetros de una sentencia
+            for start in range(0, len(source_texts), 500):
+                chunk = source_texts[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT source FROM translations WHERE target_lang = ? AND backend = ? "
+                    f"AND source IN ({', '.join('?' * len(chunk))})",
+                    (self.target_lang, self.backend, *chunk),
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def put(self, source_text, translated_text):
+        """Guarda (o reemplaza) la traducción de un texto enmascarado"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (source, target_lang, backend, translated, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source_text, self.target_lang, self.backend, translated_text, time.time()),
+            )
+            self.stores += 1
+            self._pending_writes += 1
+            if self._pending_writes >= self.COMMIT_EVERY:
+                self._conn.commit()
+                self._pending_writes = 0
+
+    def commit(self):
+        """Confirma en disco las escrituras pendientes (puntos de control de la ejecución)"""
+        with self._lock:
+            if self._pending_writes:
+                self._conn.commit()
+                self._pending_writes = 0
+
+    def __len__(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM translations WHERE target_lang = ? AND backend = ?",
+                (self.target_lang, self.backend),
+            ).fetchone()
+            return row[0]
+
+    def stats(self):
+        """Devuelve las estadísticas de uso de la memoria en esta ejecución"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': (self.hits / lookups * 100) if lookups else 0.0,
+        }
+
+    def close(self):
+        """Confirma las escrituras pendientes y cierra la base de datos"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
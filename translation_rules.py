@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reglas declarativas de traducción para el Traductor de Endless Sky
+Qué texto se traduce en cada tipo de archivo, expresado como rutas de nodos del
+árbol de data_parser ('ship/description', 'government/friendly hail'...) y
+compilado en un autómata que recorre el árbol una sola vez.
+
+Sintaxis de las rutas (cada segmento es un nodo, de padre a hijo):
+    description              palabra clave (varias palabras: 'friendly hail')
+    (ship|outfit)            cualquiera de las palabras clave
+    *                        cualquier nodo
+    **                       cero o más nodos cualesquiera
+    "  `                     nodo cuya línea empieza por un texto entre comillas / backticks
+El primer segmento es el bloque (su línea nunca se traduce) y puede estar a cualquier
+profundidad, salvo si la ruta empieza por '/': entonces solo coincide en la raíz del
+archivo ('/phrase/**/"' no entra en los phrase anidados de un person). Se traduce el texto que sigue a la palabra clave del último segmento o,
+si el último segmento es una comilla, el propio texto de la línea.
+"""
+
+import re
+
+# (tipo de archivo, ruta, comillas aceptadas, filtro opcional) - la primera regla que coincide gana
+TRANSLATION_RULES = [
+    ('planets', 'planet/(description|spaceport)', '`'),
+    ('planets', 'planet/(tribute|bribe|friendly hail|hostile hail)', '"'),
+    # Los nombres entre comillas de un commodity son IDs técnicos: solo su descripción
+    ('commodities', 'commodity/description', '"`'),
+    ('ships', '(ship|outfit|effect|minable)/(description|plural|noun|explanation|tooltip|help)', '"`'),
+    ('starts', 'start/(name|description)', '"`'),
+    # Solo los phrase de la raíz, como el manejador original: los phrase anónimos anidados
+    # en un person no se traducían
+    ('persons', '/phrase/**/"', '"'),
+    ('help', 'help/**/`', '`'),
+    ('hails', 'phrase/**/"', '"', 'not_person_name'),
+    ('news', '(phrase|news|mission)/**/message', '"'),
+    ('news', '(phrase|news|mission)/**/"', '"', 'multiword'),
+    ('fleets', 'fleet/description', '`'),
+    ('governments', 'government/description', '`'),
+    ('governments', 'government/(friendly hail|hostile hail|bribe|fine)', '"'),
+]
+
+# Nombres propios como "John Smith": no se traducen
+PERSON_NAME_PATTERN = re.compile(r'^[A-Z][a-z]+ [A-Z][a-z]+')
+
+RULE_FILTERS = {
+    'not_person_name': lambda text: PERSON_NAME_PATTERN.match(text) is None,
+    'multiword': lambda text: len(text.split()) > 1,   # Las frases de una palabra suelen ser nombres
+}
+
+QUOTE_SEGMENTS = ('"', '`')
+ANY_NODE = '*'
+ANY_PATH = '**'
+MAX_KEY_WORDS = 3
+
+
+class TranslationRule:
+    """Una regla compilada: segmentos de la ruta, comillas aceptadas y filtro"""
+
+    __slots__ = ('ruleset', 'path', 'anchored', 'segments', 'quotes', 'filter')
+
+    def __init__(self, ruleset, path, quotes='"`', filter_name=None):
+        self.ruleset = ruleset
+        self.path = path
+        self.anchored = path.startswith('/')    # Solo a partir de un nodo raíz
+        self.segments = [_parse_segment(segment) for segment in path.lstrip('/').split('/')]
+        self.quotes = quotes
+        if filter_name is not None and filter_name not in RULE_FILTERS:
+            raise ValueError(f"Filtro de regla desconocido: '{filter_name}'")
+        self.filter = RULE_FILTERS.get(filter_name)
+        if not isinstance(self.segments[0], frozenset):
+            raise ValueError(f"La regla '{path}' debe empezar por la palabra clave del bloque")
+
+    def select(self, node):
+        """Token del nodo que hay que traducir según esta regla, o None"""
+        last = self.segments[-1]
+        if isinstance(last, frozenset):
+            token = None
+            for key in last:
+                token = node.value_after(key)
+                if token is not None:
+                    break
+        else:
+            token = node.tokens[0]
+        if token is None or not token.quote or token.quote not in self.quotes:
+            return None
+        if self.filter is not None and not self.filter(token.text):
+            return None
+        return token
+
+
+def _parse_segment(segment):
+    """'**', '*', una comilla o el conjunto de palabras clave de '(a|b)'"""
+    segment = segment.strip()
+    if segment in (ANY_PATH, ANY_NODE) or segment in QUOTE_SEGMENTS:
+        return segment
+    if segment.startswith('(') and segment.endswith(')'):
+        segment = segment[1:-1]
+    return frozenset(' '.join(word.split()) for word in segment.split('|'))
+
+
+def _segment_matches(segment, labels):
+    if segment == ANY_NODE:
+        return True
+    if isinstance(segment, frozenset):
+        return not segment.isdisjoint(labels)
+    return segment in labels
+
+
+class RuleMatcher:
+    """Autómata de las reglas de un tipo de archivo
+
+    Los estados son pares (regla, segmentos ya reconocidos). Cada nodo parte del conjunto
+    de estados de su padre y avanza con sus etiquetas (palabra clave de una a tres
+    palabras y tipo de comillas); las transiciones se memorizan, de modo que el
+    autómata se convierte en determinista a medida que se usa y cada nodo cuesta una
+    consulta a un diccionario.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.block_keywords = frozenset().union(*(rule.segments[0] for rule in self.rules))
+        self.alphabet = frozenset().union(*(segment for rule in self.rules for segment in rule.segments
+                                            if isinstance(segment, frozenset))) | frozenset(QUOTE_SEGMENTS)
+        # Estados iniciales de un nodo raíz (todas las reglas) y de un nodo anidado (las no ancladas)
+        self._root_start = self._closure((index, 0) for index in range(len(self.rules)))
+        self._start = self._closure((index, 0) for index, rule in enumerate(self.rules) if not rule.anchored)
+        self._transitions = {}
+        self._accepted = {}
+
+    def _closure(self, states):
+        """Añade los estados alcanzables saltando '**' sin consumir nodos"""
+        result = set()
+        pending = list(states)
+        while pending:
+            state = pending.pop()
+            if state in result:
+                continue
+            result.add(state)
+            index, position = state
+            segments = self.rules[index].segments
+            if position < len(segments) and segments[position] == ANY_PATH:
+                pending.append((index, position + 1))
+        return frozenset(result)
+
+    def _labels(self, node):
+        """Etiquetas de un nodo limitadas al alfabeto de las reglas"""
+        tokens = node.tokens
+        first = tokens[0]
+        if first.quote:
+            return frozenset((first.quote,))
+        labels = set()
+        words = []
+        for token in tokens[:MAX_KEY_WORDS]:
+            if token.quote:
+                break
+            words.append(token.text)
+            key = ' '.join(words)
+            if key in self.alphabet:
+                labels.add(key)
+        return frozenset(labels)
+
+    def _step(self, states, labels):
+        key = (states, labels)
+        result = self._transitions.get(key)
+        if result is None:
+            advanced = []
+            for index, position in states:
+                segments = self.rules[index].segments
+                if position >= len(segments):
+                    continue
+                segment = segments[position]
+                if segment == ANY_PATH:
+                    advanced.append((index, position))
+                elif _segment_matches(segment, labels):
+                    advanced.append((index, position + 1))
+            # Las rutas no ancladas pueden empezar a cualquier profundidad
+            result = self._transitions[key] = self._closure(advanced) | self._start
+        return result
+
+    def accepted(self, states):
+        """Índices de las reglas completadas en este conjunto de estados, en orden de la tabla"""
+        result = self._accepted.get(states)
+        if result is None:
+            result = self._accepted[states] = tuple(sorted(
+                index for index, position in states if position == len(self.rules[index].segments)))
+        return result
+
+    def match(self, document):
+        """Recorre el árbol una vez y devuelve {número de línea: (token, regla)}"""
+        matches = {}
+        states_of = {}
+        for node in document.nodes():
+            parent_states = states_of[node.parent.line_number] if node.parent is not None else self._root_start
+            states = self._step(parent_states, self._labels(node))
+            states_of[node.line_number] = states
+            for index in self.accepted(states):
+                token = self.rules[index].select(node)
+                if token is not None:
+                    matches[node.line_number] = (token, self.rules[index])
+                    break
+        return matches
+
+
+# Autómatas ya compilados en este proceso: (reglas, tipo de archivo) -> RuleMatcher
+_matchers = {}
+
+
+def get_rule_matcher(rules, ruleset):
+    """Devuelve el autómata de las reglas de un tipo de archivo, compilándolo solo la primera vez"""
+    key = (tuple(tuple(rule) for rule in rules), ruleset)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        compiled = [TranslationRule(*rule) for rule in rules if rule[0] == ruleset]
+        if not compiled:
+            raise ValueError(f"No hay reglas de traducción para '{ruleset}'")
+        matcher = _matchers[key] = RuleMatcher(compiled)
+    return matcher
@@ -33,6 +33,7 @@ class TranslationManager:
                 'select_directory': 'Select the Endless Sky installation directory:',
                 'browse_button': '📁 Browse',
                 'target_language': 'Target Language',
+                'translation_backend': 'Translation Engine',
                 'information': 'ℹ️ Information',
                 
                 # Language options
@@ -142,6 +143,7 @@ class TranslationManager:
                 'select_directory': 'Selecciona el directorio de instalación de Endless Sky:',
                 'browse_button': '📁 Buscar',
                 'target_language': 'Idioma de Destino',
+                'translation_backend': 'Motor de Traducción',
                 'information': 'ℹ️ Información',
                 
                 # Language options
@@ -8,20 +8,177 @@ Traduce solo el contenido apropiado, manteniendo la estructura del juego intacta
 import os
 import shutil
 import time
-import re
+import fnmatch
 from pathlib import Path
-from googletrans import Translator
-import chardet
 import unicodedata
+import sqlite3
+import tempfile
+import io
+import multiprocessing
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from translation_memory import TranslationMemory, TRANSLATION_MEMORY_FILENAME
+from build_manifest import BuildManifest, BUILD_MANIFEST_FILENAME, settings_fingerprint
+from segment_diff import segment_snapshot, diff_snapshots, previous_translations
+from translation_engine import (pack_batches, DEFAULT_MAX_BATCH_CHARS, DeadlineExceeded,
+                                AsyncTranslationScheduler, SegmentDeduplicator)
+from translation_backends import create_backend, TranslationBackend, DEFAULT_BACKEND
+from text_masking import mask_text, placeholder_mismatch
+from line_classifier import get_line_classifier, get_text_extractor
+from data_parser import iter_root_blocks, DataDocument, Segment
+from splice_writer import SpliceWriter, atomic_output
+from text_encoding import read_data_text, detect_file_encoding
+from translation_rules import TRANSLATION_RULES, get_rule_matcher
+from translation_http import get_shared_client, DEFAULT_POOL_SIZE, DEFAULT_KEEPALIVE_EXPIRY
+from process_pool import FilePool
+from file_pipeline import StagedPipeline, DataFileJob, PIPELINE_STAGES
+from job_planner import FilePlan, build_plan, dedupe_jobs, order_jobs, ESTIMATED_REQUEST_LATENCY
 
 class EndlessSkyTranslatorFixed:
-    def __init__(self, base_path, target_lang='es'):
+    def __init__(self, base_path, target_lang='es', backend=DEFAULT_BACKEND):
         self.base_path = Path(base_path)
         self.data_path = self.base_path / "data"
         self.plugin_path = self.base_path / "Plugins" / "traduccion"
         self.plugin_data_path = self.plugin_path / "data"
         self.target_lang = target_lang
-        self.translator = Translator()
+        # Motor de traducción (ver translation_backends: googletrans, gtx, deep-translator, pseudo)
+        # Se acepta un nombre del registro o una instancia ya configurada
+        self.backend = backend if isinstance(backend, TranslationBackend) else create_backend(backend)
+        self.backend_name = self.backend.name
+        
+        # Memoria de traducción persistente (SQLite dentro de la carpeta del plugin)
+        self.use_translation_memory = True
+        self.translation_memory = None
+        
+        # Compilación incremental: manifiesto con el hash de cada archivo de origen, la huella
+        # de las reglas y del motor y la salida generada (ver build_manifest)
+        self.incremental_build = True
+        self.build_manifest = None
+        self._missing_segments = 0         # Segmentos fallidos u omitidos (salida incompleta)
+        # Al cambiar un archivo, sus segmentos se alinean por ruta de nodo con la versión anterior
+        # y los que no cambiaron conservan su traducción de la salida existente (ver segment_diff)
+        self.segment_diff = True
+        
+        # Traducción por lotes: se recogen los segmentos de uno o varios archivos
+        # y se envían en peticiones multi-segmento antes de procesarlos
+        self.batch_translation = True
+        self.max_batch_chars = min(DEFAULT_MAX_BATCH_CHARS, self.backend.max_chars)
+        self.segment_table = SegmentDeduplicator()  # Texto enmascarado -> traducción (solo esta ejecución)
+        self._thread_state = threading.local()      # Pasada de recogida y archivo en curso de cada hilo
+        self._collected_segments = None    # Lista activa durante la pasada de recogida (por hilo)
+        self._prefetched_files = set()
+        
+        # Planificación previa (ver job_planner): una pasada de recogida sin red cuenta los
+        # segmentos de todos los archivos, descuenta los ya traducidos y estima peticiones y
+        # tiempo; el progreso se informa en segmentos. Los segmentos recogidos se reutilizan
+        # en la precarga por lotes, de modo que cada archivo se sigue analizando una sola vez
+        # antes de traducirlo
+        self.plan_runs = True
+        self._planned_segments = {}        # Origen -> segmentos enmascarados del plan
+        # El análisis de cada archivo en la pasada de recogida (documento, segmentos y
+        # diferencias) se guarda para la pasada real, que así no vuelve a leerlo ni a
+        # analizarlo, hasta parsed_cache_size bytes de origen (el árbol ocupa unas 16 veces
+        # más); los archivos que no caben se analizan de nuevo
+        self.parsed_cache_size = 8 * 1024 * 1024
+        self._parsed_files = {}            # (origen, reglas) -> (firma, análisis)
+        self._parsed_bytes = 0
+        self._parsed_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self._progress_total = 0
+        self._progress_done = 0
+        self._progress_percent = -1
+        self._progress_reported = -1       # Último tramo del 10% mostrado en la consola
+        
+        # Orden de los trabajos (ver job_planner.order_jobs):
+        # 'discovery' = orden fijo de run_translation (map planets, _ui, archivos, commodities, carpetas)
+        # 'largest-first' = primero los archivos con más trabajo (acorta el total en paralelo)
+        # 'visibility' = primero lo más visible según visibility_priority (útil con run_time_budget)
+        self.scheduling_policy = 'discovery'
+        # Patrones (relativos a data/) de más a menos visibles; el resto va al final
+        self.visibility_priority = [
+            '_ui/*',               # Interfaz: etiquetas y botones
+            'map planets.txt',     # Descripciones de planetas
+            'human/*mission*',     # Campaña principal
+            'human/*campaign*',
+            'human/intro*',
+            'human/*',
+        ]
+        self.batch_stats = {'requests': 0, 'segments': 0, 'fallbacks': 0}
+        
+        # Planificador asyncio: peticiones concurrentes y presupuesto de velocidad (cubo de fichas)
+        self.max_concurrency = 4
+        self.requests_per_second = 5.0
+        self.chars_per_second = None       # None = sin límite de caracteres por segundo
+        self.scheduler = None
+        # Un solo planificador por ejecución aunque lo pidan a la vez varios hilos (segmentos,
+        # pipeline): cada instancia tendría sus propios límites, cortacircuitos y presupuesto
+        self._scheduler_lock = threading.Lock()
+        
+        # Cliente HTTP compartido entre instancias y ejecuciones (ver translation_http)
+        self.http_pool_size = DEFAULT_POOL_SIZE
+        self.http_keepalive_expiry = DEFAULT_KEEPALIVE_EXPIRY
+        self.http2 = True
+        
+        # Plazos: tiempo máximo por petición, duplicado de peticiones lentas (p95) y plazo
+        # global de la ejecución, pasado el cual el resto de segmentos se omite y se informa
+        self.request_timeout = 30.0
+        self.hedge_requests = True
+        self.run_time_budget = None        # Segundos; None = sin plazo global
+        self.run_request_budget = None     # Peticiones al backend; None = sin límite
+        self.run_deadline = None
+        
+        # Compilaciones parciales: cada archivo se escribe de forma atómica y, cada
+        # checkpoint_interval segundos, se confirman en disco la memoria de traducción y el
+        # manifiesto. Si la ejecución se interrumpe (o se agota su presupuesto), el plugin
+        # sigue siendo válido: los segmentos sin traducir quedan en inglés y la siguiente
+        # ejecución continúa desde lo ya guardado. None = solo al terminar
+        self.checkpoint_interval = 60.0
+        self._last_checkpoint = time.monotonic()
+        self._checkpoint_lock = threading.Lock()
+        
+        # Reintentos y cortacircuitos: ante limitaciones del backend se frena en lugar de
+        # dejar el texto en inglés, y los segmentos que aun así fallan se reencolan al final
+        self.max_retries = 4
+        self.circuit_failure_threshold = 5  # Fallos seguidos que abren el cortacircuitos
+        self.circuit_reset_timeout = 30.0   # Segundos de pausa antes de la petición de prueba
+        self.max_requeue_rounds = 2
+        self.failed_segments = {}          # Texto enmascarado -> último error
+        self.failed_jobs = {}              # Destino -> (manejador, origen, destino) a repetir
+        self.skipped_segments = set()      # Segmentos omitidos por el plazo global
+        self._current_job = None
+        self._requeueing = False
+        
+        # Traducción en dos fases: se extraen todos los segmentos de un archivo y se traducen
+        # a la vez (hasta max_concurrency en paralelo) antes de insertarlos en su posición
+        self.intra_file_concurrency = True
+        
+        # Procesamiento de archivos en varios procesos (ver process_pool): cada proceso de trabajo
+        # analiza y enmascara sus archivos y envía los segmentos al servicio de traducción de
+        # este proceso, que comparte la memoria, la deduplicación y el límite de peticiones.
+        # 0 = desactivado; os.cpu_count() aprovecha todos los núcleos
+        self.process_pool_workers = 0
+        self._file_pool = None
+        self.translation_service = None    # Proceso de trabajo: conexión con el servicio central
+        self._remote_results = None        # Proceso de trabajo: respuestas del servicio del archivo en curso
+        
+        # Pipeline por etapas (ver file_pipeline): exploración -> análisis -> traducción -> escritura,
+        # cada etapa con sus hilos y colas acotadas entre ellas para solapar disco, CPU y red.
+        # No se combina con process_pool_workers (si ambos están activos se usa el pipeline)
+        self.pipeline_mode = False
+        self.pipeline_workers = {'scan': 1, 'parse': 2, 'translate': 4, 'write': 1}
+        self.pipeline_queue_size = 4       # Archivos en espera entre dos etapas (contrapresión)
+        
+        # Naves/outfits: True = el archivo del plugin contiene solo los elementos traducidos
+        self.ships_only_translated_blocks = False
+        
+        # Modo de transmisión (opcional) para entradas muy grandes (datos de plugins fusionados,
+        # paquetes de mods concatenados): el archivo se procesa bloque raíz a bloque raíz con
+        # generadores encadenados y la salida se vuelca a un archivo temporal, de modo que la
+        # memoria no crece con el tamaño del archivo
+        self.streaming_mode = False
+        self.streaming_window_segments = 256   # Segmentos que se traducen a la vez
+        self.streaming_progress_step = 10      # Informar del progreso cada N % de bytes
         
         # Archivos que deben traducirse (SOLO ELEMENTOS VISIBLES SIN AFECTAR FUNCIONALIDAD)
         self.translatable_files = [
@@ -166,6 +323,11 @@ class EndlessSkyTranslatorFixed:
             r'help\s+"([^"]+)"',              # Texto de ayuda
             # NO incluir patrones peligrosos que podrían afectar funcionalidad
         ]
+        self._text_extractor = None  # Se compila con los indicadores anteriores en el primer uso
+        
+        # Qué se traduce en los archivos con lógica especial: rutas de nodos por tipo de
+        # archivo ('ship/description', 'government/friendly hail'...), ver translation_rules
+        self.translation_rules = list(TRANSLATION_RULES)
         
         # Palabras que nunca deben traducirse (nombres técnicos)
         self.technical_words = [
@@ -181,96 +343,41 @@ class EndlessSkyTranslatorFixed:
             'panel', 'point', 'from', 'center', 'dimensions', 'align'
             # NOTA: 'tip', 'label', 'button', 'text' NO están aquí porque SÍ queremos traducir su contenido
         ]
+        self._line_classifier = None  # Se compila con las listas anteriores en el primer uso
 
     def detect_encoding(self, file_path):
-        """Detecta la codificación de un archivo"""
+        """Detecta la codificación de un archivo leyendo solo su principio (ver text_encoding)"""
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                result = chardet.detect(raw_data)
-                return result['encoding'] or 'utf-8'
-        except:
+            return detect_file_encoding(file_path)
+        except OSError:
             return 'utf-8'
 
     def should_never_translate_line(self, line):
         """Determina si una línea NUNCA debe traducirse"""
-        line_stripped = line.strip()
-        
-        # Verificar patrones que nunca deben traducirse
-        for pattern in self.never_translate_patterns:
-            if re.match(pattern, line_stripped, re.IGNORECASE):
-                return True
-        
-        # Líneas que son solo números, símbolos o muy cortas
-        if re.match(r'^[\d\s\.\-\+\*\/\(\)\[\]<>=]+$', line_stripped):
-            return True
-            
-        if len(line_stripped) < 3:
-            return True
-        
-        # Si comienza con una palabra técnica (EXCEPTO elementos de interfaz)
-        first_word = line_stripped.split()[0] if line_stripped.split() else ""
-        if first_word.lower() in self.technical_words:
-            return True
-        
-        # NO bloquear elementos de interfaz que queremos traducir
-        interface_elements = [
-            r'^tip\s+"[^"]*"',              # Definiciones de tip (NO traducir)
-            r'^label\s+"[^"]*"',            # Labels (SÍ traducir contenido)
-            r'^button\s+\w+\s+"[^"]*"',     # Botones (SÍ traducir contenido)
-            r'^string\s+"[^"]*"',           # Strings (NO traducir, son identificadores)
-        ]
-        
-        for pattern in interface_elements:
-            if re.match(pattern, line_stripped):
-                # Bloquear tip definitions y strings, no los demás
-                if pattern.startswith('^tip') or pattern.startswith('^string'):
-                    return True  # Bloqueamos definiciones de tip y strings
-                else:
-                    return False  # NO bloqueamos label, button
-            
-        return False
+        # Reglas compiladas una vez por proceso e indexadas por la primera palabra
+        # (ver line_classifier; mismas decisiones que probar los patrones uno a uno)
+        if self._line_classifier is None:
+            self._line_classifier = get_line_classifier(self.never_translate_patterns, self.technical_words)
+        return self._line_classifier.should_never_translate(line)
 
     def extract_translatable_text(self, line):
-        """Extrae solo el texto que debe traducirse de una línea"""
-        line_stripped = line.strip()
-        
-        # Solo traducir texto entre backticks (diálogos)
-        backtick_match = re.match(r'^(\s*)`([^`]+)`(\s*)$', line)
-        if backtick_match:
-            prefix, text, suffix = backtick_match.groups()
-            return prefix, text, suffix, 'backtick'
-        
-        # Buscar descripciones específicas en comillas
-        for pattern in self.translatable_text_indicators:
-            match = re.search(pattern, line)
-            if match and len(match.groups()) > 0:
-                text_to_translate = match.group(1)
-                return None, text_to_translate, None, 'description'
-        
-        # Detectar definiciones de tip (NO las traducimos, son identificadores)
-        tip_match = re.match(r'^tip\s+"([^"]+)"', line_stripped)
-        if tip_match:
+        """Extrae solo el texto que debe traducirse de una línea
+
+        Devuelve (prefijo, texto, sufijo, tipo) donde prefijo + texto + sufijo == línea, de modo
+        que la línea traducida es prefijo + traducción + sufijo sin volver a analizarla.
+        Tipos: 'backtick' (diálogos), 'description' (indicadores en comillas), 'button', 'label'
+        y 'tip_definition' (identificador: sin texto).
+        """
+        if self._text_extractor is None:
+            self._text_extractor = get_text_extractor(self.translatable_text_indicators)
+        extracted = self._text_extractor.extract(line)
+        if extracted is None:
+            return None, None, None, None
+        start, end, text_type = extracted
+        if text_type == 'tip_definition':
+            # Detectar definiciones de tip (NO las traducimos, son identificadores)
             return None, None, None, 'tip_definition'
-        
-        # Detectar botones de interfaz con patrones específicos
-        button_patterns = [
-            r'^(\s*)button\s+(\w+)\s+"([^"]+)"(.*)$',  # button X "texto"
-            r'^(\s*)label\s+"([^"]+)"(.*)$',          # label "texto"
-            # NO incluir string porque son identificadores técnicos
-        ]
-        
-        for pattern in button_patterns:
-            match = re.match(pattern, line)
-            if match:
-                if 'button' in pattern:
-                    prefix, button_key, text, suffix = match.groups()
-                    return prefix, text, suffix, 'button'
-                else:  # label
-                    prefix, text, suffix = match.groups()
-                    return prefix, text, suffix, 'label'
-        
-        return None, None, None, None
+        return line[:start], line[start:end], line[end:], text_type
 
     def translate_text(self, text):
         """Traduce un texto usando Google Translate preservando TODOS los identificadores del juego"""
@@ -284,407 +391,1179 @@ class EndlessSkyTranslatorFixed:
                 return text
             
             # PRESERVAR TODOS LOS ELEMENTOS ESPECIALES DEL JUEGO
-            preservation_map = {}
-            temp_text = clean_text
-            placeholder_counter = 0
-            
-            # 1. Variables del juego como <planet>, <origin>, <destination>, <tons>, etc.
-            # IMPORTANTE: Preservar TODAS las etiquetas entre < > sin excepción
-            game_variables = re.findall(r'<[^>]+>', temp_text)
-            for var in game_variables:
-                placeholder = f"__GAMEVAR_{placeholder_counter}__"
-                preservation_map[placeholder] = var
-                temp_text = temp_text.replace(var, placeholder)
-                placeholder_counter += 1
-            
-            # 2. Números con unidades del juego como "5000 credits", "10 tons", "3 jumps"
-            game_units_pattern = r'\b\d+(?:[.,]\d+)?\s*(?:credits?|tons?|jumps?|days?|units?|MW|GW|kW|km|m)\b'
-            game_units = re.findall(game_units_pattern, temp_text, re.IGNORECASE)
-            for unit in game_units:
-                placeholder = f"__GAMEUNIT_{placeholder_counter}__"
-                preservation_map[placeholder] = unit
-                temp_text = temp_text.replace(unit, placeholder)
-                placeholder_counter += 1
-            
-            # 3. Coordenadas y números técnicos como "150.5 -200.3"
-            coordinates_pattern = r'\b-?\d+(?:\.\d+)?\s+-?\d+(?:\.\d+)?\b'
-            coordinates = re.findall(coordinates_pattern, temp_text)
-            for coord in coordinates:
-                placeholder = f"__COORD_{placeholder_counter}__"
-                preservation_map[placeholder] = coord
-                temp_text = temp_text.replace(coord, placeholder)
-                placeholder_counter += 1
-            
-            # 4. Nombres propios entre comillas (naves, outfits, sistemas)
-            quoted_names = re.findall(r'"[A-Z][^"]*"', temp_text)
-            for name in quoted_names:
-                placeholder = f"__QUOTEDNAME_{placeholder_counter}__"
-                preservation_map[placeholder] = name
-                temp_text = temp_text.replace(name, placeholder)
-                placeholder_counter += 1
-            
-            # 5. Preservar guiones bajos al inicio (indicadores de teclas de acceso rápido)
-            underscore_prefix = ""
-            if temp_text.startswith('_'):
-                underscore_prefix = "_"
-                temp_text = temp_text[1:]
-            
-            # 6. Preservar puntos suspensivos
-            ellipsis_suffix = ""
-            if temp_text.endswith('...'):
-                ellipsis_suffix = "..."
-                temp_text = temp_text[:-3]
-            
-            # 7. Preservar archivos y extensiones
-            file_extensions = re.findall(r'\b\w+\.\w+\b', temp_text)
-            for file_ext in file_extensions:
-                placeholder = f"__FILE_{placeholder_counter}__"
-                preservation_map[placeholder] = file_ext
-                temp_text = temp_text.replace(file_ext, placeholder)
-                placeholder_counter += 1
+            # (<variables>, unidades, coordenadas, "Nombres", archivos, "_" inicial y "..." final)
+            masked = mask_text(clean_text)
+            temp_text = masked.text
             
             # No traducir si queda muy poco texto después de preservar elementos
             if len(temp_text.strip()) < 3:
                 return text
             
-            print(f"    🌍 Traduciendo: '{temp_text[:50]}{'...' if len(temp_text) > 50 else ''}'")
-            result = self.translator.translate(temp_text, dest=self.target_lang, src='en')
-            translated = result.text
-            
-            # RESTAURAR TODOS LOS ELEMENTOS PRESERVADOS
-            for placeholder, original_value in preservation_map.items():
-                # Buscar tanto el placeholder original como en minúsculas (Google Translate los convierte)
-                placeholder_lower = placeholder.lower()
-                if placeholder in translated:
-                    translated = translated.replace(placeholder, original_value)
-                elif placeholder_lower in translated:
-                    translated = translated.replace(placeholder_lower, original_value)
+            self.log_preserved_tags(masked)
+            self.log_message(f"    🌍 Traduciendo: '{temp_text[:50]}{'...' if len(temp_text) > 50 else ''}'")
+            translated = self._translate_masked(temp_text)
             
-            # Verificación adicional: asegurar que no queden placeholders sin restaurar
-            remaining_placeholders = re.findall(r'__[a-zA-Z]+_\d+__', translated)
-            if remaining_placeholders:
-                # Intentar restaurar manualmente con búsqueda insensible a mayúsculas
-                for placeholder in remaining_placeholders:
-                    # Buscar placeholder original correspondiente
-                    for orig_placeholder, orig_value in preservation_map.items():
-                        if orig_placeholder.lower() == placeholder.lower():
-                            translated = translated.replace(placeholder, orig_value)
-                            break
+            # RESTAURAR TODOS LOS ELEMENTOS PRESERVADOS (también si el traductor cambió mayúsculas)
+            translated = masked.restore(translated)
+            self.log_preserved_tags(masked, translated)
             
             # *** NUEVO: Normalizar el texto para el juego (eliminar tildes) ***
             translated = self.normalize_text_for_game(translated)
             
             # Restaurar elementos especiales
-            final_text = underscore_prefix + translated + ellipsis_suffix
+            final_text = masked.wrap(translated)
             
-            print(f"    ✅ Resultado: '{final_text[:50]}{'...' if len(final_text) > 50 else ''}'")
-            time.sleep(0.1)  # Pausa para evitar rate limiting
+            self.log_message(f"    ✅ Resultado: '{final_text[:50]}{'...' if len(final_text) > 50 else ''}'")
             return final_text
         except Exception as e:
-            print(f"    ❌ Error traduciendo '{text[:30]}...': {e}")
+            self.log_message(f"    ❌ Error traduciendo '{text[:30]}...': {e}")
             return text
 
-    def translate_line(self, line):
-        """Traduce una línea si es apropiado"""
-        # No traducir líneas que nunca deben traducirse
-        if self.should_never_translate_line(line):
-            return line, False
+    def log_preserved_tags(self, masked, restored=None):
+        """Gancho de registro de las <etiquetas> preservadas de un texto (la GUI las muestra)
+
+        Se llama antes de traducir (restored=None) y con el texto ya restaurado.
+        """
+
+    @property
+    def _collected_segments(self):
+        """Lista de la pasada de recogida activa en este hilo (None fuera de ella)"""
+        return getattr(self._thread_state, 'collected', None)
+
+    @_collected_segments.setter
+    def _collected_segments(self, collected):
+        self._thread_state.collected = collected
+
+    def _translate_masked(self, temp_text):
+        """Traduce un texto ya enmascarado consultando antes la memoria de traducción"""
+        # Pasada de recogida: solo anotar el segmento, sin traducir
+        if self._collected_segments is not None:
+            self._collected_segments.append(temp_text)
+            return temp_text
+        
+        # Proceso de trabajo: la respuesta ya llegó del servicio central
+        if self._remote_results is not None:
+            status, result = self._remote_results[temp_text]
+            if status == 'ok':
+                return result
+            error = DeadlineExceeded(result) if status == 'skipped' else RuntimeError(result)
+            self._record_failed_segment(temp_text, error)
+            raise error
+        
+        self._advance_segment_progress()
+        # Deduplicación de la ejecución: si otro llamador ya lo pidió, esperar su resultado
+        # (al reencolar, las repeticiones no cuentan como apariciones nuevas)
+        future, is_owner = self.segment_table.claim(temp_text, occurrence=not self._requeueing)
+        if not is_owner:
+            try:
+                return future.result()
+            except Exception as e:
+                self._record_failed_segment(temp_text, e)
+                raise
         
-        # Extraer texto traducible
-        prefix, text, suffix, text_type = self.extract_translatable_text(line)
+        try:
+            translated = self._cached_translation(temp_text)
+            if translated is None:
+                translated = self.get_scheduler().call(self._call_backend, temp_text, len(temp_text))
+                # Una respuesta sin todos los marcadores no se guarda: el segmento cuenta como fallido
+                mismatch = placeholder_mismatch(temp_text, translated)
+                if mismatch is not None:
+                    raise mismatch
+                if self.translation_memory is not None:
+                    self.translation_memory.put(temp_text, translated)
+        except Exception as e:
+            self.segment_table.fail(temp_text, e)
+            self._record_failed_segment(temp_text, e)
+            raise
         
-        if text and text_type:
-            if text_type == 'backtick':
-                # Traducir texto entre backticks
-                translated_text = self.translate_text(text)
-                return f"{prefix}`{translated_text}`{suffix}\n" if line.endswith('\n') else f"{prefix}`{translated_text}`{suffix}", True
-            elif text_type == 'description':
-                # Traducir texto en descripciones específicas
-                translated_text = self.translate_text(text)
-                return line.replace(text, translated_text), True
-            elif text_type == 'button':
-                # Traducir texto de botones
-                translated_text = self.translate_text(text)
-                # Reconstruir la línea del botón
-                button_match = re.match(r'^(\s*)button\s+(\w+)\s+"([^"]+)"(.*)$', line)
-                if button_match:
-                    spaces, button_key, original_text, rest = button_match.groups()
-                    new_line = f'{spaces}button {button_key} "{translated_text}"{rest}'
-                    return new_line + ('\n' if line.endswith('\n') else ''), True
-                return line, False
-            elif text_type == 'label':
-                # Traducir texto de etiquetas
-                translated_text = self.translate_text(text)
-                label_match = re.match(r'^(\s*)label\s+"([^"]+)"(.*)$', line)
-                if label_match:
-                    spaces, original_text, rest = label_match.groups()
-                    new_line = f'{spaces}label "{translated_text}"{rest}'
-                    return new_line + ('\n' if line.endswith('\n') else ''), True
-                return line, False
-            # NO traducir strings porque son identificadores técnicos
+        self.segment_table.resolve(temp_text, translated)
+        return translated
+
+    def _cached_translation(self, temp_text):
+        """Traducción de la memoria persistente, o None si no existe o perdió marcadores"""
+        if self.translation_memory is None:
+            return None
+        cached = self.translation_memory.get(temp_text)
+        if cached is None or placeholder_mismatch(temp_text, cached) is not None:
+            return None
+        return cached
+
+    def _call_backend(self, text):
+        """Realiza una petición de traducción al backend (el ritmo lo controla el planificador)"""
+        return self.backend.translate(text, self.target_lang, 'en')
+
+    def _call_backend_batch(self, batch):
+        """Traduce un lote de segmentos con una sola petición al backend"""
+        return self.backend.translate_batch(batch, self.target_lang, 'en')
+
+    def get_scheduler(self):
+        """Devuelve el planificador de peticiones, creándolo con la configuración actual"""
+        if self.scheduler is not None:
+            return self.scheduler
+        with self._scheduler_lock:
+            if self.scheduler is not None:
+                return self.scheduler
+            if self.backend.uses_http_client:
+                # El pool nunca debe ser menor que el número de peticiones en vuelo
+                self.backend.use_http_client(get_shared_client(
+                    pool_size=max(self.http_pool_size, self.max_concurrency),
+                    keepalive_expiry=self.http_keepalive_expiry,
+                    http2=self.http2,
+                    timeout=self.request_timeout,
+                ))
+            # Los backends locales (pseudo) no necesitan límite de velocidad
+            limited = self.backend.requires_network
+            self.scheduler = AsyncTranslationScheduler(
+                max_concurrency=self.max_concurrency,
+                requests_per_second=self.requests_per_second if limited else None,
+                chars_per_second=self.chars_per_second if limited else None,
+                max_retries=self.max_retries,
+                failure_threshold=self.circuit_failure_threshold,
+                reset_timeout=self.circuit_reset_timeout,
+                request_timeout=self.request_timeout,
+                hedge=self.hedge_requests and limited,
+                deadline=self.run_deadline,
+                max_requests=self.run_request_budget,
+            )
+            return self.scheduler
+
+    def start_run_clock(self):
+        """Fija el plazo global de la ejecución a partir de run_time_budget"""
+        self.run_deadline = time.monotonic() + self.run_time_budget if self.run_time_budget else None
+        self._last_checkpoint = time.monotonic()
+        if self.scheduler is not None:
+            self.scheduler.deadline = self.run_deadline
+        return self.run_deadline
+
+    def deadline_expired(self):
+        """True si la ejecución ya superó su plazo global o agotó su presupuesto de peticiones"""
+        if self.scheduler is not None and not self.scheduler.within_request_budget():
+            return True
+        return self.run_deadline is not None and time.monotonic() >= self.run_deadline
+
+    def budget_description(self):
+        """Presupuesto de la ejecución para los mensajes ('3600s, 500 peticiones'), o None"""
+        parts = []
+        if self.run_time_budget:
+            parts.append(f"{self.run_time_budget:.0f}s")
+        if self.run_request_budget is not None:
+            parts.append(f"{self.run_request_budget} peticiones")
+        return ", ".join(parts) or None
+
+    def checkpoint(self, force=False):
+        """Punto de control: confirma en disco la memoria de traducción y el manifiesto
+
+        Sin force solo actúa si pasaron checkpoint_interval segundos desde el anterior.
+        """
+        if self.checkpoint_interval is None and not force:
+            return False
+        if not force and time.monotonic() - self._last_checkpoint < self.checkpoint_interval:
+            return False
+        if not self._checkpoint_lock.acquire(blocking=False):
+            return False   # Otro hilo ya está guardando
+        try:
+            self._last_checkpoint = time.monotonic()
+            if self.translation_memory is not None:
+                self.translation_memory.commit()
+            if self.build_manifest is not None:
+                try:
+                    self.build_manifest.save()
+                except OSError as e:
+                    self.log_message(f"⚠️ No se pudo guardar el manifiesto de compilación: {e}")
+        finally:
+            self._checkpoint_lock.release()
+        return True
+
+    def close_scheduler(self):
+        """Detiene el planificador y devuelve sus estadísticas (o None si no se usó)"""
+        with self._scheduler_lock:
+            scheduler, self.scheduler = self.scheduler, None
+        if scheduler is None:
+            return None
+        stats = scheduler.summary()
+        scheduler.close()
+        return stats
+
+    def _begin_job(self, handler, source_file, dest_file):
+        """Anota el archivo en curso para poder repetirlo si alguno de sus segmentos falla"""
+        if self._collected_segments is None and not self._preparing_job():
+            self._current_job = (handler, source_file, dest_file)
+
+    def _preparing_job(self):
+        """True en la etapa de análisis del pipeline (el manejador solo prepara el archivo)"""
+        return getattr(self._thread_state, 'preparing', False)
+
+    def _record_failed_segment(self, temp_text, error):
+        """Anota un segmento que se quedó sin traducir y el archivo que hay que repetir"""
+        self._missing_segments += 1
+        data_job = getattr(self._thread_state, 'data_job', None)
+        if data_job is not None:
+            data_job.missing += 1
+        if isinstance(error, DeadlineExceeded):
+            # Omitido por el plazo global: no se reencola, solo se informa
+            self.skipped_segments.add(temp_text)
+            return
+        self.failed_segments[temp_text] = str(error)
+        # En el pipeline el archivo en curso es el del hilo, no el de la instancia
+        current_job = data_job.file_job if data_job is not None and data_job.file_job else self._current_job
+        if current_job is not None:
+            self.failed_jobs[str(current_job[2])] = current_job
+
+    def requeue_failed_segments(self, log=print):
+        """Repite los archivos con segmentos fallidos una vez pasada la pausa del cortacircuitos
+
+        Devuelve el número de segmentos que siguen sin traducir tras todas las rondas.
+        """
+        for round_number in range(1, self.max_requeue_rounds + 1):
+            if not self.failed_jobs or self.deadline_expired():
+                break
+            jobs = list(self.failed_jobs.values())
+            log(f"\n🔁 Reencolando {len(self.failed_segments)} segmentos fallidos de {len(jobs)} archivos "
+                f"(ronda {round_number}/{self.max_requeue_rounds})")
+            self.failed_jobs.clear()
+            self.failed_segments.clear()
+            if self.scheduler is not None:
+                self.scheduler.reset_circuit()
+            self._requeueing = True
+            try:
+                for handler, source_file, dest_file in jobs:
+                    handler(source_file, dest_file)
+            finally:
+                self._requeueing = False
+                self._current_job = None
+        return len(self.failed_segments)
+
+    def report_failed_segments(self, log=print):
+        """Informa de los segmentos que quedaron en inglés (no se ocultan en el plugin)"""
+        if self.skipped_segments:
+            log(f"⏰ Presupuesto de la ejecución ({self.budget_description()}) agotado: {len(self.skipped_segments)} segmentos "
+                f"omitidos (quedan en inglés; la memoria de traducción los retomará en la próxima ejecución)")
+        if not self.failed_segments:
+            return
+        log(f"⚠️ {len(self.failed_segments)} segmentos quedaron sin traducir en "
+            f"{len(self.failed_jobs)} archivos tras {self.max_requeue_rounds} reintentos:")
+        for job in self.failed_jobs.values():
+            log(f"   📄 {job[1]}")
+        for segment, error in list(self.failed_segments.items())[:10]:
+            log(f"   ❌ '{segment[:50]}{'...' if len(segment) > 50 else ''}': {error}")
+
+    def _remember_translation(self, temp_text, translated):
+        """Publica una traducción en la tabla de la ejecución y la guarda en la memoria persistente"""
+        self.segment_table.resolve(temp_text, translated)
+        if self.translation_memory is not None:
+            self.translation_memory.put(temp_text, translated)
+
+    def collect_segments(self, handler, source_file):
+        """Ejecuta un manejador en modo recogida y devuelve los segmentos enmascarados que traduciría"""
+        collected = []
+        self._collected_segments = collected
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir, \
+                 open(os.devnull, 'w', encoding='utf-8') as devnull, \
+                 contextlib.redirect_stdout(devnull):
+                handler(source_file, Path(tmp_dir) / source_file.name)
+        except Exception:
+            # La pasada real informará del error; aquí solo se pierde la precarga
+            pass
+        finally:
+            self._collected_segments = None
+        return collected
+
+    def prefetch_segments(self, jobs):
+        """Precarga por lotes las traducciones de varios archivos
+
+        jobs es una lista de (manejador, archivo_origen). Los segmentos de todos los
+        archivos se agrupan en peticiones del tamaño máximo del backend, de modo que la
+        pasada real encuentra casi todo en la caché de la ejecución.
+        """
+        if not self.batch_translation or self._collected_segments is not None or self._preparing_job():
+            return 0
         
-        return line, False
+        segments = []
+        for handler, source_file in jobs:
+            key = str(source_file)
+            if key in self._prefetched_files:
+                continue
+            self._prefetched_files.add(key)
+            if key in self._planned_segments:
+                segments.extend(self._planned_segments.pop(key))
+            else:
+                segments.extend(self.collect_segments(handler, source_file))
+        return self.prefetch_masked_segments(segments)
 
-    def translate_map_planets_file(self, source_file, dest_file):
-        """Traduce específicamente el archivo map planets.txt con lógica especial"""
-        print(f"\n🌍 Procesando archivo de planetas: {source_file.name}")
+    def prefetch_masked_segments(self, segments):
+        """Traduce por lotes segmentos ya enmascarados y los deja en la tabla de la ejecución
+
+        Devuelve el número de segmentos que hubo que pedir al backend.
+        """
+        pending = []
+        for segment in dict.fromkeys(segments):
+            # Solo el propietario pide la traducción: lo ya resuelto o en vuelo se omite
+            future, is_owner = self.segment_table.claim(segment, occurrence=False)
+            if not is_owner:
+                continue
+            cached = self._cached_translation(segment)
+            if cached is not None:
+                self.segment_table.resolve(segment, cached)
+                continue
+            pending.append(segment)
         
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
+        if not pending:
+            return 0
         
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
+        scheduler = self.get_scheduler()
+        batches = pack_batches(pending, self.max_batch_chars)
+        
+        def fetch(batch):
+            results = self._call_backend_batch(batch)
+            if results is not None:
+                # Se guardan al llegar cada lote, no al terminar todos: si la ejecución se
+                # interrumpe, el punto de control ya los ha confirmado en la memoria
+                for segment, translated in zip(batch, results):
+                    if placeholder_mismatch(segment, translated) is None:
+                        self._remember_translation(segment, translated)
+                self.checkpoint()
+            return results
+        
+        batch_results = scheduler.map(
+            fetch, batches, chars_fn=lambda batch: sum(len(segment) for segment in batch)
+        )
+        
+        for batch, results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                self.log_message(f"    ⚠️ Error en lote de {len(batch)} segmentos: {results}")
+                for segment in batch:
+                    self.segment_table.release(segment)
+                continue
+            self.batch_stats['requests'] += 1
+            if results is None:
+                # El backend no conservó los separadores: traducir el lote segmento a segmento
+                self.batch_stats['fallbacks'] += 1
+                results = scheduler.map(self._call_backend, batch)
+                for segment, translated in zip(batch, results):
+                    if not isinstance(translated, Exception) and placeholder_mismatch(segment, translated) is None:
+                        self._remember_translation(segment, translated)
+            for segment, translated in zip(batch, results):
+                if isinstance(translated, Exception) or placeholder_mismatch(segment, translated) is not None:
+                    # Sin resolver: se pedirá de nuevo individualmente al procesar su archivo
+                    self.segment_table.release(segment)
+                else:
+                    self.batch_stats['segments'] += 1
+        
+        return len(pending)
+
+    def plan_jobs(self, jobs):
+        """Planifica trabajos (manejador, origen, destino) sin tocar la red y devuelve un RunPlan
+
+        Quita los archivos repetidos, omite los que no cambiaron (manifiesto), cuenta los
+        segmentos de los demás con una pasada de recogida y resta los que ya tienen
+        traducción en la memoria o en la tabla de la ejecución.
+        """
+        self._planned_segments.clear()
+        files = []
+        for job in dedupe_jobs(jobs):
+            handler, source_file, dest_file = job
+            if self.build_manifest is not None:
+                try:
+                    if self.build_manifest.lookup(source_file, dest_file) is not None:
+                        files.append(FilePlan(job, [], reused=True))
+                        continue
+                except (ValueError, OSError):
+                    pass
+            segments = self.collect_segments(handler, source_file)
+            self._planned_segments[str(source_file)] = segments
+            files.append(FilePlan(job, segments))
+        
+        def is_cached(segments):
+            cached = {segment for segment in segments if self.segment_table.resolved(segment)}
+            if self.translation_memory is not None:
+                cached |= self.translation_memory.known(segment for segment in segments if segment not in cached)
+            return cached
+        
+        # Los backends locales no tienen latencia de red ni límite de velocidad
+        limited = self.backend.requires_network
+        latency = ESTIMATED_REQUEST_LATENCY if limited else 0.0
+        if self.scheduler is not None and self.scheduler.summary()['p95_latency'] is not None:
+            latency = self.scheduler.summary()['p95_latency']
+        return build_plan(files, is_cached, self.batch_translation, self.max_batch_chars, self.max_concurrency,
+                          self.requests_per_second if limited else None,
+                          self.chars_per_second if limited else None, latency)
+
+    def schedule_jobs(self, jobs, plan=None):
+        """Ordena los trabajos según scheduling_policy
+
+        El tamaño de cada archivo son los caracteres pendientes del plan o, sin plan, sus bytes.
+        """
+        chars = {plan_file.job[1]: plan_file.chars for plan_file in plan.files} if plan is not None else None
+        
+        def size(job):
+            return chars.get(job[1], 0) if chars is not None else job[1].stat().st_size
         
+        return order_jobs(jobs, self.scheduling_policy, size, self.visibility_rank)
+
+    def visibility_rank(self, job):
+        """Posición del primer patrón de visibility_priority que coincide con el archivo"""
         try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_planet_block = False
-        current_planet = ""
-        
-        for i, line in enumerate(lines):
-            if i % 500 == 0 and i > 0:
-                print(f"   📈 Progreso planetas: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # DEBUG: Mostrar número de línea siempre
-            if line_stripped and not line_stripped.startswith('#'):
-                print(f"    📍 LÍNEA {i+1}: Analizando: '{line_stripped[:80]}{'...' if len(line_stripped) > 80 else ''}'")
-            
-            # Detectar inicio de bloque de planeta
-            planet_match = re.match(r'^planet\s+"?([^"]*)"?', line_stripped)
-            if planet_match:
-                in_planet_block = True
-                current_planet = planet_match.group(1)
-                print(f"  🪐 LÍNEA {i+1}: Procesando planeta: {current_planet}")
-                translated_lines.append(original_line)  # No traducir nombres de planetas
-                continue
-            
-            # Detectar fin de bloque de planeta (línea vacía o nueva definición)
-            if in_planet_block and (not line_stripped or 
-                                  line_stripped.startswith('#') or
-                                  any(line_stripped.startswith(kw) for kw in ['planet ', 'system ', 'fleet ', 'ship ', 'outfit '])):
-                if not line_stripped or line_stripped.startswith('#'):
-                    in_planet_block = False if not line_stripped else in_planet_block
-                    print(f"    📍 LÍNEA {i+1}: {'Fin de bloque de planeta' if not in_planet_block else 'Comentario en planeta'}")
+            relative = job[1].relative_to(self.data_path).as_posix().lower()
+        except ValueError:
+            return len(self.visibility_priority)
+        for rank, pattern in enumerate(self.visibility_priority):
+            if fnmatch.fnmatchcase(relative, pattern.lower()):
+                return rank
+        return len(self.visibility_priority)
+
+    def discover_jobs(self):
+        """Todos los trabajos de run_translation en su orden (exploración sin mensajes)"""
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            return [job for unit in self.discovery_units() for job in self.scan_unit(unit)]
+
+    def start_segment_progress(self, total):
+        """Fija el total de segmentos del progreso (los del plan)"""
+        with self._progress_lock:
+            self._progress_total = total
+            self._progress_done = 0
+            self._progress_percent = -1
+            self._progress_reported = -1
+
+    def _advance_segment_progress(self):
+        """Cuenta un segmento traducido e informa si cambió el porcentaje"""
+        with self._progress_lock:
+            if not self._progress_total:
+                return
+            self._progress_done += 1
+            done = min(self._progress_done, self._progress_total)
+            percent = done * 100 // self._progress_total
+            if percent == self._progress_percent:
+                return
+            self._progress_percent = percent
+        self.report_segment_progress(done, self._progress_total)
+
+    def report_segment_progress(self, done, total):
+        """Informa del progreso en segmentos (la GUI lo lleva a su barra de progreso)"""
+        percent = done * 100 // total
+        if percent // 10 > self._progress_reported:
+            self._progress_reported = percent // 10
+            self.log_message(f"⏳ Progreso: {percent}% ({done}/{total} segmentos)")
+
+    def finish_segment_progress(self):
+        """Cierra el progreso de la ejecución y descarta los segmentos y análisis del plan no usados"""
+        self._planned_segments.clear()
+        with self._parsed_lock:
+            self._parsed_files.clear()
+            self._parsed_bytes = 0
+        with self._progress_lock:
+            total = self._progress_total
+            self._progress_total = 0
+        return total
+
+    def open_translation_memory(self):
+        """Abre la memoria de traducción persistente dentro de la carpeta del plugin"""
+        if not self.use_translation_memory:
+            return None
+        try:
+            self.translation_memory = TranslationMemory(
+                self.plugin_path / TRANSLATION_MEMORY_FILENAME, self.target_lang, self.backend_name
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo abrir la memoria de traducción: {e}")
+            self.translation_memory = None
+        return self.translation_memory
+
+    def close_translation_memory(self):
+        """Cierra la memoria de traducción y devuelve sus estadísticas (o None si no se usó)"""
+        if self.translation_memory is None:
+            return None
+        stats = self.translation_memory.stats()
+        self.translation_memory.close()
+        self.translation_memory = None
+        return stats
+
+    def build_fingerprint(self):
+        """Huella de todo lo que, además del archivo de origen, determina su salida"""
+        return settings_fingerprint(self.target_lang, self.backend_name, self.never_translate_patterns,
+                                    self.technical_words, self.translatable_text_indicators,
+                                    self.translation_rules, self.ships_only_translated_blocks)
+
+    def open_build_manifest(self):
+        """Abre el manifiesto de compilación incremental de la carpeta del plugin"""
+        if not self.incremental_build:
+            return None
+        self.build_manifest = BuildManifest(self.plugin_path / BUILD_MANIFEST_FILENAME, self.base_path,
+                                            self.plugin_path, self.build_fingerprint())
+        return self.build_manifest
+
+    def close_build_manifest(self):
+        """Elimina las salidas de archivos de origen borrados, guarda el manifiesto y devuelve
+        sus estadísticas (o None si no se usó)"""
+        if self.build_manifest is None:
+            return None
+        manifest = self.build_manifest
+        self.build_manifest = None
+        for output in manifest.prune():
+            self.log_message(f"   🗑️ Salida obsoleta eliminada: {output}")
+        try:
+            manifest.save()
+        except OSError as e:
+            self.log_message(f"⚠️ No se pudo guardar el manifiesto de compilación: {e}")
+        return manifest.stats()
+
+    def reuse_build_output(self, source_file, dest_file):
+        """Líneas traducidas de la salida anterior si el archivo no cambió, o None si hay que traducirlo"""
+        if self.build_manifest is None or self._requeueing:
+            return None
+        try:
+            # En la pasada de recogida el destino es temporal: vale la salida anotada
+            collecting = self._collected_segments is not None
+            entry = self.build_manifest.lookup(source_file, None if collecting else dest_file)
+        except (ValueError, OSError):
+            # Archivo fuera de la carpeta del juego o del plugin: sin compilación incremental
+            return None
+        if entry is None:
+            return None
+        if not collecting:
+            self.build_manifest.reused += 1
+            self.log_message(f"   ♻️ Sin cambios desde la última ejecución, se conserva la salida "
+                             f"({entry['lines']} líneas traducidas)")
+        return entry['lines']
+
+    def record_build_output(self, source_file, dest_file, lines_translated, complete=True, snapshot=None):
+        """Anota en el manifiesto la salida recién generada (o la descarta si quedó incompleta)
+
+        snapshot es la instantánea de segmentos de reuse_unchanged_segments (o None).
+        """
+        if self._collected_segments is not None:
+            return
+        if self.build_manifest is not None:
+            try:
+                if complete:
+                    self.build_manifest.record(source_file, dest_file, lines_translated, snapshot)
+                else:
+                    self.build_manifest.forget(source_file)
+            except (ValueError, OSError):
+                pass
+        self.checkpoint()
+
+    def reuse_unchanged_segments(self, document, segments, source_file, dest_file):
+        """Traducciones de la salida anterior para los segmentos que no cambiaron
+
+        Alinea los segmentos con la instantánea de la versión anterior del archivo (guardada
+        en el manifiesto) por ruta de nodo e informa de los añadidos, cambiados y eliminados.
+        Devuelve (reutilizados, instantánea, diferencias): una lista paralela a segments con
+        el texto reutilizado o None si hay que traducirlo, la instantánea de los segmentos para
+        record_build_output (None sin manifiesto) y el SegmentDiff (None sin versión anterior).
+        """
+        reused = [None] * len(segments)
+        if self.build_manifest is None or not self.segment_diff:
+            return reused, None, None
+        snapshot = segment_snapshot(document, segments)
+        try:
+            previous = self.build_manifest.previous(source_file)
+        except ValueError:
+            return reused, snapshot, None
+        if previous is None or previous.get('segments') is None:
+            return reused, snapshot, None
+        
+        diff = diff_snapshots(previous['segments'], snapshot)
+        translations = {}
+        # La salida anotada en el manifiesto (en la pasada de recogida dest_file es temporal)
+        output_file = self.build_manifest.output_root / previous['output'] if previous.get('output') else None
+        if output_file is not None and output_file.exists():
+            output_text, _ = read_data_text(output_file)
+            translations = previous_translations(DataDocument(output_text), previous['segments'], diff.unchanged)
+        paths = list(snapshot)
+        for index, segment in enumerate(segments):
+            translated_text = translations.get(paths[index])
+            if translated_text is not None and translated_text != segment.text:
+                reused[index] = translated_text
+        return reused, snapshot, diff
+
+    def report_segment_diff(self, diff, reused):
+        """Informa de los segmentos añadidos, cambiados y eliminados de un archivo"""
+        self.log_message(f"   🔀 Cambios desde la versión anterior: {len(diff.added)} añadidos, "
+                         f"{len(diff.changed)} cambiados, {len(diff.removed)} eliminados; "
+                         f"{sum(text is not None for text in reused)} traducciones reutilizadas")
+        for line in diff.report_lines():
+            self.log_message(f"      {line}")
+
+    def extract_line_segment(self, line):
+        """Posición (inicio, fin) del texto traducible de una línea, o None si no debe traducirse"""
+        # No traducir líneas que nunca deben traducirse
+        if self.should_never_translate_line(line):
+            return None
+        
+        # Extraer texto traducible (backticks, descripciones, botones y etiquetas)
+        prefix, text, suffix, text_type = self.extract_translatable_text(line)
+        if not text or not text_type:
+            # NO traducir strings porque son identificadores técnicos
+            return None
+        return len(prefix), len(prefix) + len(text)
+
+    def translate_line(self, line):
+        """Traduce una línea si es apropiado"""
+        span = self.extract_line_segment(line)
+        if span is None:
+            return line, False
+        start, end = span
+        text = line[start:end]
+        translated_text = self.translate_text(text)
+        if translated_text == text:
+            return line, False  # No se tradujo
+        # Insertar la traducción en su posición exacta dentro de la línea original
+        return line[:start] + translated_text + line[end:], True
+
+    def log_message(self, message):
+        """Muestra un mensaje de progreso (la GUI lo redirige a su registro)"""
+        if self._collected_segments is not None:
+            return  # Pasada de recogida para lotes: no duplicar el log
+        print(message)
+
+    def read_data_document(self, source_file):
+        """Lee un archivo de datos una sola vez, lo decodifica y lo analiza en un árbol de nodos
+
+        Devuelve (documento, codificación).
+        """
+        text, encoding = read_data_text(source_file)
+        return DataDocument(text), encoding
+
+    def _keep_parsed_file(self, source_file, ruleset, signature, parsed):
+        """Guarda el análisis de la pasada de recogida para la pasada real, si cabe en la caché"""
+        # Con procesos de trabajo la pasada real no ocurre en este proceso
+        if self._collected_segments is None or self.process_pool_workers > 1:
+            return
+        key = (str(source_file), ruleset)
+        with self._parsed_lock:
+            previous = self._parsed_files.pop(key, None)
+            if previous is not None:
+                self._parsed_bytes -= previous[0][1]
+            if self._parsed_bytes + signature[1] > self.parsed_cache_size:
+                return
+            self._parsed_files[key] = (signature, parsed)
+            self._parsed_bytes += signature[1]
+
+    def _take_parsed_file(self, source_file, ruleset, signature):
+        """Análisis guardado por la pasada de recogida si el archivo no cambió desde entonces, o None"""
+        if self._collected_segments is not None:
+            return None
+        with self._parsed_lock:
+            entry = self._parsed_files.pop((str(source_file), ruleset), None)
+            if entry is not None:
+                self._parsed_bytes -= entry[0][1]
+        if entry is None or entry[0] != signature:
+            return None
+        return entry[1]
+
+    def extract_segments(self, document, ruleset=None, blocks=None):
+        """Fase de extracción: todos los segmentos traducibles de un documento con su posición
+
+        - ruleset: tipo de archivo en translation_rules ('planets', 'ships'...). Sus reglas
+          definen los bloques (cuya línea inicial, el nombre técnico, nunca se traduce) y qué
+          texto se traduce dentro de ellos; el resto de líneas de un bloque se conserva.
+        - Fuera de esos bloques (o sin ruleset) cada línea sigue la lógica de translate_line.
+        - blocks: lista a la que se añaden los nodos de bloque en lugar de anunciarlos en el registro.
+        """
+        # Una sola pasada del autómata de reglas sobre el árbol: línea -> (token, regla)
+        if ruleset is not None:
+            matcher = get_rule_matcher(self.translation_rules, ruleset)
+            block_keywords = matcher.block_keywords
+            matches = matcher.match(document)
+        else:
+            block_keywords = ()
+            matches = {}
+        
+        segments = []
+        for node in document.nodes():
+            block = node.find_ancestor(block_keywords) if block_keywords else None
+            if block is None:
+                # Fuera de bloques, usar lógica normal
+                span = self.extract_line_segment(document.line_text(node))
+                if span is not None:
+                    start, end = span
+                    segments.append(Segment(document.text[node.start + start:node.start + end],
+                                            node.start + start, node.start + end, node))
+            elif block is node:
+                if blocks is not None:
+                    blocks.append(node)
                 else:
-                    in_planet_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque de planeta - nueva definición")
-                translated_lines.append(original_line)
+                    self.log_block(node)
+            else:
+                match = matches.get(node.line_number)
+                if match is not None:
+                    token, rule = match
+                    segments.append(Segment(token.text, token.start, token.end, node, block, rule))
+        return segments
+
+    def log_block(self, node):
+        """Anuncia en el registro un bloque con reglas de traducción"""
+        self.log_message(f"  🔧 LÍNEA {node.line_number+1}: Procesando {node.keyword}: {node.name}")
+
+    def translate_segments(self, texts):
+        """Fase de traducción: traduce a la vez todos los segmentos extraídos de un archivo
+
+        Devuelve las traducciones en el mismo orden. El planificador limita las peticiones
+        en vuelo y los textos repetidos se piden una sola vez (tabla de la ejecución).
+        """
+        if self.translation_service is not None and self._collected_segments is None:
+            return self._translate_segments_remote(texts)
+        if (not self.intra_file_concurrency or self._collected_segments is not None
+                or self.max_concurrency < 2 or len(texts) < 2):
+            return [self.translate_text(text) for text in texts]
+        data_job = getattr(self._thread_state, 'data_job', None)
+        
+        def translate(text):
+            # Los fallos se atribuyen al archivo del hilo que pidió la traducción
+            self._thread_state.data_job = data_job
+            return self.translate_text(text)
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='segmentos') as pool:
+            return list(pool.map(translate, texts))
+
+    def mask_segments(self, texts):
+        """Pasada de recogida sobre textos sueltos: sus segmentos enmascarados, sin traducir
+
+        Sin redirigir la salida estándar (es global y el pipeline la comparte entre hilos):
+        log_message ya calla durante la pasada de recogida de este hilo.
+        """
+        collected = []
+        self._collected_segments = collected
+        try:
+            for text in texts:
+                self.translate_text(text)
+        finally:
+            self._collected_segments = None
+        return collected
+
+    def _translate_segments_remote(self, texts):
+        """translate_segments en un proceso de trabajo: una sola petición al servicio central
+
+        Una pasada de recogida enmascara los textos; el servicio devuelve las traducciones
+        de los segmentos enmascarados y la pasada normal las restaura en cada texto.
+        """
+        # Todas las apariciones: el servicio las deduplica y las cuenta en el progreso
+        masked_texts = self.mask_segments(texts)
+        self._remote_results = (dict(zip(masked_texts, self.translation_service.translate(masked_texts)))
+                                if masked_texts else {})
+        try:
+            return [self.translate_text(text) for text in texts]
+        finally:
+            self._remote_results = None
+
+    def translate_masked_segments(self, masked_texts):
+        """Servicio central (proceso principal): traduce los segmentos enmascarados de un archivo
+
+        Usa los mismos lotes, memoria de traducción, deduplicación y planificador que los
+        archivos de este proceso. Devuelve una lista paralela de ('ok', traducción),
+        ('failed', error) o ('skipped', error) (plazo global agotado).
+        """
+        if self.batch_translation:
+            self.prefetch_masked_segments(masked_texts)
+        
+        def translate(temp_text):
+            try:
+                return ('ok', self._translate_masked(temp_text))
+            except DeadlineExceeded as e:
+                return ('skipped', str(e))
+            except Exception as e:
+                return ('failed', str(e))
+        
+        if self.max_concurrency < 2 or len(masked_texts) < 2:
+            return [translate(temp_text) for temp_text in masked_texts]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='servicio') as pool:
+            return list(pool.map(translate, masked_texts))
+
+    def get_file_pool(self):
+        """Devuelve los procesos de trabajo de esta ejecución, creándolos en el primer uso"""
+        if self._file_pool is None:
+            self._file_pool = FilePool(self, self.process_pool_workers, EndlessSkyTranslatorFixed)
+        return self._file_pool
+
+    def close_file_pool(self):
+        """Detiene los procesos de trabajo y el servicio de traducción (si se usaron)"""
+        if self._file_pool is not None:
+            self._file_pool.close()
+            self._file_pool = None
+
+    def run_file_jobs(self, jobs, announce=None):
+        """Procesa trabajos (manejador, origen, destino) y genera las líneas traducidas de cada uno
+
+        Con pipeline_mode pasan por el pipeline por etapas (run_file_pipeline); con
+        process_pool_workers > 1 se reparten entre procesos de trabajo; si no, se precargan
+        por lotes y se procesan aquí uno a uno. announce(trabajo) se llama
+        antes de cada archivo. Los resultados se generan siempre en el orden de jobs.
+        """
+        if self.pipeline_mode and len(jobs) > 1 and self._collected_segments is None:
+            finished = {}
+            next_index = 0
+            for (index, _), _, lines_translated in self.run_file_pipeline(jobs, lambda job: [job], announce):
+                finished[index] = lines_translated
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+            return
+        if self.process_pool_workers > 1 and len(jobs) > 1 and self._collected_segments is None:
+            # Los fallos del servicio se atribuyen a cada archivo al recoger su resultado
+            self._current_job = None
+            yield from self.get_file_pool().run(jobs, announce)
+            return
+        self.prefetch_segments([(handler, source_file) for handler, source_file, _ in jobs])
+        for job in jobs:
+            if announce is not None:
+                announce(job)
+            handler, source_file, dest_file = job
+            yield handler(source_file, dest_file)
+
+    def prepare_file_job(self, job):
+        """Etapa de análisis del pipeline: ejecuta el manejador hasta tener el DataFileJob
+
+        Devuelve el DataFileJob del archivo o, si no hay nada que traducir en las etapas
+        siguientes (salida reutilizada, modo de transmisión), sus líneas traducidas.
+        """
+        handler, source_file, dest_file = job
+        self._thread_state.preparing = True
+        try:
+            work = handler(source_file, dest_file)
+        finally:
+            self._thread_state.preparing = False
+        if isinstance(work, DataFileJob):
+            work.file_job = job
+        return work
+
+    def run_file_pipeline(self, items, scan, announce=None):
+        """Procesa archivos con el pipeline por etapas y genera (clave, trabajo, líneas) según terminan
+
+        scan(elemento) devuelve los trabajos (manejador, origen, destino) de cada elemento de
+        items; announce(trabajo) se llama al empezar el análisis de cada archivo. La clave
+        ordena los resultados en el orden de exploración.
+        """
+        def parse(job):
+            if announce is not None:
+                announce(job)
+            return self.prepare_file_job(job)
+        
+        def translate(work):
+            return self.translate_data_job(work) if isinstance(work, DataFileJob) else work
+        
+        def write(work):
+            return self.write_data_job(work) if isinstance(work, DataFileJob) else work
+        
+        functions = {'scan': scan, 'parse': parse, 'translate': translate, 'write': write}
+        pipeline = StagedPipeline([(name, functions[name], self.pipeline_workers.get(name, 1))
+                                   for name in PIPELINE_STAGES], self.pipeline_queue_size)
+        # Los fallos se atribuyen al archivo de cada DataFileJob, no al de la instancia
+        self._current_job = None
+        for key, job, result in pipeline.run(items):
+            if isinstance(result, Exception):
+                self.log_message(f"❌ Error procesando {job[1].name if job else 'carpeta'}: {result}")
+                result = 0
+            yield key, job, result
+
+    def merge_file_job(self, job, result):
+        """Incorpora el resultado de un archivo procesado en un proceso de trabajo"""
+        handler, source_file, dest_file = job
+        for line in result['output'].splitlines():
+            self.log_message(line)
+        if result['incomplete']:
+            # Se repetirá aquí, en el proceso principal, al reencolar los fallidos
+            self.failed_jobs[str(dest_file)] = job
+        if self.build_manifest is not None and not result['reused']:
+            try:
+                self.build_manifest.merge(source_file, result['entry'], result['removed'])
+            except ValueError:
+                pass
+        elif self.build_manifest is not None:
+            self.build_manifest.reused += 1
+        self.checkpoint()
+        return result['lines']
+
+    def translate_data_file(self, source_file, dest_file, label=None, ruleset=None, only_translated_blocks=False):
+        """Traduce un archivo de datos en tres fases sobre su árbol de nodos (un solo análisis)
+
+        1. Análisis y extracción (prepare_data_file): extract_segments localiza todo el texto
+           traducible (reglas de ruleset).
+        2. Traducción (translate_data_job): se traducen a la vez todos los segmentos del archivo.
+        3. Escritura (write_data_job): cada traducción se inserta en su posición exacta.
+        only_translated_blocks: el archivo de destino contiene solo los bloques con alguna
+        traducción, para que el plugin sobrescriba únicamente esos elementos.
+        label es el tipo de archivo en los mensajes ('planetas', 'naves/outfits'...).
+        Con streaming_mode el archivo se procesa por bloques (translate_data_file_streaming).
+        Con incremental_build se omiten los archivos que no cambiaron desde la última ejecución.
+        En la etapa de análisis del pipeline devuelve el DataFileJob sin traducirlo.
+        """
+        reused = self.reuse_build_output(source_file, dest_file)
+        if reused is not None:
+            return reused
+        if self.streaming_mode:
+            missing_before = self._missing_segments
+            lines_translated = self.translate_data_file_streaming(source_file, dest_file, label, ruleset,
+                                                                  only_translated_blocks)
+            self.record_build_output(source_file, dest_file, lines_translated,
+                                     complete=self._missing_segments == missing_before)
+            return lines_translated
+        data_job = self.prepare_data_file(source_file, dest_file, label, ruleset, only_translated_blocks)
+        if self._preparing_job():
+            return data_job
+        self.translate_data_job(data_job)
+        return self.write_data_job(data_job)
+
+    def prepare_data_file(self, source_file, dest_file, label=None, ruleset=None, only_translated_blocks=False):
+        """Fase de análisis: lee el archivo, extrae sus segmentos y reutiliza los que no cambiaron
+
+        Si la pasada de recogida (plan o precarga) ya analizó el archivo se usa su resultado,
+        de modo que cada archivo se lee y se analiza una sola vez por ejecución.
+        """
+        kind = f" de {label}" if label else ""
+        stat = source_file.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        parsed = self._take_parsed_file(source_file, ruleset, signature)
+        if parsed is None:
+            document, encoding = self.read_data_document(source_file)
+            blocks = []
+            segments = self.extract_segments(document, ruleset, blocks)
+            # Solo se traducen los segmentos nuevos o cambiados desde la versión anterior
+            translations, snapshot, diff = self.reuse_unchanged_segments(document, segments, source_file, dest_file)
+            parsed = (encoding, document, blocks, segments, translations, snapshot, diff)
+            self._keep_parsed_file(source_file, ruleset, signature, parsed)
+        encoding, document, blocks, segments, translations, snapshot, diff = parsed
+        
+        self.log_message(f"   🔤 Codificación: {encoding}")
+        self.log_message(f"   📊 Total de líneas: {document.line_count}")
+        for block in blocks:
+            self.log_block(block)
+        self.log_message(f"   🧩 {len(segments)} segmentos traducibles{kind}")
+        if diff is not None and self._collected_segments is None:
+            self.report_segment_diff(diff, translations)
+        # Copia de las traducciones: la pasada de recogida rellena las del trabajo
+        return DataFileJob(source_file, dest_file, label, only_translated_blocks, document, segments,
+                           list(translations), snapshot)
+
+    def translate_data_job(self, data_job):
+        """Fase de traducción: traduce los segmentos pendientes (no reutilizados) de un archivo"""
+        segments = data_job.segments
+        pending = [index for index, text in enumerate(data_job.translations) if text is None]
+        texts = [segments[index].text for index in pending]
+        self._thread_state.data_job = data_job
+        try:
+            if data_job.file_job is not None and self.batch_translation:
+                # Pipeline: los segmentos del archivo se piden en lotes antes de la pasada normal
+                self.prefetch_masked_segments(self.mask_segments(texts))
+            for index, translated_text in zip(pending, self.translate_segments(texts)):
+                data_job.translations[index] = translated_text
+        finally:
+            self._thread_state.data_job = None
+        return data_job
+
+    def write_data_job(self, data_job):
+        """Fase de escritura: aplica las traducciones, guarda el archivo y lo anota en el manifiesto"""
+        kind = f" de {data_job.label}" if data_job.label else ""
+        dest_file = data_job.dest_file
+        segments = data_job.segments
+        
+        # Solo se guardan las ediciones: la salida se escribe desde el texto original
+        writer = SpliceWriter(data_job.document.text)
+        translated_blocks = {}   # Línea inicial del bloque -> nodo, para only_translated_blocks
+        for segment, translated_text in zip(segments, data_job.translations):
+            if translated_text == segment.text:
                 continue
-            
-            # Si estamos en un bloque de planeta, aplicar lógica específica
-            if in_planet_block:
-                was_translated = False
-                print(f"    🔬 LÍNEA {i+1}: Dentro del planeta {current_planet}")
-                
-                # 1. description `texto` (CON BACKTICKS, no comillas)
-                if line_stripped.startswith('description `'):
-                    print(f"    🎯 LÍNEA {i+1}: DETECTADA DESCRIPCIÓN - verificando si termina en backtick...")
-                    if line_stripped.endswith('`'):
-                        print(f"    ✅ LÍNEA {i+1}: DESCRIPCIÓN VÁLIDA - extrayendo texto...")
-                        # Extraer el texto entre backticks
-                        desc_match = re.match(r'^(\s*)description\s+`(.+)`(.*)$', line.rstrip())
-                        if desc_match:
-                            prefix, text_to_translate, suffix = desc_match.groups()
-                            print(f"    📝 LÍNEA {i+1}: ¡TRADUCIENDO DESCRIPCIÓN! de {current_planet}")
-                            print(f"        Texto original: '{text_to_translate[:60]}{'...' if len(text_to_translate) > 60 else ''}'")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}description `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: Descripción traducida exitosamente!")
-                                print(f"        Resultado: '{translated_text[:60]}{'...' if len(translated_text) > 60 else ''}'")
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error traduciendo descripción: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                        else:
-                            print(f"    ❌ LÍNEA {i+1}: DESCRIPCIÓN no coincide con regex")
-                    else:
-                        print(f"    ⚠️  LÍNEA {i+1}: DESCRIPCIÓN no termina en backtick: '{line_stripped[-10:]}'")
-                
-                # 2. spaceport `texto` (CON BACKTICKS, no comillas)
-                elif line_stripped.startswith('spaceport `'):
-                    print(f"    🎯 LÍNEA {i+1}: DETECTADO SPACEPORT - verificando si termina en backtick...")
-                    if line_stripped.endswith('`'):
-                        print(f"    ✅ LÍNEA {i+1}: SPACEPORT VÁLIDO - extrayendo texto...")
-                        spaceport_match = re.match(r'^(\s*)spaceport\s+`(.+)`(.*)$', line.rstrip())
-                        if spaceport_match:
-                            prefix, text_to_translate, suffix = spaceport_match.groups()
-                            print(f"    🚀 LÍNEA {i+1}: ¡TRADUCIENDO SPACEPORT! de {current_planet}")
-                            print(f"        Texto original: '{text_to_translate[:60]}{'...' if len(text_to_translate) > 60 else ''}'")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}spaceport `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: Spaceport traducido exitosamente!")
-                                print(f"        Resultado: '{translated_text[:60]}{'...' if len(translated_text) > 60 else ''}'")
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error traduciendo spaceport: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                        else:
-                            print(f"    ❌ LÍNEA {i+1}: SPACEPORT no coincide con regex")
-                    else:
-                        print(f"    ⚠️  LÍNEA {i+1}: SPACEPORT no termina en backtick: '{line_stripped[-10:]}'")
-                
-                # 3. También traducir otros elementos de texto si aparecen
-                elif (line_stripped.startswith('tribute "') or 
-                      line_stripped.startswith('bribe "') or
-                      line_stripped.startswith('friendly hail "') or
-                      line_stripped.startswith('hostile hail "')):
-                    print(f"    🎯 LÍNEA {i+1}: DETECTADO ELEMENTO CON COMILLAS")
-                    # Extraer cualquier texto en comillas para estos elementos
-                    text_match = re.match(r'^(\s*)(\w+(?:\s+\w+)*)\s+"(.+)"(.*)$', line.rstrip())
-                    if text_match:
-                        prefix, element_type, text_to_translate, suffix = text_match.groups()
-                        print(f"    🔤 LÍNEA {i+1}: Traduciendo {element_type} de {current_planet}")
-                        try:
-                            translated_text = self.translate_text(text_to_translate)
-                            new_line = f'{prefix}{element_type} "{translated_text}"{suffix}'
-                            if original_line.endswith('\n'):
-                                new_line += '\n'
-                            translated_lines.append(new_line)
-                            lines_translated += 1
-                            was_translated = True
-                            print(f"    ✅ LÍNEA {i+1}: {element_type} traducido correctamente")
-                        except Exception as e:
-                            print(f"    ❌ LÍNEA {i+1}: Error traduciendo {element_type}: {e}")
-                            translated_lines.append(original_line)
-                            lines_skipped += 1
-                            was_translated = True
-                    else:
-                        print(f"    ❌ LÍNEA {i+1}: Elemento con comillas no coincide con regex")
-                
-                # Si no se tradujo, verificar si debe omitirse (mantener sin traducir)
-                if not was_translated:
-                    print(f"    ⏭️  LÍNEA {i+1}: No se tradujo - manteniendo línea original")
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
+            writer.replace(segment.start, segment.end, translated_text)
+            i = segment.node.line_number
+            if segment.block is not None:
+                translated_blocks[segment.block.line_number] = segment.block
+                self.log_message(f"    ✅ LÍNEA {i+1}: {segment.rule.path} traducido en "
+                                 f"{segment.block.keyword} {segment.block.name}")
             else:
-                # Fuera de bloques de planeta, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
+                self.log_message(f"  ✅ Línea {i+1} traducida")
+        lines_translated = len(writer)
+        lines_skipped = len(segments) - lines_translated
         
         # Guardar archivo solo si hay traducciones
+        dest_file.parent.mkdir(parents=True, exist_ok=True)
         if lines_translated > 0:
-            print(f"   💾 Guardando archivo de planetas con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo de planetas guardado: {dest_file}")
+            self.log_message(f"   💾 Guardando archivo{kind} con {lines_translated} líneas traducidas...")
+            # Guardar con codificación UTF-8 y BOM para máxima compatibilidad (reemplazo atómico)
+            with atomic_output(dest_file, encoding='utf-8-sig') as f:
+                if data_job.only_translated_blocks:
+                    f.write("# Plugin translation - SOLO elementos traducidos para forzar sobrescritura\n"
+                            "# Este archivo contiene ÚNICAMENTE elementos con traducciones\n"
+                            "\n")
+                    for _, block in sorted(translated_blocks.items()):
+                        writer.write_range(f, block.start, block.block_end)
+                        f.write("\n")
+                else:
+                    writer.write_to(f)
+            self.log_message(f"   ✅ Archivo{kind} guardado: {dest_file}")
         else:
-            print(f"   ⏭️  Sin traducciones en planetas, archivo omitido")
+            self.log_message(f"   ⏭️  Sin traducciones{kind}, archivo omitido")
         
+        self.log_message(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
+        self.record_build_output(data_job.source_file, dest_file, lines_translated,
+                                 complete=data_job.missing == 0, snapshot=data_job.snapshot)
+        data_job.document = None   # El texto del archivo ya no hace falta
+        return lines_translated
+
+    def _stream_blocks(self, source_file, progress):
+        """Etapa de lectura: bloques raíz del archivo como (primera línea, texto)
+
+        progress recibe los bytes leídos del archivo tras cada bloque.
+        """
+        encoding = self.detect_encoding(source_file)
+        self.log_message(f"   🔤 Codificación: {encoding}")
+        with open(source_file, 'rb') as raw:
+            text = io.TextIOWrapper(raw, encoding=encoding, errors='ignore')
+            for first_line, block_text in iter_root_blocks(text):
+                yield first_line, block_text
+                progress(raw.tell())
+
+    def _translate_windows(self, documents):
+        """Etapa de traducción: agrupa los segmentos de varios bloques y los traduce a la vez
+
+        Genera (documento, segmentos, traducciones) en el orden del archivo; como mucho hay
+        streaming_window_segments segmentos (y sus bloques) pendientes en memoria.
+        """
+        window = []
+        pending = 0
+        for document, segments in documents:
+            window.append((document, segments))
+            pending += len(segments)
+            if pending >= self.streaming_window_segments:
+                yield from self._translate_window(window)
+                window = []
+                pending = 0
+        yield from self._translate_window(window)
+
+    def _translate_window(self, window):
+        translations = iter(self.translate_segments(
+            [segment.text for _, segments in window for segment in segments]))
+        for document, segments in window:
+            yield document, segments, [next(translations) for _ in segments]
+
+    def translate_data_file_streaming(self, source_file, dest_file, label=None, ruleset=None,
+                                      only_translated_blocks=False):
+        """Versión por transmisión de translate_data_file para archivos muy grandes
+
+        Etapas encadenadas como generadores: lectura de bloques raíz -> análisis ->
+        extracción (clasificación) -> traducción por ventanas -> escritura en un archivo
+        temporal junto al destino, que lo sustituye al terminar. La memoria depende del
+        bloque más grande y de la ventana de segmentos, no del tamaño del archivo; el
+        progreso se informa en bytes procesados.
+        """
+        kind = f" de {label}" if label else ""
+        dest_file.parent.mkdir(parents=True, exist_ok=True)
+        total_bytes = source_file.stat().st_size
+        collecting = self._collected_segments is not None
+        next_report = [self.streaming_progress_step]
+        
+        def progress(bytes_read):
+            percent = bytes_read * 100 // total_bytes if total_bytes else 100
+            if percent >= next_report[0] and not collecting:
+                self.log_message(f"   📦 {bytes_read / 1048576:.1f}/{total_bytes / 1048576:.1f} MB procesados "
+                                 f"({percent}%)")
+                next_report[0] = (percent // self.streaming_progress_step + 1) * self.streaming_progress_step
+        
+        documents = (DataDocument(block_text, first_line)
+                     for first_line, block_text in self._stream_blocks(source_file, progress))
+        extracted = ((document, self.extract_segments(document, ruleset)) for document in documents)
+        translated = self._translate_windows(extracted)
+        
+        lines_total = segments_total = lines_translated = 0
+        temp_path = None
+        f = None
+        try:
+            if not collecting:
+                # La salida se vuelca a medida que se produce; el destino se sustituye al final
+                fd, temp_path = tempfile.mkstemp(prefix=f".{dest_file.name}.", suffix='.tmp', dir=dest_file.parent)
+                f = open(fd, 'w', encoding='utf-8-sig')
+                if only_translated_blocks:
+                    f.write("# Plugin translation - SOLO elementos traducidos para forzar sobrescritura\n"
+                            "# Este archivo contiene ÚNICAMENTE elementos con traducciones\n"
+                            "\n")
+            for document, segments, translations in translated:
+                lines_total += document.line_count
+                segments_total += len(segments)
+                writer = SpliceWriter(document.text)
+                translated_blocks = {}
+                for segment, translated_text in zip(segments, translations):
+                    if translated_text == segment.text:
+                        continue
+                    writer.replace(segment.start, segment.end, translated_text)
+                    if segment.block is not None:
+                        translated_blocks[segment.block.line_number] = segment.block
+                lines_translated += len(writer)
+                if f is None:
+                    continue
+                if only_translated_blocks:
+                    for _, block in sorted(translated_blocks.items()):
+                        writer.write_range(f, block.start, block.block_end)
+                        f.write("\n")
+                else:
+                    writer.write_to(f)
+            
+            if f is not None:
+                f.close()
+                f = None
+            self.log_message(f"   📊 Total de líneas: {lines_total}, {segments_total} segmentos traducibles{kind}")
+            if lines_translated > 0 and temp_path is not None:
+                os.chmod(temp_path, 0o644)   # mkstemp crea el archivo con permisos 0600
+                os.replace(temp_path, dest_file)
+                temp_path = None
+                self.log_message(f"   ✅ Archivo{kind} guardado: {dest_file} ({lines_translated} líneas traducidas)")
+            else:
+                self.log_message(f"   ⏭️  Sin traducciones{kind}, archivo omitido")
+        finally:
+            if f is not None:
+                f.close()
+            if temp_path is not None:
+                os.unlink(temp_path)
+        
+        self.log_message(f"   📊 Resultado: {lines_translated} traducidas, {segments_total - lines_translated} omitidas")
         return lines_translated
 
+    def translate_map_planets_file(self, source_file, dest_file):
+        """Traduce específicamente el archivo map planets.txt con lógica especial"""
+        self.log_message(f"\n🌍 Procesando archivo de planetas: {source_file.name}")
+        self._begin_job(self.translate_map_planets_file, source_file, dest_file)
+        self.prefetch_segments([(self.translate_map_planets_file, source_file)])
+        
+        return self.translate_data_file(source_file, dest_file, 'planetas', 'planets')
+
     def translate_file(self, source_file, dest_file):
         """Traduce un archivo completo con lógica mejorada y específica por tipo"""
-        print(f"\n📄 Procesando archivo: {source_file.name}")
+        self.log_message(f"\n📄 Procesando archivo: {source_file.name}")
+        self._begin_job(self.translate_file, source_file, dest_file)
+        self.prefetch_segments([(self.translate_file, source_file)])
         
         # Determinar si necesita lógica especial
         filename_lower = source_file.name.lower()
         
         if filename_lower == 'commodities.txt':
-            print(f"   🎯 Aplicando lógica especial para commodities")
+            self.log_message(f"   🎯 Aplicando lógica especial para commodities")
             return self.translate_commodities_file(source_file, dest_file)
         elif filename_lower in ['ships.txt', 'outfits.txt', 'engines.txt', 'weapons.txt', 'power.txt', 'harvesting.txt', 'variants.txt'] or \
              any(filename_lower.endswith(pattern) for pattern in ['ships.txt', 'outfits.txt', 'engines.txt', 'weapons.txt', 'power.txt', 'sales.txt']):
-            print(f"   🎯 Aplicando lógica especial para ships/outfits/engines/harvesting/sales")
+            self.log_message(f"   🎯 Aplicando lógica especial para ships/outfits/engines/harvesting/sales")
             return self.translate_ships_outfits_file(source_file, dest_file)
         elif filename_lower == 'starts.txt':
-            print(f"   🎯 Aplicando lógica especial para starts")
+            self.log_message(f"   🎯 Aplicando lógica especial para starts")
             return self.translate_starts_file(source_file, dest_file)
         elif filename_lower == 'persons.txt':
-            print(f"   🎯 Aplicando lógica especial para persons")
+            self.log_message(f"   🎯 Aplicando lógica especial para persons")
             return self.translate_persons_file(source_file, dest_file)
         elif filename_lower == 'help.txt':
-            print(f"   🎯 Aplicando lógica especial para help")
+            self.log_message(f"   🎯 Aplicando lógica especial para help")
             return self.translate_help_file(source_file, dest_file)
         elif 'hails.txt' in filename_lower or 'names.txt' in filename_lower or filename_lower in ['wanderers.txt', 'hai.txt', 'korath.txt']:
-            print(f"   🎯 Aplicando lógica especial para hails/names/facciones")
+            self.log_message(f"   🎯 Aplicando lógica especial para hails/names/facciones")
             return self.translate_hails_file(source_file, dest_file)
         elif 'news.txt' in filename_lower:
-            print(f"   🎯 Aplicando lógica especial para news")
+            self.log_message(f"   🎯 Aplicando lógica especial para news")
             return self.translate_news_file(source_file, dest_file)
         elif filename_lower == 'fleets.txt' or filename_lower.endswith(' fleets.txt'):
-            print(f"   🎯 Aplicando lógica especial para fleets")
+            self.log_message(f"   🎯 Aplicando lógica especial para fleets")
             return self.translate_fleets_file(source_file, dest_file)
         elif filename_lower == 'governments.txt' or filename_lower.endswith(' governments.txt'):
-            print(f"   🎯 Aplicando lógica especial para governments")
+            self.log_message(f"   🎯 Aplicando lógica especial para governments")
             return self.translate_governments_file(source_file, dest_file)
         
-        # Lógica general para otros archivos
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                print(f"   📈 Progreso: {i}/{len(lines)} líneas...")
-                
-            translated_line, was_translated = self.translate_line(line)
-            
-            if was_translated:
-                lines_translated += 1
-                print(f"  ✅ Línea {i+1} traducida")
-            else:
-                lines_skipped += 1
-            
-            translated_lines.append(translated_line)
-        
-        # Solo crear archivo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo con {lines_translated} líneas traducidas...")
-            # Guardar con codificación UTF-8 y BOM para máxima compatibilidad
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones, archivo omitido")
-        
-        return lines_translated
+        # Lógica general para otros archivos: translate_line en cada línea
+        return self.translate_data_file(source_file, dest_file)
 
     def translate_folder(self, source_folder, dest_folder):
         """Traduce archivos específicos de una carpeta con procesamiento SEGURO"""
@@ -693,7 +1572,28 @@ class EndlessSkyTranslatorFixed:
             return 0
             
         print(f"\n📂 Procesando carpeta: {source_folder.name}")
+        files_to_translate = self.find_folder_files(source_folder)
+        files_processed = 0
+        
+        # Precarga por lotes (o reparto entre procesos de trabajo) de todos los archivos de la carpeta
+        jobs = [(self.translate_file, file_path, dest_folder / file_path.name) for file_path in files_to_translate]
+        for lines_translated in self.run_file_jobs(jobs, announce=lambda job: print(f"   📄 Procesando: {job[1].name}")):
+            if lines_translated > 0:
+                files_processed += 1
+        
+        # Procesar subcarpetas recursivamente (solo para _ui)
+        if source_folder.name == '_ui':
+            for item in source_folder.iterdir():
+                if item.is_dir() and not item.name.startswith('.'):
+                    print(f"   📁 Procesando subcarpeta: {item.name}")
+                    sub_files = self.translate_folder(item, dest_folder / item.name)
+                    files_processed += sub_files
         
+        print(f"   � Total archivos procesados en {source_folder.name}: {files_processed}")
+        return files_processed
+
+    def find_folder_files(self, source_folder):
+        """Archivos seguros de una carpeta (sin subcarpetas) que coinciden con sus patrones"""
         # Patrones específicos según la carpeta
         if source_folder.name == '_ui':
             # Para interfaz de usuario, traducir TODOS los archivos .txt (es seguro)
@@ -745,10 +1645,10 @@ class EndlessSkyTranslatorFixed:
             ]
             print(f"   🎯 Modo facción: procesando archivos seguros + ships/outfits (solo descripciones)")
         
-        files_processed = 0
         processed_files = set()  # Para evitar duplicados
+        files_to_translate = []
         
-        # Procesar patrones específicos
+        # Resolver patrones específicos
         for pattern in translatable_file_patterns:
             matching_files = list(source_folder.glob(pattern))
             if matching_files:
@@ -757,25 +1657,24 @@ class EndlessSkyTranslatorFixed:
                 if file_path.is_file() and file_path.name not in processed_files:
                     # Verificar que no sea un archivo problemático
                     if self.is_safe_to_translate(file_path):
-                        print(f"   📄 Procesando: {file_path.name}")
-                        dest_file = dest_folder / file_path.name
-                        lines_translated = self.translate_file(file_path, dest_file)
-                        if lines_translated > 0:
-                            files_processed += 1
+                        files_to_translate.append(file_path)
                         processed_files.add(file_path.name)
                     else:
                         print(f"   🚫 Archivo omitido por seguridad: {file_path.name}")
-        
-        # Procesar subcarpetas recursivamente (solo para _ui)
+        return files_to_translate
+
+    def discover_folder_jobs(self, source_folder, dest_folder):
+        """Trabajos (manejador, origen, destino) de una carpeta, con las subcarpetas de _ui"""
+        if not source_folder.exists():
+            print(f"  ⚠️  Carpeta no encontrada: {source_folder.name}")
+            return
+        print(f"\n📂 Explorando carpeta: {source_folder.name}")
+        for file_path in self.find_folder_files(source_folder):
+            yield self.translate_file, file_path, dest_folder / file_path.name
         if source_folder.name == '_ui':
             for item in source_folder.iterdir():
                 if item.is_dir() and not item.name.startswith('.'):
-                    print(f"   📁 Procesando subcarpeta: {item.name}")
-                    sub_files = self.translate_folder(item, dest_folder / item.name)
-                    files_processed += sub_files
-        
-        print(f"   � Total archivos procesados en {source_folder.name}: {files_processed}")
-        return files_processed
+                    yield from self.discover_folder_jobs(item, dest_folder / item.name)
 
     def is_safe_to_translate(self, file_path):
         """Determina si un archivo es seguro para traducir"""
@@ -917,7 +1816,11 @@ Este plugin proporciona traducción automática al español para Endless Sky.
         """Ejecuta el proceso completo de traducción corregido"""
         print("=== Traductor Automático de Endless Sky (Versión Corregida) ===")
         print(f"Idioma destino: {self.target_lang}")
+        print(f"Motor de traducción: {self.backend_name}")
         print(f"Directorio base: {self.base_path}")
+        self.start_run_clock()
+        if self.budget_description() is not None:
+            print(f"⏰ Presupuesto de la ejecución: {self.budget_description()}")
         
         # Verificar directorios
         if not self.data_path.exists():
@@ -968,6 +1871,93 @@ Este plugin proporciona traducción automática al español para Endless Sky.
         
         print(f"\n🔧 Creando plugin en: {self.plugin_path}")
         
+        # Abrir la memoria de traducción (reutiliza traducciones de ejecuciones anteriores)
+        if self.open_translation_memory() is not None:
+            print(f"🧠 Memoria de traducción: {len(self.translation_memory)} segmentos guardados")
+        if self.open_build_manifest() is not None:
+            print(f"🧱 Compilación incremental: {len(self.build_manifest.entries)} archivos en el manifiesto")
+        plan = None
+        if self.plan_runs:
+            plan = self.plan_jobs(self.discover_jobs())
+            for line in plan.report_lines():
+                print(line)
+            self.start_segment_progress(plan.segments)
+        
+        if self.scheduling_policy != 'discovery':
+            jobs = self.schedule_jobs(plan.jobs if plan is not None else self.discover_jobs(), plan)
+            total_files_processed, folders_processed = self.run_translation_jobs(jobs)
+        elif self.pipeline_mode:
+            total_files_processed, folders_processed = self.run_translation_pipeline()
+        else:
+            total_files_processed, folders_processed = self.run_translation_serial()
+        
+        # Reencolar los segmentos que fallaron (límites del backend, cortes de red...)
+        self.requeue_failed_segments()
+        self.finish_segment_progress()
+        self.close_file_pool()
+        build_stats = self.close_build_manifest()
+        
+        print(f"\n✅ Traducción completada!")
+        print(f"📁 Plugin creado en: {self.plugin_path}")
+        print(f"📊 {total_files_processed} archivos procesados")
+        print(f"📂 {folders_processed + 1} carpetas procesadas (incluyendo _ui)")
+        
+        if build_stats is not None:
+            print(f"🧱 Compilación incremental: {build_stats['reused']} archivos sin cambios reutilizados, "
+                  f"{build_stats['rebuilt']} regenerados, {build_stats['removed']} salidas obsoletas eliminadas")
+        memory_stats = self.close_translation_memory()
+        if memory_stats is not None:
+            print(f"🧠 Memoria de traducción: {memory_stats['hits']} aciertos, {memory_stats['misses']} fallos "
+                  f"({memory_stats['hit_rate']:.1f}% reutilizado)")
+        if self.batch_stats['requests']:
+            print(f"📦 Lotes: {self.batch_stats['segments']} segmentos en {self.batch_stats['requests']} peticiones "
+                  f"({self.batch_stats['fallbacks']} lotes reintentados uno a uno)")
+        dedup_stats = self.segment_table.stats()
+        if dedup_stats['occurrences']:
+            print(f"🔁 Deduplicación: {dedup_stats['occurrences']} segmentos, {dedup_stats['unique']} únicos, "
+                  f"{dedup_stats['saved']} peticiones evitadas ({dedup_stats['coalesced']} esperando una petición en vuelo)")
+        scheduler_stats = self.close_scheduler()
+        if scheduler_stats is not None:
+            print(f"⚡ Planificador: {scheduler_stats['requests']} peticiones, hasta {scheduler_stats['peak_in_flight']} "
+                  f"en vuelo, {scheduler_stats['throttle_wait']:.1f}s de espera por límite de velocidad")
+            if scheduler_stats['failures']:
+                print(f"🚦 Control adaptativo: {scheduler_stats['throttled']} limitaciones del servidor, "
+                      f"{scheduler_stats['retries']} reintentos ({scheduler_stats['backoff_wait']:.1f}s de espera), "
+                      f"{scheduler_stats['circuit_trips']} aperturas del cortacircuitos, "
+                      f"concurrencia final {scheduler_stats['concurrency']}")
+            if scheduler_stats['p95_latency'] is not None:
+                print(f"⏱️ Latencia p95: {scheduler_stats['p95_latency']:.2f}s, {scheduler_stats['hedges']} peticiones "
+                      f"duplicadas ({scheduler_stats['hedge_wins']} respondieron antes), "
+                      f"{scheduler_stats['timeouts']} sin respuesta a tiempo")
+        self.report_failed_segments()
+        
+        if total_files_processed > 0:
+            print("\n🎯 Características del plugin:")
+            print("   ✅ Interfaz completamente en español")
+            print("   ✅ Texto sin tildes para compatibilidad")
+            print("   ✅ Soporte para caracteres especiales (ñ)")
+            print("   ✅ Codificación UTF-8 con BOM")
+            print("   ✅ SOLO facciones principales traducidas")
+            print("   ✅ SOLO archivos seguros (misiones, diálogos, UI)")
+            print("   ✅ Commodities: solo descripciones visibles")
+            print("   🚫 Archivos técnicos preservados (ships, outfits, fleets)")
+            print("\n💡 Para usar la traducción:")
+            print("   1. Inicia Endless Sky")
+            print("   2. Ve a Preferencias → Plugins")
+            print("   3. Activa 'Traducción al Español'")
+            print("   4. Reinicia el juego")
+            print("\n🔧 El juego ahora debería mostrar:")
+            print("   • Menús y botones en español")
+            print("   • Diálogos traducidos")
+            print("   • Misiones de facciones principales traducidas")
+            print("   • Descripciones de planetas en español")
+            print("   • Nombres de commodities en español (solo descripciones)")
+            print("   • ⚠️  IMPORTANTE: Funcionalidad del juego intacta")
+        else:
+            print("\n⚠️  No se encontraron archivos para traducir")
+
+    def run_translation_serial(self):
+        """Traduce los archivos de run_translation uno tras otro; devuelve (archivos, carpetas)"""
         print("\n🌟 --- SUPER MEGA MÁXIMA PRIORIDAD: MAP PLANETS ---")
         total_files_processed = 0
         
@@ -1026,6 +2016,8 @@ Este plugin proporciona traducción automática al español para Endless Sky.
         commodities_file = self.data_path / 'commodities.txt'
         if commodities_file.exists():
             print(f"\n🔍 Procesando commodities.txt con lógica especial")
+            self._begin_job(self.translate_commodities_file, commodities_file, self.plugin_data_path / 'commodities.txt')
+            self.prefetch_segments([(self.translate_commodities_file, commodities_file)])
             lines_translated = self.translate_commodities_file(commodities_file, self.plugin_data_path / 'commodities.txt')
             if lines_translated > 0:
                 total_files_processed += 1
@@ -1055,35 +2047,61 @@ Este plugin proporciona traducción automática al español para Endless Sky.
             else:
                 print(f"  ⚠️  Carpeta no encontrada: {folder_name}")
         
-        print(f"\n✅ Traducción completada!")
-        print(f"📁 Plugin creado en: {self.plugin_path}")
-        print(f"📊 {total_files_processed} archivos procesados")
-        print(f"📂 {folders_processed + 1} carpetas procesadas (incluyendo _ui)")
-        
-        if total_files_processed > 0:
-            print("\n🎯 Características del plugin:")
-            print("   ✅ Interfaz completamente en español")
-            print("   ✅ Texto sin tildes para compatibilidad")
-            print("   ✅ Soporte para caracteres especiales (ñ)")
-            print("   ✅ Codificación UTF-8 con BOM")
-            print("   ✅ SOLO facciones principales traducidas")
-            print("   ✅ SOLO archivos seguros (misiones, diálogos, UI)")
-            print("   ✅ Commodities: solo descripciones visibles")
-            print("   🚫 Archivos técnicos preservados (ships, outfits, fleets)")
-            print("\n💡 Para usar la traducción:")
-            print("   1. Inicia Endless Sky")
-            print("   2. Ve a Preferencias → Plugins")
-            print("   3. Activa 'Traducción al Español'")
-            print("   4. Reinicia el juego")
-            print("\n🔧 El juego ahora debería mostrar:")
-            print("   • Menús y botones en español")
-            print("   • Diálogos traducidos")
-            print("   • Misiones de facciones principales traducidas")
-            print("   • Descripciones de planetas en español")
-            print("   • Nombres de commodities en español (solo descripciones)")
-            print("   • ⚠️  IMPORTANTE: Funcionalidad del juego intacta")
-        else:
-            print("\n⚠️  No se encontraron archivos para traducir")
+        return total_files_processed, folders_processed
+
+    def discovery_units(self):
+        """Elementos de la etapa de exploración en el orden de run_translation_serial
+
+        (manejador, origen, destino) para un archivo o (None, carpeta, destino) para una carpeta.
+        """
+        units = []
+        if 'map planets.txt' in self.translatable_files:
+            units.append((self.translate_map_planets_file, self.data_path / 'map planets.txt',
+                          self.plugin_data_path / 'map planets.txt'))
+        units.append((None, self.data_path / '_ui', self.plugin_data_path / '_ui'))
+        for filename in self.translatable_files:
+            if filename != 'map planets.txt':
+                units.append((self.translate_file, self.data_path / filename, self.plugin_data_path / filename))
+        units.append((self.translate_commodities_file, self.data_path / 'commodities.txt',
+                      self.plugin_data_path / 'commodities.txt'))
+        for folder_name in self.translatable_folders:
+            if folder_name != '_ui':
+                units.append((None, self.data_path / folder_name, self.plugin_data_path / folder_name))
+        return units
+
+    def scan_unit(self, unit):
+        """Etapa de exploración: trabajos (manejador, origen, destino) de un elemento de discovery_units"""
+        handler, source, dest = unit
+        if handler is None:
+            return list(self.discover_folder_jobs(source, dest))
+        if not source.exists():
+            print(f"  ⚠️  Archivo no encontrado: {source.name}")
+            return []
+        return [unit]
+
+    def run_translation_pipeline(self):
+        """Traduce los archivos de run_translation con el pipeline por etapas; devuelve (archivos, carpetas)"""
+        stages = ", ".join(f"{name} x{self.pipeline_workers.get(name, 1)}" for name in PIPELINE_STAGES)
+        print(f"\n🚦 --- PIPELINE POR ETAPAS: {stages} (colas de {self.pipeline_queue_size} archivos) ---")
+        total_files_processed = 0
+        for _, _, lines_translated in self.run_file_pipeline(self.discovery_units(), self.scan_unit):
+            if lines_translated > 0:
+                total_files_processed += 1
+        return total_files_processed, self.count_existing_folders()
+
+    def run_translation_jobs(self, jobs):
+        """Traduce una lista de trabajos ya ordenada (scheduling_policy); devuelve (archivos, carpetas)"""
+        print(f"\n🗂️ --- ORDEN DE TRABAJO: {self.scheduling_policy} ({len(jobs)} archivos) ---")
+        total_files_processed = 0
+        for lines_translated in self.run_file_jobs(jobs, announce=lambda job: print(f"\n📄 Procesando: {job[1].name}")):
+            if lines_translated > 0:
+                total_files_processed += 1
+        return total_files_processed, self.count_existing_folders()
+
+    def count_existing_folders(self):
+        """Carpetas de translatable_folders que existen, sin contar _ui"""
+        return sum(1 for folder_name in self.translatable_folders
+                   if folder_name != '_ui' and (self.data_path / folder_name).exists())
 
     def normalize_text_for_game(self, text):
         """
@@ -1111,1104 +2129,66 @@ Este plugin proporciona traducción automática al español para Endless Sky.
 
     def translate_commodities_file(self, source_file, dest_file):
         """Traduce específicamente el archivo commodities.txt con máxima precaución"""
-        print(f"\n📦 Procesando archivo de commodities: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_commodity_block = False
-        current_commodity = ""
-        
-        for i, line in enumerate(lines):
-            if i % 500 == 0 and i > 0:
-                print(f"   📈 Progreso commodities: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar inicio de bloque commodity
-            commodity_match = re.match(r'^commodity\s+"([^"]*)"(?:\s+(\d+)\s+(\d+))?', line_stripped)
-            if commodity_match:
-                in_commodity_block = True
-                commodity_name = commodity_match.group(1)
-                current_commodity = f"commodity {commodity_name}"
-                print(f"  📦 LÍNEA {i+1}: Detectado commodity: {commodity_name}")
-                translated_lines.append(original_line)  # NO traducir nombres de commodities
-                continue
-            
-            # Detectar fin de bloque
-            if in_commodity_block and (not line_stripped or 
-                                     line_stripped.startswith('#') or
-                                     line_stripped.startswith('commodity ') or
-                                     line_stripped.startswith('trade')):
-                if not line_stripped or line_stripped.startswith('#') or line_stripped.startswith('trade'):
-                    in_commodity_block = False if not line_stripped or line_stripped.startswith('trade') else in_commodity_block
-                    print(f"    📍 LÍNEA {i+1}: {'Fin de bloque' if not in_commodity_block else 'Comentario'}")
-                else:
-                    in_commodity_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque - nuevo commodity")
-                translated_lines.append(original_line)
-                continue
-            
-            # Si estamos en un bloque de commodity, ser MUY SELECTIVO
-            if in_commodity_block:
-                # IMPORTANTE: En commodities, los nombres entre comillas son IDs técnicos
-                # NO traducir NUNCA estos nombres porque romperían el juego
-                if line_stripped.startswith('"') and line_stripped.endswith('"'):
-                    print(f"    🚫 LÍNEA {i+1}: Nombre de commodity ignorado (ID técnico)")
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-                else:
-                    # Para cualquier otra cosa, usar lógica normal pero conservadora
-                    translated_line, was_translated = self.translate_line(line)
-                    if was_translated:
-                        lines_translated += 1
-                        print(f"    ✅ LÍNEA {i+1}: Elemento traducido en {current_commodity}")
-                    else:
-                        lines_skipped += 1
-                    translated_lines.append(translated_line)
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo de commodities con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo de commodities guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en commodities, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n📦 Procesando archivo de commodities: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'commodities', 'commodities')
 
     def translate_ships_outfits_file(self, source_file, dest_file):
         """Traduce específicamente archivos de naves y outfits con lógica especial mejorada"""
-        print(f"\n🚢 Procesando archivo de naves/outfits: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_item_block = False
-        current_item = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 500 == 0 and i > 0:
-                print(f"   📈 Progreso naves/outfits: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar inicio de bloque de nave, outfit, effect o minable
-            item_match = re.match(r'^(ship|outfit|effect|minable)\s+"?([^"]*)"?', line_stripped)
-            if item_match:
-                in_item_block = True
-                item_type, item_name = item_match.groups()
-                current_item = f"{item_type} {item_name}"
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  🔧 LÍNEA {i+1}: Procesando {item_type}: {item_name}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque (nueva definición al mismo nivel o línea vacía)
-            if in_item_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['ship ', 'outfit ', 'effect ', 'minable ', 'planet ', 'system '])):
-                    in_item_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque - nueva definición")
-                # Si es línea vacía o comentario, mantener pero no cambiar estado del bloque
-                elif not line_stripped or line_stripped.startswith('#'):
-                    translated_lines.append(original_line)
-                    continue
-            
-            # Si estamos en un bloque de item, aplicar lógica específica
-            if in_item_block:
-                was_translated = False
-                
-                # Detectar descripciones - patrón mejorado
-                description_match = re.match(r'^(\s*)(description\s+)"(.+)"(.*)$', line.rstrip())
-                if description_match:
-                    prefix, keyword, description_text, suffix = description_match.groups()
-                    print(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DETECTADA en {current_item}")
-                    try:
-                        translated_text = self.translate_text(description_text)
-                        new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                        if original_line.endswith('\n'):
-                            new_line += '\n'
-                        translated_lines.append(new_line)
-                        lines_translated += 1
-                        was_translated = True
-                        print(f"    ✅ LÍNEA {i+1}: Descripción traducida correctamente")
-                    except Exception as e:
-                        print(f"    ❌ LÍNEA {i+1}: Error traduciendo descripción: {e}")
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True  # Marcar como procesada aunque falló
-                
-                # Detectar otros elementos traducibles específicos
-                if not was_translated:
-                    translatable_patterns = [
-                        (r'^(\s*)(plural\s+)"(.+)"(.*)$', 'plural'),
-                        (r'^(\s*)(noun\s+)"(.+)"(.*)$', 'noun'),
-                        (r'^(\s*)(explanation\s+)"(.+)"(.*)$', 'explanation'),
-                        (r'^(\s*)(tooltip\s+)"(.+)"(.*)$', 'tooltip'),
-                        (r'^(\s*)(help\s+)"(.+)"(.*)$', 'help'),
-                    ]
-                    
-                    for pattern, element_name in translatable_patterns:
-                        element_match = re.match(pattern, line.rstrip())
-                        if element_match:
-                            prefix, keyword, text_to_translate, suffix = element_match.groups()
-                            print(f"    🎯 LÍNEA {i+1}: {element_name.upper()} DETECTADO en {current_item}")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: {element_name} traducido correctamente")
-                                break
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error traduciendo {element_name}: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                                break
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo de naves/outfits con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo de naves/outfits guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en naves/outfits, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n🚢 Procesando archivo de naves/outfits: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'naves/outfits', 'ships',
+                                        only_translated_blocks=self.ships_only_translated_blocks)
 
     def translate_starts_file(self, source_file, dest_file):
         """Traduce específicamente el archivo starts.txt"""
-        print(f"\n🚀 Procesando archivo starts: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_start_block = False
-        current_start = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                print(f"   📈 Progreso starts: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque start
-            start_match = re.match(r'^start\s+"?([^"]*)"?', line_stripped)
-            if start_match:
-                in_start_block = True
-                current_start = start_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  🚀 LÍNEA {i+1}: Procesando start: {current_start}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque
-            if in_start_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['start ', 'mission ', 'conversation ', 'event '])):
-                    in_start_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque start - nueva definición")
-            
-            # Si estamos en un bloque start, buscar elementos traducibles
-            if in_start_block:
-                was_translated = False
-                
-                # Detectar name
-                name_match = re.match(r'^(\s*)(name\s+)"(.+)"(.*)$', line.rstrip())
-                if name_match:
-                    prefix, keyword, name_text, suffix = name_match.groups()
-                    print(f"    🎯 LÍNEA {i+1}: NAME DETECTADO en {current_start}")
-                    try:
-                        translated_text = self.translate_text(name_text)
-                        new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                        if original_line.endswith('\n'):
-                            new_line += '\n'
-                        translated_lines.append(new_line)
-                        lines_translated += 1
-                        was_translated = True
-                        print(f"    ✅ LÍNEA {i+1}: Nombre traducido correctamente")
-                    except Exception as e:
-                        print(f"    ❌ LÍNEA {i+1}: Error traduciendo nombre: {e}")
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True
-                
-                # Detectar description
-                if not was_translated:
-                    description_match = re.match(r'^(\s*)(description\s+)"(.+)"(.*)$', line.rstrip())
-                    if description_match:
-                        prefix, keyword, description_text, suffix = description_match.groups()
-                        print(f"    🎯 LÍNEA {i+1}: DESCRIPTION DETECTADA en {current_start}")
-                        try:
-                            translated_text = self.translate_text(description_text)
-                            new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                            if original_line.endswith('\n'):
-                                new_line += '\n'
-                            translated_lines.append(new_line)
-                            lines_translated += 1
-                            was_translated = True
-                            print(f"    ✅ LÍNEA {i+1}: Descripción traducida correctamente")
-                        except Exception as e:
-                            print(f"    ❌ LÍNEA {i+1}: Error traduciendo descripción: {e}")
-                            translated_lines.append(original_line)
-                            lines_skipped += 1
-                            was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo starts con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo starts guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en starts, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n🚀 Procesando archivo starts: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'starts', 'starts')
 
     def translate_persons_file(self, source_file, dest_file):
         """Traduce específicamente el archivo persons.txt"""
-        print(f"\n👤 Procesando archivo persons: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_phrase_block = False
-        current_phrase = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                print(f"   📈 Progreso persons: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque phrase
-            phrase_match = re.match(r'^phrase\s+"?([^"]*)"?', line_stripped)
-            if phrase_match:
-                in_phrase_block = True
-                current_phrase = phrase_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  👤 LÍNEA {i+1}: Procesando phrase: {current_phrase}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque
-            if in_phrase_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['phrase ', 'person '])):
-                    in_phrase_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque phrase - nueva definición")
-            
-            # Si estamos en un bloque phrase, buscar elementos traducibles
-            if in_phrase_block:
-                was_translated = False
-                
-                # Detectar word (traducir contenido entre comillas)
-                word_match = re.match(r'^(\s*)"(.+)"(.*)$', line.rstrip())
-                if word_match:
-                    prefix, word_text, suffix = word_match.groups()
-                    print(f"    🎯 LÍNEA {i+1}: WORD DETECTADO en {current_phrase}")
-                    try:
-                        translated_text = self.translate_text(word_text)
-                        new_line = f'{prefix}"{translated_text}"{suffix}'
-                        if original_line.endswith('\n'):
-                            new_line += '\n'
-                        translated_lines.append(new_line)
-                        lines_translated += 1
-                        was_translated = True
-                        print(f"    ✅ LÍNEA {i+1}: Word traducido correctamente")
-                    except Exception as e:
-                        print(f"    ❌ LÍNEA {i+1}: Error traduciendo word: {e}")
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo persons con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo persons guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en persons, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n👤 Procesando archivo persons: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'persons', 'persons')
 
     def translate_help_file(self, source_file, dest_file):
         """Traduce específicamente el archivo help.txt"""
-        print(f"\n❓ Procesando archivo help: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_help_block = False
-        current_help = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 50 == 0 and i > 0:
-                print(f"   📈 Progreso help: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque help
-            help_match = re.match(r'^help\s+"?([^"]*)"?', line_stripped)
-            if help_match:
-                in_help_block = True
-                current_help = help_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  ❓ LÍNEA {i+1}: Procesando help: {current_help}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque
-            if in_help_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['help '])):
-                    in_help_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque help - nueva definición")
-            
-            # Si estamos en un bloque help, traducir texto entre backticks
-            if in_help_block:
-                was_translated = False
-                
-                # Detectar texto de ayuda (entre backticks)
-                help_text_match = re.match(r'^(\s*)`(.+)`(.*)$', line.rstrip())
-                if help_text_match:
-                    prefix, help_text, suffix = help_text_match.groups()
-                    print(f"    🎯 LÍNEA {i+1}: HELP TEXT DETECTADO en {current_help}")
-                    try:
-                        translated_text = self.translate_text(help_text)
-                        new_line = f'{prefix}`{translated_text}`{suffix}'
-                        if original_line.endswith('\n'):
-                            new_line += '\n'
-                        translated_lines.append(new_line)
-                        lines_translated += 1
-                        was_translated = True
-                        print(f"    ✅ LÍNEA {i+1}: Texto de ayuda traducido correctamente")
-                    except Exception as e:
-                        print(f"    ❌ LÍNEA {i+1}: Error traduciendo texto de ayuda: {e}")
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo help con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo help guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en help, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n❓ Procesando archivo help: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'help', 'help')
 
     def translate_hails_file(self, source_file, dest_file):
         """Traduce específicamente archivos hails.txt"""
-        print(f"\n📡 Procesando archivo hails: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_phrase_block = False
-        current_phrase = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 200 == 0 and i > 0:
-                print(f"   📈 Progreso hails: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque phrase
-            phrase_match = re.match(r'^phrase\s+"?([^"]*)"?', line_stripped)
-            if phrase_match:
-                in_phrase_block = True
-                current_phrase = phrase_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  📡 LÍNEA {i+1}: Procesando phrase: {current_phrase}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque
-            if in_phrase_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['phrase '])):
-                    in_phrase_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque phrase - nueva definición")
-            
-            # Si estamos en un bloque phrase, buscar elementos traducibles
-            if in_phrase_block:
-                was_translated = False
-                
-                # Detectar word (traducir contenido entre comillas)
-                word_match = re.match(r'^(\s*)"(.+)"(.*)$', line.rstrip())
-                if word_match:
-                    prefix, word_text, suffix = word_match.groups()
-                    # Solo traducir si no parece ser un nombre propio o técnico
-                    if not re.match(r'^[A-Z][a-z]+ [A-Z][a-z]+', word_text):  # Skip names like "John Smith"
-                        print(f"    🎯 LÍNEA {i+1}: WORD DETECTADO en {current_phrase}")
-                        try:
-                            translated_text = self.translate_text(word_text)
-                            new_line = f'{prefix}"{translated_text}"{suffix}'
-                            if original_line.endswith('\n'):
-                                new_line += '\n'
-                            translated_lines.append(new_line)
-                            lines_translated += 1
-                            was_translated = True
-                            print(f"    ✅ LÍNEA {i+1}: Word traducido correctamente")
-                        except Exception as e:
-                            print(f"    ❌ LÍNEA {i+1}: Error traduciendo word: {e}")
-                            translated_lines.append(original_line)
-                            lines_skipped += 1
-                            was_translated = True
-                    else:
-                        # Es probablemente un nombre propio, no traducir
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo hails con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo hails guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en hails, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n📡 Procesando archivo hails: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'hails', 'hails')
 
     def translate_news_file(self, source_file, dest_file):
         """Traduce específicamente archivos news.txt"""
-        print(f"\n📰 Procesando archivo news: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_block = False
-        current_block = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 200 == 0 and i > 0:
-                print(f"   📈 Progreso news: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloques phrase, news, mission
-            block_match = re.match(r'^(phrase|news|mission)\s+"?([^"]*)"?', line_stripped)
-            if block_match:
-                in_block = True
-                block_type, block_name = block_match.groups()
-                current_block = f"{block_type} {block_name}"
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  📰 LÍNEA {i+1}: Procesando {block_type}: {block_name}")
-                translated_lines.append(original_line)  # No traducir nombres técnicos
-                continue
-            
-            # Detectar fin de bloque
-            if in_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['phrase ', 'news ', 'mission '])):
-                    in_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque - nueva definición")
-            
-            # Si estamos en un bloque, buscar elementos traducibles
-            if in_block:
-                was_translated = False
-                
-                # Detectar message (noticias)
-                message_match = re.match(r'^(\s*)(message\s+)"(.+)"(.*)$', line.rstrip())
-                if message_match:
-                    prefix, keyword, message_text, suffix = message_match.groups()
-                    print(f"    🎯 LÍNEA {i+1}: MESSAGE DETECTADO en {current_block}")
-                    try:
-                        translated_text = self.translate_text(message_text)
-                        new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                        if original_line.endswith('\n'):
-                            new_line += '\n'
-                        translated_lines.append(new_line)
-                        lines_translated += 1
-                        was_translated = True
-                        print(f"    ✅ LÍNEA {i+1}: Message traducido correctamente")
-                    except Exception as e:
-                        print(f"    ❌ LÍNEA {i+1}: Error traduciendo message: {e}")
-                        translated_lines.append(original_line)
-                        lines_skipped += 1
-                        was_translated = True
-                
-                # Detectar word (frases)
-                if not was_translated:
-                    word_match = re.match(r'^(\s*)"(.+)"(.*)$', line.rstrip())
-                    if word_match:
-                        prefix, word_text, suffix = word_match.groups()
-                        # Solo traducir si parece ser contenido de mensaje, no nombres
-                        if len(word_text.split()) > 1:  # Frases de más de una palabra
-                            print(f"    🎯 LÍNEA {i+1}: WORD DETECTADO en {current_block}")
-                            try:
-                                translated_text = self.translate_text(word_text)
-                                new_line = f'{prefix}"{translated_text}"{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: Word traducido correctamente")
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error traduciendo word: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                        else:
-                            # Probablemente un nombre, no traducir
-                            translated_lines.append(original_line)
-                            lines_skipped += 1
-                            was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo news con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo news guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en news, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n📰 Procesando archivo news: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'news', 'news')
 
     def translate_fleets_file(self, source_file, dest_file):
         """Traduce específicamente archivos fleets.txt"""
-        print(f"\n🚁 Procesando archivo de flotas: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_fleet_block = False
-        current_fleet = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 200 == 0 and i > 0:
-                print(f"   📈 Progreso flotas: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque fleet
-            fleet_match = re.match(r'^fleet\s+"?([^"]*)"?', line_stripped)
-            if fleet_match:
-                in_fleet_block = True
-                current_fleet = fleet_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  🚁 LÍNEA {i+1}: Procesando flota: {current_fleet}")
-                translated_lines.append(original_line)  # No traducir nombres de flotas
-                continue
-            
-            # Detectar fin de bloque
-            if in_fleet_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['fleet ', 'government ', 'mission '])):
-                    in_fleet_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque fleet - nueva definición")
-            
-            # Si estamos en un bloque fleet, buscar elementos traducibles
-            if in_fleet_block:
-                was_translated = False
-                
-                # Detectar descripciones de flotas
-                if line_stripped.startswith('description `'):
-                    if line_stripped.endswith('`'):
-                        desc_match = re.match(r'^(\s*)description\s+`(.+)`(.*)$', line.rstrip())
-                        if desc_match:
-                            prefix, text_to_translate, suffix = desc_match.groups()
-                            print(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DE FLOTA en {current_fleet}")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}description `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: Descripción de flota traducida")
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo fleets con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo fleets guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en fleets, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n🚁 Procesando archivo de flotas: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'fleets', 'fleets')
 
     def translate_governments_file(self, source_file, dest_file):
         """Traduce específicamente archivos governments.txt"""
-        print(f"\n🏛️ Procesando archivo de gobiernos: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        print(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            print(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        print(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_government_block = False
-        current_government = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 200 == 0 and i > 0:
-                print(f"   📈 Progreso gobiernos: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque government
-            gov_match = re.match(r'^government\s+"?([^"]*)"?', line_stripped)
-            if gov_match:
-                in_government_block = True
-                current_government = gov_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                print(f"  🏛️ LÍNEA {i+1}: Procesando gobierno: {current_government}")
-                translated_lines.append(original_line)  # No traducir nombres de gobiernos
-                continue
-            
-            # Detectar fin de bloque
-            if in_government_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['government ', 'fleet ', 'mission '])):
-                    in_government_block = False
-                    print(f"    📍 LÍNEA {i+1}: Fin de bloque government - nueva definición")
-            
-            # Si estamos en un bloque government, buscar elementos traducibles
-            if in_government_block:
-                was_translated = False
-                
-                # Detectar descripciones de gobiernos
-                if line_stripped.startswith('description `'):
-                    if line_stripped.endswith('`'):
-                        desc_match = re.match(r'^(\s*)description\s+`(.+)`(.*)$', line.rstrip())
-                        if desc_match:
-                            prefix, text_to_translate, suffix = desc_match.groups()
-                            print(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DE GOBIERNO en {current_government}")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}description `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: Descripción de gobierno traducida")
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                
-                # Detectar friendly/hostile hails (mensajes de comunicación)
-                hail_patterns = [
-                    (r'^(\s*)(friendly hail\s+)"(.+)"(.*)$', 'friendly hail'),
-                    (r'^(\s*)(hostile hail\s+)"(.+)"(.*)$', 'hostile hail'),
-                    (r'^(\s*)(bribe\s+)"(.+)"(.*)$', 'bribe message'),
-                    (r'^(\s*)(fine\s+)"(.+)"(.*)$', 'fine message')
-                ]
-                
-                if not was_translated:
-                    for pattern, hail_type in hail_patterns:
-                        hail_match = re.match(pattern, line.rstrip())
-                        if hail_match:
-                            prefix, keyword, text_to_translate, suffix = hail_match.groups()
-                            print(f"    🎯 LÍNEA {i+1}: {hail_type.upper()} en {current_government}")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                print(f"    ✅ LÍNEA {i+1}: {hail_type} traducido")
-                                break
-                            except Exception as e:
-                                print(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                                break
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            print(f"   💾 Guardando archivo governments con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            print(f"   ✅ Archivo governments guardado: {dest_file}")
-        else:
-            print(f"   ⏭️  Sin traducciones en governments, archivo omitido")
-        
-        print(f"   📊 Resultado: {lines_translated} traducidas, {lines_skipped} omitidas")
-        return lines_translated
+        self.log_message(f"\n🏛️ Procesando archivo de gobiernos: {source_file.name}")
+        return self.translate_data_file(source_file, dest_file, 'governments', 'governments')
 
 def main():
+    multiprocessing.freeze_support()  # Procesos de trabajo en ejecutables empaquetados
+    
     # Configuración
     base_path = r"d:\Program Files (x86)\Steam\steamapps\common\Endless Sky"
     target_language = 'es'  # Español
+    backend = DEFAULT_BACKEND  # 'googletrans', 'gtx', 'deep-translator' o 'pseudo' (offline, para perfilar)
+    time_budget = None  # Segundos máximos de la ejecución (p. ej. 3600 en trabajos nocturnos); None = sin límite
+    request_budget = None  # Peticiones máximas al backend en la ejecución; None = sin límite
     
     print("Iniciando traductor corregido...")
     
     # Crear instancia del traductor
-    translator = EndlessSkyTranslatorFixed(base_path, target_language)
+    translator = EndlessSkyTranslatorFixed(base_path, target_language, backend)
+    translator.run_time_budget = time_budget
+    translator.run_request_budget = request_budget
     
     # Ejecutar traducción
     translator.run_translation()
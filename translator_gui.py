@@ -9,22 +9,26 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import queue
+import multiprocessing
 import os
 import sys
 from pathlib import Path
 import json
-import time
 import re
 
 # Importar el traductor principal y sistema de traducciones
 try:
     from translator import EndlessSkyTranslatorFixed
     from translations import TranslationManager
+    from translation_backends import available_backends, DEFAULT_BACKEND
+    from job_planner import dedupe_jobs
 except ImportError:
     # Si estamos ejecutando desde otro directorio
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     from translator import EndlessSkyTranslatorFixed
     from translations import TranslationManager
+    from translation_backends import available_backends, DEFAULT_BACKEND
+    from job_planner import dedupe_jobs
 
 class FileItem:
     """Representa un archivo o carpeta con estado de checkbox"""
@@ -52,6 +56,7 @@ class TranslatorGUIImproved:
         # Variables
         self.endless_sky_path = tk.StringVar()
         self.target_language = tk.StringVar(value='es')
+        self.translation_backend = tk.StringVar(value=DEFAULT_BACKEND)
         self.translator = None
         self.translation_thread = None
         self.translation_queue = queue.Queue()
@@ -138,6 +143,14 @@ class TranslatorGUIImproved:
         lang_combo.set("es - Español")
         lang_combo.pack(anchor=tk.W)
         
+        # Frame for translation backend
+        backend_frame = ttk.LabelFrame(self.config_frame, text=self.translation_manager.get('translation_backend'), padding=10)
+        backend_frame.pack(fill=tk.X, padx=20, pady=10)
+        
+        backend_combo = ttk.Combobox(backend_frame, textvariable=self.translation_backend,
+                                    values=available_backends(), state="readonly")
+        backend_combo.pack(anchor=tk.W)
+        
         # Información
         info_frame = ttk.LabelFrame(self.config_frame, text="ℹ️ Información", padding=10)
         info_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -724,16 +737,16 @@ class TranslatorGUIImproved:
         # Iniciar traducción en hilo separado
         self.translation_thread = threading.Thread(
             target=self.run_translation,
-            args=(base_path, target_lang, selected_folders, selected_files)
+            args=(base_path, target_lang, selected_folders, selected_files, self.translation_backend.get())
         )
         self.translation_thread.daemon = True
         self.translation_thread.start()
     
-    def run_translation(self, base_path, target_lang, selected_folders, selected_files):
+    def run_translation(self, base_path, target_lang, selected_folders, selected_files, backend=DEFAULT_BACKEND):
         """Ejecuta la traducción en un hilo separado"""
         try:
             # Crear instancia del traductor personalizada
-            translator = CustomTranslatorImproved(base_path, target_lang, self.translation_queue)
+            translator = CustomTranslatorImproved(base_path, target_lang, self.translation_queue, backend)
             
             # Ejecutar traducción con selecciones específicas
             translator.run_custom_translation(selected_folders, selected_files)
@@ -839,7 +852,8 @@ class TranslatorGUIImproved:
         """Guarda la configuración actual"""
         config = {
             'endless_sky_path': self.endless_sky_path.get(),
-            'target_language': self.target_language.get()
+            'target_language': self.target_language.get(),
+            'translation_backend': self.translation_backend.get()
         }
         
         try:
@@ -858,6 +872,7 @@ class TranslatorGUIImproved:
                 
                 self.endless_sky_path.set(config.get('endless_sky_path', ''))
                 self.target_language.set(config.get('target_language', 'es'))
+                self.translation_backend.set(config.get('translation_backend', DEFAULT_BACKEND))
         except Exception:
             # Si hay error cargando, usar valores por defecto
             pass
@@ -890,383 +905,150 @@ class TranslatorGUIImproved:
 class CustomTranslatorImproved(EndlessSkyTranslatorFixed):
     """Traductor personalizado mejorado que envía mensajes a la GUI"""
     
-    def __init__(self, base_path, target_lang, message_queue):
-        super().__init__(base_path, target_lang)
+    def __init__(self, base_path, target_lang, message_queue, backend=DEFAULT_BACKEND):
+        super().__init__(base_path, target_lang, backend)
         self.message_queue = message_queue
+        # Naves/outfits: escribir solo los elementos traducidos fuerza su sobrescritura completa
+        self.ships_only_translated_blocks = True
     
     def log_message(self, message):
         """Envía mensaje a la GUI"""
+        if self._collected_segments is not None:
+            return  # Pasada de recogida para lotes: no duplicar el log
         self.message_queue.put(("log", message, None))
         print(message)  # También imprimir en consola
     
-    def translate_text(self, text):
-        """Traduce un texto usando Google Translate preservando TODOS los identificadores del juego"""
-        if not text or len(text.strip()) < 2:
-            return text
-        
-        try:
-            clean_text = text.strip()
-            if not clean_text:
-                return text
-            
-            # PRESERVAR TODOS LOS ELEMENTOS ESPECIALES DEL JUEGO
-            preservation_map = {}
-            temp_text = clean_text
-            placeholder_counter = 0
-            
-            # 1. Variables del juego como <planet>, <origin>, <destination>, <tons>, etc.
-            # IMPORTANTE: Preservar TODAS las etiquetas entre < >
-            game_variables = re.findall(r'<[^>]+>', temp_text)
-            if game_variables:
-                self.log_message(f"    🔒 Preservando {len(game_variables)} etiqueta(s): {game_variables}")
-            for var in game_variables:
-                placeholder = f"__GAMEVAR_{placeholder_counter}__"
-                preservation_map[placeholder] = var
-                temp_text = temp_text.replace(var, placeholder)
-                placeholder_counter += 1
-            
-            # 2. Números con unidades del juego como "5000 credits", "10 tons", "3 jumps"
-            game_units_pattern = r'\b\d+(?:[.,]\d+)?\s*(?:credits?|tons?|jumps?|days?|units?|MW|GW|kW|km|m)\b'
-            game_units = re.findall(game_units_pattern, temp_text, re.IGNORECASE)
-            for unit in game_units:
-                placeholder = f"__GAMEUNIT_{placeholder_counter}__"
-                preservation_map[placeholder] = unit
-                temp_text = temp_text.replace(unit, placeholder)
-                placeholder_counter += 1
-            
-            # 3. Coordenadas y números técnicos como "150.5 -200.3"
-            coordinates_pattern = r'\b-?\d+(?:\.\d+)?\s+-?\d+(?:\.\d+)?\b'
-            coordinates = re.findall(coordinates_pattern, temp_text)
-            for coord in coordinates:
-                placeholder = f"__COORD_{placeholder_counter}__"
-                preservation_map[placeholder] = coord
-                temp_text = temp_text.replace(coord, placeholder)
-                placeholder_counter += 1
-            
-            # 4. Nombres propios entre comillas (naves, outfits, sistemas)
-            quoted_names = re.findall(r'"[A-Z][^"]*"', temp_text)
-            for name in quoted_names:
-                placeholder = f"__QUOTEDNAME_{placeholder_counter}__"
-                preservation_map[placeholder] = name
-                temp_text = temp_text.replace(name, placeholder)
-                placeholder_counter += 1
-            
-            # 5. Preservar guiones bajos al inicio (indicadores de teclas de acceso rápido)
-            underscore_prefix = ""
-            if temp_text.startswith('_'):
-                underscore_prefix = "_"
-                temp_text = temp_text[1:]
-            
-            # 6. Preservar puntos suspensivos
-            ellipsis_suffix = ""
-            if temp_text.endswith('...'):
-                ellipsis_suffix = "..."
-                temp_text = temp_text[:-3]
-            
-            # 7. Preservar archivos y extensiones
-            file_extensions = re.findall(r'\b\w+\.\w+\b', temp_text)
-            for file_ext in file_extensions:
-                placeholder = f"__FILE_{placeholder_counter}__"
-                preservation_map[placeholder] = file_ext
-                temp_text = temp_text.replace(file_ext, placeholder)
-                placeholder_counter += 1
-            
-            # No traducir si queda muy poco texto después de preservar elementos
-            if len(temp_text.strip()) < 3:
-                return text
-            
-            self.log_message(f"    🌍 Traduciendo: '{temp_text[:50]}{'...' if len(temp_text) > 50 else ''}'")
-            time.sleep(0.1)
-            
-            translated = self.translator.translate(temp_text, dest=self.target_lang)
-            result_text = translated.text if hasattr(translated, 'text') else str(translated)
-            
-            # RESTAURAR TODOS LOS ELEMENTOS PRESERVADOS
-            tags_restored = 0
-            for placeholder, original_value in preservation_map.items():
-                # Buscar tanto el placeholder original como en minúsculas (Google Translate los convierte)
-                placeholder_lower = placeholder.lower()
-                if placeholder in result_text:
-                    result_text = result_text.replace(placeholder, original_value)
-                    tags_restored += 1
-                elif placeholder_lower in result_text:
-                    result_text = result_text.replace(placeholder_lower, original_value)
-                    tags_restored += 1
-            
-            # Verificación adicional: asegurar que no queden placeholders sin restaurar
-            remaining_placeholders = re.findall(r'__[a-zA-Z]+_\d+__', result_text)
-            if remaining_placeholders:
-                # Intentar restaurar manualmente con búsqueda insensible a mayúsculas
-                for placeholder in remaining_placeholders:
-                    # Buscar placeholder original correspondiente
-                    for orig_placeholder, orig_value in preservation_map.items():
-                        if orig_placeholder.lower() == placeholder.lower():
-                            result_text = result_text.replace(placeholder, orig_value)
-                            tags_restored += 1
-                            break
-            
-            # Mostrar resultado de restauración si hay etiquetas
-            if preservation_map:
-                final_tags = re.findall(r'<[^>]*>', result_text)
-                if final_tags:
-                    self.log_message(f"    ✅ {len(final_tags)} etiqueta(s) preservada(s): {final_tags}")
-                else:
-                    self.log_message(f"    ⚠️ Se perdieron algunas etiquetas durante la traducción")
-            
-            # Normalizar el texto para el juego (eliminar tildes)
-            result_text = self.normalize_text_for_game(result_text)
-            
-            # Restaurar elementos especiales
-            final_text = underscore_prefix + result_text + ellipsis_suffix
-            
-            self.log_message(f"    ✅ Resultado: '{final_text[:50]}{'...' if len(final_text) > 50 else ''}'")
-            return final_text
-            
-        except Exception as e:
-            self.log_message(f"    ❌ Error traduciendo '{text[:30]}...': {e}")
-            return text
-    
-    def translate_map_planets_file(self, source_file, dest_file):
-        """Sobrescribir para redirigir logs a GUI"""
-        import time
-        
-        self.log_message(f"\n🌍 Procesando archivo de planetas: {source_file.name}")
-        
-        # Asegurar que el directorio de destino existe
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding) as f:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            encoding = 'utf-8'
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        
-        translated_lines = []
-        current_planet = None
-        in_planet_block = False
-        translations_made = 0
-        
-        for i, line in enumerate(lines):
-            # Mostrar progreso cada 20 líneas
-            if i % 20 == 0:
-                self.log_message(f"   📈 Progreso planetas: {i}/{len(lines)} líneas...")
-            
-            line_stripped = line.strip()
-            
-            if i < 10 or line_stripped.startswith('planet') or 'description' in line_stripped.lower() or i % 50 == 0:
-                self.log_message(f"    📍 LÍNEA {i+1}: Analizando: '{line_stripped[:80]}{'...' if len(line_stripped) > 80 else ''}'")
-            
-            # Detectar definición de planeta
-            planet_match = re.match(r'^planet\s+"([^"]*)"', line_stripped)
-            if planet_match:
-                current_planet = planet_match.group(1)
-                in_planet_block = True
-                self.log_message(f"  🪐 LÍNEA {i+1}: Procesando planeta: {current_planet}")
-                translated_lines.append(line)
-                continue
-            
-            # Verificar si es comentario o fin de bloque
-            if line_stripped.startswith('#') or line_stripped == '':
-                if in_planet_block:
-                    self.log_message(f"    📍 LÍNEA {i+1}: {'Fin de bloque de planeta' if not in_planet_block else 'Comentario en planeta'}")
-                translated_lines.append(line)
-                continue
-                
-            # Detectar nueva definición (fin del bloque anterior)
-            if re.match(r'^(ship|outfit|planet|system|government|event)\s+', line_stripped):
-                self.log_message(f"    📍 LÍNEA {i+1}: Fin de bloque de planeta - nueva definición")
-                in_planet_block = False
-                current_planet = None
-                translated_lines.append(line)
-                continue
-            
-            # Si estamos dentro de un bloque de planeta
-            if in_planet_block and current_planet:
-                self.log_message(f"    🔬 LÍNEA {i+1}: Dentro del planeta {current_planet}")
-                
-                # Buscar description
-                if line_stripped.startswith('description'):
-                    self.log_message(f"    🎯 LÍNEA {i+1}: DETECTADA DESCRIPCIÓN - verificando si termina en backtick...")
-                    if line_stripped.endswith('`'):
-                        self.log_message(f"    ✅ LÍNEA {i+1}: DESCRIPCIÓN VÁLIDA - extrayendo texto...")
-                        
-                        # Extraer el texto entre backticks
-                        match = re.match(r'^(\s*description\s+`)(.*)`(\s*)$', line)
-                        if match:
-                            prefix, text_to_translate, suffix = match.groups()
-                            self.log_message(f"    📝 LÍNEA {i+1}: ¡TRADUCIENDO DESCRIPCIÓN! de {current_planet}")
-                            self.log_message(f"        Texto original: '{text_to_translate[:60]}{'...' if len(text_to_translate) > 60 else ''}'")
-                            
-                            try:
-                                # Traducir usando el método de la clase base
-                                translated_text = self.translate_text(text_to_translate)
-                                if translated_text != text_to_translate:
-                                    line = f"{prefix}{translated_text}`{suffix}\n"
-                                    translations_made += 1
-                                    self.log_message(f"    ✅ LÍNEA {i+1}: Descripción traducida exitosamente!")
-                                    self.log_message(f"        Resultado: '{translated_text[:60]}{'...' if len(translated_text) > 60 else ''}'")
-                                
-                            except Exception as e:
-                                self.log_message(f"    ❌ LÍNEA {i+1}: Error traduciendo descripción: {e}")
-                                # Mantener línea original en caso de error
-                        else:
-                            # La regex no coincide, mantener línea original
-                            self.log_message(f"    ❌ LÍNEA {i+1}: DESCRIPCIÓN no coincide con regex")
-                    else:
-                        # Description sin backtick al final, o línea incompleta
-                        pass
-            
-            translated_lines.append(line)
-        
-        # Escribir archivo traducido
-        with open(dest_file, 'w', encoding='utf-8') as f:
-            f.writelines(translated_lines)
-        
-        self.log_message(f"✅ Planetas completado: {translations_made} descripciones traducidas")
-        return translations_made
-    
-    def translate_file(self, source_file, dest_file):
-        """Sobrescribir para redirigir logs a GUI"""
-        self.log_message(f"\n📄 Procesando archivo: {source_file.name}")
-        
-        # Determinar si necesita lógica especial
-        filename_lower = source_file.name.lower()
-        
-        if filename_lower == 'commodities.txt':
-            self.log_message(f"   🎯 Aplicando lógica especial para commodities")
-            return self.translate_commodities_file(source_file, dest_file)
-        elif filename_lower in ['ships.txt', 'outfits.txt', 'engines.txt', 'weapons.txt', 'power.txt'] or \
-             any(filename_lower.endswith(pattern) for pattern in ['ships.txt', 'outfits.txt', 'engines.txt', 'weapons.txt', 'power.txt', 'sales.txt']):
-            self.log_message(f"   🎯 Aplicando lógica especial para ships/outfits/engines/sales")
-            return self.translate_ships_outfits_file(source_file, dest_file)
-        elif filename_lower == 'fleets.txt' or filename_lower.endswith(' fleets.txt'):
-            self.log_message(f"   🎯 Aplicando lógica especial para fleets")
-            return self.translate_fleets_file(source_file, dest_file)
-        elif filename_lower == 'governments.txt' or filename_lower.endswith(' governments.txt'):
-            self.log_message(f"   🎯 Aplicando lógica especial para governments")
-            return self.translate_governments_file(source_file, dest_file)
-        
-        # Lógica general para otros archivos
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                self.log_message(f"   📈 Progreso: {i}/{len(lines)} líneas...")
-                
-            translated_line, was_translated = self.translate_line(line)
-            
-            if was_translated:
-                lines_translated += 1
-                self.log_message(f"  ✅ Línea {i+1} traducida")
-            else:
-                lines_skipped += 1
-            
-            translated_lines.append(translated_line)
-        
-        # Solo crear archivo si hay traducciones
-        if lines_translated > 0:
-            self.log_message(f"   💾 Guardando archivo con {lines_translated} líneas traducidas...")
-            # Guardar con codificación UTF-8 y BOM para máxima compatibilidad
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            self.log_message(f"   ✅ Archivo guardado: {dest_file}")
-        else:
-            self.log_message(f"   ⏭️  Sin traducciones, archivo omitido")
-        
-        return lines_translated
-
-    def translate_line(self, line):
-        """Sobrescribir para redirigir logs a GUI"""
-        original_line = line
-        line_stripped = line.strip()
-        
-        # Verificar si la línea nunca debe traducirse
-        if self.should_never_translate_line(line):
-            return line, False
-        
-        # Extraer texto traducible
-        result = self.extract_translatable_text(line)
-        if result is None:
-            return line, False
-        
-        prefix, text_to_translate, suffix, text_type = result
-        
-        if not text_to_translate or len(text_to_translate.strip()) < 2:
-            return line, False
-        
-        # Traducir el texto
-        translated_text = self.translate_text(text_to_translate)
-        if translated_text == text_to_translate:
-            return line, False  # No se tradujo
-        
-        # Reconstruir la línea según el tipo
-        if text_type == 'backtick':
-            # Para texto entre backticks
-            new_line = f"{prefix}`{translated_text}`{suffix}\n"
-        elif text_type == 'description':
-            # Para descripciones en comillas, reemplazar solo el contenido
-            new_line = line.replace(f'"{text_to_translate}"', f'"{translated_text}"')
+    def log_preserved_tags(self, masked, restored=None):
+        """Muestra las etiquetas del juego preservadas antes y después de traducir"""
+        game_variables = masked.values_of('GAMEVAR')
+        if not game_variables:
+            return
+        if restored is None:
+            self.log_message(f"    🔒 Preservando {len(game_variables)} etiqueta(s): {game_variables}")
         else:
-            # Fallback
-            new_line = line.replace(text_to_translate, translated_text)
-        
-        return new_line, True
+            final_tags = re.findall(r'<[^>]*>', restored)
+            self.log_message(f"    ✅ {len(final_tags)} etiqueta(s) preservada(s): {final_tags}")
     
     def run_custom_translation(self, selected_folders, selected_files):
         """Ejecuta traducción personalizada basada en selecciones"""
         self.log_message("=== Traductor Mejorado de Endless Sky ===")
         self.log_message(f"Idioma destino: {self.target_lang}")
+        self.log_message(f"Motor de traducción: {self.backend_name}")
+        self.start_run_clock()
+        if self.budget_description() is not None:
+            self.log_message(f"⏰ Presupuesto de la ejecución: {self.budget_description()}")
         
         # Crear estructura del plugin
         self.create_plugin_structure()
         self.log_message(f"🔧 Plugin creado en: {self.plugin_path}")
         
+        # Abrir la memoria de traducción (reutiliza traducciones de ejecuciones anteriores)
+        if self.open_translation_memory() is not None:
+            self.log_message(f"🧠 Memoria de traducción: {len(self.translation_memory)} segmentos guardados")
+        if self.open_build_manifest() is not None:
+            self.log_message(f"🧱 Compilación incremental: {len(self.build_manifest.entries)} archivos en el manifiesto")
+        
+        try:
+            self._run_selected_items(selected_folders, selected_files)
+            # Reencolar los segmentos que fallaron (límites del backend, cortes de red...)
+            self.requeue_failed_segments(log=self.log_message)
+        finally:
+            self.close_file_pool()
+            build_stats = self.close_build_manifest()
+            if build_stats is not None:
+                self.log_message(f"🧱 Compilación incremental: {build_stats['reused']} archivos sin cambios "
+                                 f"reutilizados, {build_stats['rebuilt']} regenerados, "
+                                 f"{build_stats['removed']} salidas obsoletas eliminadas")
+            memory_stats = self.close_translation_memory()
+            if memory_stats is not None:
+                self.log_message(f"🧠 Memoria de traducción: {memory_stats['hits']} aciertos, "
+                                 f"{memory_stats['misses']} fallos ({memory_stats['hit_rate']:.1f}% reutilizado)")
+            if self.batch_stats['requests']:
+                self.log_message(f"📦 Lotes: {self.batch_stats['segments']} segmentos en "
+                                 f"{self.batch_stats['requests']} peticiones "
+                                 f"({self.batch_stats['fallbacks']} lotes reintentados uno a uno)")
+            dedup_stats = self.segment_table.stats()
+            if dedup_stats['occurrences']:
+                self.log_message(f"🔁 Deduplicación: {dedup_stats['occurrences']} segmentos, "
+                                 f"{dedup_stats['unique']} únicos, {dedup_stats['saved']} peticiones evitadas "
+                                 f"({dedup_stats['coalesced']} esperando una petición en vuelo)")
+            scheduler_stats = self.close_scheduler()
+            if scheduler_stats is not None:
+                self.log_message(f"⚡ Planificador: {scheduler_stats['requests']} peticiones, hasta "
+                                 f"{scheduler_stats['peak_in_flight']} en vuelo, "
+                                 f"{scheduler_stats['throttle_wait']:.1f}s de espera por límite de velocidad")
+                if scheduler_stats['failures']:
+                    self.log_message(f"🚦 Control adaptativo: {scheduler_stats['throttled']} limitaciones del servidor, "
+                                     f"{scheduler_stats['retries']} reintentos "
+                                     f"({scheduler_stats['backoff_wait']:.1f}s de espera), "
+                                     f"{scheduler_stats['circuit_trips']} aperturas del cortacircuitos, "
+                                     f"concurrencia final {scheduler_stats['concurrency']}")
+                if scheduler_stats['p95_latency'] is not None:
+                    self.log_message(f"⏱️ Latencia p95: {scheduler_stats['p95_latency']:.2f}s, "
+                                     f"{scheduler_stats['hedges']} peticiones duplicadas "
+                                     f"({scheduler_stats['hedge_wins']} respondieron antes), "
+                                     f"{scheduler_stats['timeouts']} sin respuesta a tiempo")
+            self.report_failed_segments(log=self.log_message)
+    
+    def _run_selected_items(self, selected_folders, selected_files):
+        """Procesa los archivos y carpetas seleccionados en la GUI"""
         total_files_processed = 0
+        file_jobs = self.resolve_selected_jobs(selected_folders, selected_files)
+        
+        # Plan previo: el progreso se mide en segmentos, no en elementos seleccionados
         progress_step = 0
-        total_steps = len(selected_folders) + len(selected_files)
+        if self.plan_runs:
+            plan = self.plan_jobs(file_jobs)
+            for line in plan.report_lines():
+                self.log_message(line)
+            self.start_segment_progress(plan.segments)
+            file_jobs = self.schedule_jobs(plan.jobs, plan)
+        else:
+            file_jobs = self.schedule_jobs(file_jobs)
+        
+        def announce(job):
+            nonlocal progress_step
+            if not self.plan_runs:
+                progress_step += 1
+                self.message_queue.put(("progress", progress_step * 100 / len(file_jobs)))
+            self.log_message(f"\n📄 Procesando archivo: {job[1].name}")
         
-        # Procesar archivos individuales seleccionados
+        # Todos los archivos en una sola tanda (precarga por lotes, procesos de trabajo o pipeline)
+        try:
+            for (_, source_file, _), lines_translated in zip(file_jobs, self.run_file_jobs(file_jobs, announce)):
+                if lines_translated > 0:
+                    total_files_processed += 1
+                    self.log_message(f"✅ {source_file.name}: {lines_translated} líneas traducidas")
+                else:
+                    self.log_message(f"⏭️ {source_file.name}: Sin traducciones")
+        finally:
+            self.finish_segment_progress()
+        
+        self.log_message(f"\n✅ Traducción completada!")
+        self.log_message(f"📊 {total_files_processed} archivos procesados en total")
+        
+        if total_files_processed > 0:
+            self.log_message(f"\n💡 Para usar la traducción:")
+            self.log_message(f"   1. Inicia Endless Sky")
+            self.log_message(f"   2. Ve a Preferencias → Plugins")
+            self.log_message(f"   3. Activa 'Traducción al Español'")
+            self.log_message(f"   4. Reinicia el juego")
+        else:
+            self.log_message(f"\n⚠️ No se procesaron archivos. Verifica tu selección.")
+    
+    def resolve_selected_jobs(self, selected_folders, selected_files):
+        """Resuelve los archivos y carpetas seleccionados en trabajos (manejador, origen, destino)
+
+        Un archivo seleccionado también a través de su carpeta aparece una sola vez.
+        """
+        file_jobs = []
         for file_entry in selected_files:
-            progress_step += 1
-            progress = (progress_step / total_steps) * 100 if total_steps > 0 else 0
-            self.message_queue.put(("progress", progress))
-            
             # Verificar si es archivo raíz o archivo de carpeta
             if "/" in file_entry:
                 # Es archivo dentro de carpeta: "carpeta/archivo.txt"
                 folder_name, filename = file_entry.split("/", 1)
                 source_file = self.data_path / folder_name / filename
                 dest_file = self.plugin_data_path / folder_name / filename
-                
-                # Crear directorio de carpeta si no existe
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
             else:
                 # Es archivo raíz
                 filename = file_entry
@@ -1274,66 +1056,32 @@ class CustomTranslatorImproved(EndlessSkyTranslatorFixed):
                 dest_file = self.plugin_data_path / filename
             
             if source_file.exists():
-                self.log_message(f"\n📄 Procesando archivo: {source_file.name}")
-                lines_translated = self.translate_file(source_file, dest_file)
-                if lines_translated > 0:
-                    total_files_processed += 1
-                    self.log_message(f"✅ {source_file.name}: {lines_translated} líneas traducidas")
-                else:
-                    self.log_message(f"⏭️ {source_file.name}: Sin traducciones")
+                file_jobs.append((self.translate_file, source_file, dest_file))
             else:
                 self.log_message(f"❌ Archivo no encontrado: {source_file}")
         
-        # Procesar carpetas seleccionadas
         for folder_name in selected_folders:
-            progress_step += 1
-            progress = (progress_step / total_steps) * 100 if total_steps > 0 else 0
-            self.message_queue.put(("progress", progress))
-            
             source_folder = self.data_path / folder_name
-            dest_folder = self.plugin_data_path / folder_name
-            
             if source_folder.exists():
-                self.log_message(f"\n📂 Procesando carpeta: {folder_name}")
-                files_in_folder = self.translate_folder_selective(source_folder, dest_folder)
-                total_files_processed += files_in_folder
-                self.log_message(f"✅ Carpeta {folder_name}: {files_in_folder} archivos procesados")
+                self.log_message(f"📂 Carpeta seleccionada: {folder_name}")
+                file_jobs.extend(self.selected_folder_jobs(source_folder, self.plugin_data_path / folder_name))
             else:
                 self.log_message(f"❌ Carpeta no encontrada: {folder_name}")
-        
-        self.log_message(f"\n✅ Traducción completada!")
-        self.log_message(f"📊 {total_files_processed} archivos procesados en total")
-        
-        if total_files_processed > 0:
-            self.log_message(f"\n💡 Para usar la traducción:")
-            self.log_message(f"   1. Inicia Endless Sky")
-            self.log_message(f"   2. Ve a Preferencias → Plugins")
-            self.log_message(f"   3. Activa 'Traducción al Español'")
-            self.log_message(f"   4. Reinicia el juego")
-        else:
-            self.log_message(f"\n⚠️ No se procesaron archivos. Verifica tu selección.")
+        return dedupe_jobs(file_jobs)
     
-    def translate_folder_selective(self, source_folder, dest_folder):
-        """Traduce una carpeta usando solo archivos seguros"""
-        files_processed = 0
-        
-        # Crear carpeta de destino
-        dest_folder.mkdir(parents=True, exist_ok=True)
-        
-        # Buscar archivos .txt en la carpeta
+    def selected_folder_jobs(self, source_folder, dest_folder):
+        """Trabajos de los archivos .txt seguros de una carpeta"""
+        file_jobs = []
         for file_path in source_folder.glob("*.txt"):
             if self.is_file_safe_for_gui(file_path):
-                dest_file = dest_folder / file_path.name
-                lines_translated = self.translate_file(file_path, dest_file)
-                if lines_translated > 0:
-                    files_processed += 1
-                    self.log_message(f"  ✅ {file_path.name}: {lines_translated} líneas")
-                else:
-                    self.log_message(f"  ⏭️ {file_path.name}: Sin traducciones")
+                file_jobs.append((self.translate_file, file_path, dest_folder / file_path.name))
             else:
                 self.log_message(f"  ⏭️ {file_path.name}: Archivo omitido (no seguro)")
-        
-        return files_processed
+        return file_jobs
+    
+    def report_segment_progress(self, done, total):
+        """Lleva el progreso en segmentos a la barra de progreso"""
+        self.message_queue.put(("progress", done * 100 / total))
     
     def is_file_safe_for_gui(self, file_path):
         """Versión de seguridad para GUI que coincide con el filtro de archivos"""
@@ -1380,540 +1128,10 @@ class CustomTranslatorImproved(EndlessSkyTranslatorFixed):
         # Si llegamos aquí, probablemente no es seguro procesar el archivo
         return False
 
-    def translate_commodities_file(self, source_file, dest_file):
-        """Sobrescribir para redirigir logs a GUI"""
-        self.log_message(f"\n📦 Procesando archivo de commodities: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_commodity_block = False
-        current_commodity = ""
-        
-        for i, line in enumerate(lines):
-            if i % 500 == 0 and i > 0:
-                self.log_message(f"   📈 Progreso commodities: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar inicio de bloque commodity
-            commodity_match = re.match(r'^commodity\s+"([^"]*)"', line_stripped)
-            if commodity_match:
-                in_commodity_block = True
-                commodity_name = commodity_match.group(1)
-                current_commodity = f"commodity {commodity_name}"
-                self.log_message(f"  📦 LÍNEA {i+1}: Detectado commodity: {commodity_name}")
-                translated_lines.append(original_line)  # NO traducir nombres de commodities
-                continue
-            
-            # Detectar fin de bloque
-            if in_commodity_block and (not line_stripped or 
-                                     line_stripped.startswith('#') or
-                                     re.match(r'^(commodity|planet|ship|outfit|system)\s+', line_stripped)):
-                in_commodity_block = False
-                self.log_message(f"  📍 LÍNEA {i+1}: Fin de bloque commodity")
-            
-            # Si estamos en un bloque commodity
-            if in_commodity_block:
-                was_translated = False
-                
-                # Solo traducir elementos seguros dentro de commodities
-                # Como descripción (pero no nombres ni valores)
-                if line_stripped.startswith('description'):
-                    desc_match = re.match(r'^(\s*description\s+`)(.*)`(\s*)$', line.rstrip())
-                    if desc_match:
-                        prefix, text_to_translate, suffix = desc_match.groups()
-                        self.log_message(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN COMMODITY - {current_commodity}")
-                        try:
-                            translated_text = self.translate_text(text_to_translate)
-                            if translated_text != text_to_translate:
-                                line = f"{prefix}{translated_text}`{suffix}\n"
-                                was_translated = True
-                                lines_translated += 1
-                                self.log_message(f"    ✅ LÍNEA {i+1}: Descripción traducida exitosamente!")
-                                self.log_message(f"        Resultado: '{translated_text[:60]}{'...' if len(translated_text) > 60 else ''}'")
-                            
-                        except Exception as e:
-                            self.log_message(f"    ❌ LÍNEA {i+1}: Error traduciendo descripción: {e}")
-                            # Mantener línea original en caso de error
-                        translated_lines.append(line)
-                    else:
-                        # La regex no coincide, mantener línea original
-                        self.log_message(f"    ❌ LÍNEA {i+1}: DESCRIPCIÓN no coincide con regex")
-            
-            translated_lines.append(line)
-        
-        # Solo guardar si hay traducciones
-        if lines_translated > 0:
-            self.log_message(f"   💾 Guardando commodities con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            self.log_message(f"   ✅ Commodities guardado: {dest_file}")
-        else:
-            self.log_message(f"   ⏭️ Sin traducciones en commodities, archivo omitido")
-        
-        return lines_translated
-
-    def translate_ships_outfits_file(self, source_file, dest_file):
-        """Traduce ships/outfits/engines FORZANDO SOBRESCRITURA COMPLETA"""
-        self.log_message(f"\n🚢 Procesando archivo de naves/outfits: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        
-        # *** NUEVA ESTRATEGIA: Solo guardar elementos que REALMENTE se traducen ***
-        translated_items = []  # Lista de elementos traducidos completamente
-        lines_translated = 0
-        in_item_block = False
-        current_item_lines = []
-        current_item_name = ""
-        current_item_type = ""
-        current_indent = 0
-        item_has_translations = False
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                self.log_message(f"   📈 Progreso naves/outfits: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Saltar comentarios de copyright al inicio
-            if line_stripped.startswith('#') and i < 20:
-                continue
-            
-            # Detectar inicio de bloque de nave, outfit o effect
-            item_match = re.match(r'^(ship|outfit|effect)\s+"?([^"]*)"?', line_stripped)
-            if item_match:
-                # Si estábamos procesando un item anterior y tenía traducciones, guardarlo
-                if in_item_block and item_has_translations and current_item_lines:
-                    self.log_message(f"    💾 Guardando {current_item_type} traducido: {current_item_name}")
-                    translated_items.extend(current_item_lines)
-                
-                # Iniciar nuevo item
-                in_item_block = True
-                current_item_type, current_item_name = item_match.groups()
-                current_indent = len(line) - len(line.lstrip())
-                current_item_lines = [original_line]
-                item_has_translations = False
-                self.log_message(f"  🔧 LÍNEA {i+1}: Procesando {current_item_type}: {current_item_name}")
-                continue
-            
-            # Detectar fin de bloque
-            if in_item_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['ship ', 'outfit ', 'effect ', 'planet ', 'system '])):
-                    
-                    # Guardar item anterior si tenía traducciones
-                    if item_has_translations and current_item_lines:
-                        self.log_message(f"    � Guardando {current_item_type} traducido: {current_item_name}")
-                        translated_items.extend(current_item_lines)
-                    
-                    in_item_block = False
-                    current_item_lines = []
-                    item_has_translations = False
-                    
-                    # Procesar esta línea como nueva definición
-                    continue
-                
-                # Si es línea vacía o comentario, añadir a las líneas del item actual
-                elif not line_stripped or line_stripped.startswith('#'):
-                    current_item_lines.append(original_line)
-                    continue
-            
-            # LÓGICA DE REEMPLAZO: Si estamos en un bloque de item, traducir líneas específicas
-            if in_item_block:
-                translated_line = original_line  # Por defecto, mantener original
-                was_translated = False
-                
-                # 1. DESCRIPCIÓN: Reemplazar texto entre comillas
-                description_match = re.match(r'^(\s*description\s+)"(.+)"(.*)$', line.rstrip())
-                if description_match:
-                    prefix, description_text, suffix = description_match.groups()
-                    self.log_message(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DETECTADA en {current_item_type} {current_item_name}")
-                    self.log_message(f"    🌍 Traduciendo: '{description_text[:50]}{'...' if len(description_text) > 50 else ''}'")
-                    try:
-                        translated_text = self.translate_text(description_text)
-                        if translated_text != description_text:
-                            translated_line = f'{prefix}"{translated_text}"{suffix}\n'
-                            was_translated = True
-                            item_has_translations = True
-                            lines_translated += 1
-                            self.log_message(f"    ✅ LÍNEA {i+1}: Descripción traducida correctamente")
-                    except Exception as e:
-                        self.log_message(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                
-                # 2. PLURAL: Reemplazar nombres plurales
-                elif re.match(r'^\s*plural\s+"(.+)"', line_stripped):
-                    plural_match = re.match(r'^(\s*plural\s+)"(.+)"(.*)$', line.rstrip())
-                    if plural_match:
-                        prefix, plural_text, suffix = plural_match.groups()
-                        self.log_message(f"    🎯 LÍNEA {i+1}: PLURAL DETECTADO en {current_item_type} {current_item_name}")
-                        self.log_message(f"    🌍 Traduciendo: '{plural_text}'")
-                        try:
-                            translated_text = self.translate_text(plural_text)
-                            if translated_text != plural_text:
-                                translated_line = f'{prefix}"{translated_text}"{suffix}\n'
-                                was_translated = True
-                                item_has_translations = True
-                                lines_translated += 1
-                                self.log_message(f"    ✅ LÍNEA {i+1}: plural traducido correctamente")
-                        except Exception as e:
-                            self.log_message(f"    ❌ LÍNEA {i+1}: Error en plural: {e}")
-                
-                # 3. NOUN: Reemplazar sustantivos
-                elif re.match(r'^\s*noun\s+"(.+)"', line_stripped):
-                    noun_match = re.match(r'^(\s*noun\s+)"(.+)"(.*)$', line.rstrip())
-                    if noun_match:
-                        prefix, noun_text, suffix = noun_match.groups()
-                        self.log_message(f"    🎯 LÍNEA {i+1}: SUSTANTIVO DETECTADO en {current_item_type} {current_item_name}")
-                        self.log_message(f"    🌍 Traduciendo: '{noun_text}'")
-                        try:
-                            translated_text = self.translate_text(noun_text)
-                            if translated_text != noun_text:
-                                translated_line = f'{prefix}"{translated_text}"{suffix}\n'
-                                was_translated = True
-                                item_has_translations = True
-                                lines_translated += 1
-                                self.log_message(f"    ✅ LÍNEA {i+1}: sustantivo traducido correctamente")
-                        except Exception as e:
-                            self.log_message(f"    ❌ LÍNEA {i+1}: Error en sustantivo: {e}")
-                
-                # 4. EXPLANATION: Reemplazar explicaciones
-                elif re.match(r'^\s*explanation\s+"(.+)"', line_stripped):
-                    explanation_match = re.match(r'^(\s*explanation\s+)"(.+)"(.*)$', line.rstrip())
-                    if explanation_match:
-                        prefix, explanation_text, suffix = explanation_match.groups()
-                        self.log_message(f"    🎯 LÍNEA {i+1}: EXPLICACIÓN DETECTADA en {current_item_type} {current_item_name}")
-                        self.log_message(f"    🌍 Traduciendo: '{explanation_text[:50]}{'...' if len(explanation_text) > 50 else ''}'")
-                        try:
-                            translated_text = self.translate_text(explanation_text)
-                            if translated_text != explanation_text:
-                                translated_line = f'{prefix}"{translated_text}"{suffix}\n'
-                                was_translated = True
-                                item_has_translations = True
-                                lines_translated +=  1
-                                self.log_message(f"    ✅ LÍNEA {i+1}: explicación traducida correctamente")
-                        except Exception as e:
-                            self.log_message(f"    ❌ LÍNEA {i+1}: Error en explicación: {e}")
-                
-                # Añadir la línea (original o traducida) al item actual
-                current_item_lines.append(translated_line)
-            else:
-                # Fuera de bloque, ignorar líneas
-                pass
-        
-        # No olvidar el último item si tenía traducciones
-        if in_item_block and item_has_translations and current_item_lines:
-            self.log_message(f"    💾 Guardando último {current_item_type} traducido: {current_item_name}")
-            translated_items.extend(current_item_lines)
-        
-        # Solo guardar archivo si hay elementos traducidos
-        if translated_items:
-            self.log_message(f"   💾 Guardando archivo SOLO con elementos traducidos: {lines_translated} líneas")
-            
-            # Crear contenido final con header y elementos traducidos
-            final_content = []
-            final_content.append("# Plugin translation - SOLO elementos traducidos para forzar sobrescritura\n")
-            final_content.append("# Este archivo contiene ÚNICAMENTE elementos con traducciones\n")
-            final_content.append("\n")
-            final_content.extend(translated_items)
-            
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(final_content)
-            self.log_message(f"   ✅ Archivo ships/outfits guardado SOLO con traducciones: {dest_file}")
-        else:
-            self.log_message(f"   ⏭️ Sin traducciones encontradas, no se crea archivo")
-        
-        return lines_translated
-
-    def translate_fleets_file(self, source_file, dest_file):
-        """Traduce específicamente archivos fleets.txt con logs a GUI"""
-        self.log_message(f"\n🚁 Procesando archivo de flotas: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_fleet_block = False
-        current_fleet = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                self.log_message(f"   📈 Progreso flotas: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque fleet
-            fleet_match = re.match(r'^fleet\s+"?([^"]*)"?', line_stripped)
-            if fleet_match:
-                in_fleet_block = True
-                current_fleet = fleet_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                self.log_message(f"  🚁 LÍNEA {i+1}: Procesando flota: {current_fleet}")
-                translated_lines.append(original_line)  # No traducir nombres de flotas
-                continue
-            
-            # Detectar fin de bloque
-            if in_fleet_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['fleet ', 'government ', 'mission '])):
-                    in_fleet_block = False
-                    self.log_message(f"    📍 LÍNEA {i+1}: Fin de bloque fleet")
-            
-            # Si estamos en un bloque fleet, buscar elementos traducibles
-            if in_fleet_block:
-                was_translated = False
-                
-                # Detectar descripciones de flotas
-                if line_stripped.startswith('description `'):
-                    if line_stripped.endswith('`'):
-                        desc_match = re.match(r'^(\s*)description\s+`(.+)`(.*)$', line.rstrip())
-                        if desc_match:
-                            prefix, text_to_translate, suffix = desc_match.groups()
-                            self.log_message(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DE FLOTA")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}description `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                self.log_message(f"    ✅ LÍNEA {i+1}: Descripción traducida")
-                            except Exception as e:
-                                self.log_message(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            self.log_message(f"   💾 Guardando archivo fleets con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            self.log_message(f"   ✅ Archivo fleets guardado: {dest_file}")
-        else:
-            self.log_message(f"   ⏭️ Sin traducciones en fleets, archivo omitido")
-        
-        return lines_translated
-
-    def translate_governments_file(self, source_file, dest_file):
-        """Traduce específicamente archivos governments.txt con logs a GUI"""
-        self.log_message(f"\n🏛️ Procesando archivo de gobiernos: {source_file.name}")
-        
-        # Crear directorio de destino
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Detectar codificación
-        encoding = self.detect_encoding(source_file)
-        self.log_message(f"   🔤 Codificación: {encoding}")
-        
-        try:
-            with open(source_file, 'r', encoding=encoding, errors='ignore') as f:
-                lines = f.readlines()
-        except:
-            self.log_message(f"   ⚠️ Error con {encoding}, usando UTF-8...")
-            with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        
-        self.log_message(f"   📊 Total de líneas: {len(lines)}")
-        translated_lines = []
-        lines_translated = 0
-        lines_skipped = 0
-        in_government_block = False
-        current_government = ""
-        current_indent = 0
-        
-        for i, line in enumerate(lines):
-            if i % 100 == 0 and i > 0:
-                self.log_message(f"   📈 Progreso gobiernos: {i}/{len(lines)} líneas...")
-            
-            original_line = line
-            line_stripped = line.strip()
-            
-            # Detectar comentarios y líneas vacías
-            if line_stripped.startswith('#') or not line_stripped:
-                translated_lines.append(original_line)
-                continue
-            
-            # Detectar inicio de bloque government
-            gov_match = re.match(r'^government\s+"?([^"]*)"?', line_stripped)
-            if gov_match:
-                in_government_block = True
-                current_government = gov_match.group(1)
-                current_indent = len(line) - len(line.lstrip())
-                self.log_message(f"  🏛️ LÍNEA {i+1}: Procesando gobierno: {current_government}")
-                translated_lines.append(original_line)  # No traducir nombres de gobiernos
-                continue
-            
-            # Detectar fin de bloque
-            if in_government_block:
-                line_indent = len(line) - len(line.lstrip()) if line.strip() else 0
-                
-                # Si encontramos una nueva definición al mismo nivel, terminar bloque actual
-                if (line_stripped and 
-                    line_indent <= current_indent and 
-                    any(line_stripped.startswith(kw) for kw in ['government ', 'fleet ', 'mission '])):
-                    in_government_block = False
-                    self.log_message(f"    📍 LÍNEA {i+1}: Fin de bloque government")
-            
-            # Si estamos en un bloque government, buscar elementos traducibles
-            if in_government_block:
-                was_translated = False
-                
-                # Detectar descripciones de gobiernos
-                if line_stripped.startswith('description `'):
-                    if line_stripped.endswith('`'):
-                        desc_match = re.match(r'^(\s*)description\s+`(.+)`(.*)$', line.rstrip())
-                        if desc_match:
-                            prefix, text_to_translate, suffix = desc_match.groups()
-                            self.log_message(f"    🎯 LÍNEA {i+1}: DESCRIPCIÓN DE GOBIERNO")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}description `{translated_text}`{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                self.log_message(f"    ✅ LÍNEA {i+1}: Descripción traducida")
-                            except Exception as e:
-                                self.log_message(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                
-                # Detectar friendly/hostile hails (mensajes de comunicación)
-                hail_patterns = [
-                    (r'^(\s*)(friendly hail\s+)"(.+)"(.*)$', 'friendly hail'),
-                    (r'^(\s*)(hostile hail\s+)"(.+)"(.*)$', 'hostile hail'),
-                    (r'^(\s*)(bribe\s+)"(.+)"(.*)$', 'bribe message'),
-                    (r'^(\s*)(fine\s+)"(.+)"(.*)$', 'fine message')
-                ]
-                
-                if not was_translated:
-                    for pattern, hail_type in hail_patterns:
-                        hail_match = re.match(pattern, line.rstrip())
-                        if hail_match:
-                            prefix, keyword, text_to_translate, suffix = hail_match.groups()
-                            self.log_message(f"    🎯 LÍNEA {i+1}: {hail_type.upper()}")
-                            try:
-                                translated_text = self.translate_text(text_to_translate)
-                                new_line = f'{prefix}{keyword}"{translated_text}"{suffix}'
-                                if original_line.endswith('\n'):
-                                    new_line += '\n'
-                                translated_lines.append(new_line)
-                                lines_translated += 1
-                                was_translated = True
-                                self.log_message(f"    ✅ LÍNEA {i+1}: {hail_type} traducido")
-                                break
-                            except Exception as e:
-                                self.log_message(f"    ❌ LÍNEA {i+1}: Error: {e}")
-                                translated_lines.append(original_line)
-                                lines_skipped += 1
-                                was_translated = True
-                                break
-                
-                # Si no se tradujo, mantener línea original
-                if not was_translated:
-                    translated_lines.append(original_line)
-                    lines_skipped += 1
-            else:
-                # Fuera de bloques, usar lógica normal
-                translated_line, was_translated = self.translate_line(line)
-                if was_translated:
-                    lines_translated += 1
-                else:
-                    lines_skipped += 1
-                translated_lines.append(translated_line)
-        
-        # Guardar archivo solo si hay traducciones
-        if lines_translated > 0:
-            self.log_message(f"   💾 Guardando archivo governments con {lines_translated} líneas traducidas...")
-            with open(dest_file, 'w', encoding='utf-8-sig') as f:
-                f.writelines(translated_lines)
-            self.log_message(f"   ✅ Archivo governments guardado: {dest_file}")
-        else:
-            self.log_message(f"   ⏭️ Sin traducciones en governments, archivo omitido")
-        
-        return lines_translated
 def main():
     """Función principal para ejecutar la GUI mejorada"""
+    multiprocessing.freeze_support()  # Procesos de trabajo en ejecutables empaquetados
+    
     root = tk.Tk()
     
     # Configurar estilo